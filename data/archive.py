@@ -0,0 +1,126 @@
+# archive.py
+import hashlib
+import json
+import struct
+import sys
+import zlib
+from pathlib import Path
+
+from utils import DATA_DIR, TAB_FILES, read_json, write_json, notify_reloaded, atomic_write_stream
+
+MAGIC = b"TPDB\x01"
+ARCHIVE_SUFFIX = ".tpdb"
+
+# Layout: MAGIC, u64 header length, header JSON, then the members back to back.
+# The header maps filename -> {offset, size, raw_size, sha256}, offsets relative
+# to the end of the header, and every member is compressed on its own.
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def read_index(path: Path):
+    """Return (members, data_start) without touching any member data."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ArchiveError(f"{path} is not a data archive")
+        try:
+            (header_len,) = struct.unpack(">Q", f.read(8))
+            members = json.loads(f.read(header_len).decode("utf-8"))["members"]
+        except (ValueError, KeyError, TypeError, struct.error) as e:
+            raise ArchiveError(f"{path.name} has a damaged index: {e}") from e
+    if not isinstance(members, dict):
+        raise ArchiveError(f"{path.name} has a damaged index")
+    return members, len(MAGIC) + 8 + header_len
+
+
+def _read_raw(path: Path, members, data_start, filename):
+    member = members[filename]
+    with open(path, "rb") as f:
+        f.seek(data_start + member["offset"])
+        return f.read(member["size"])
+
+
+def load_member(path: Path, filename):
+    """Load one file from the archive, decompressing only that member."""
+    members, data_start = read_index(path)
+    if filename not in members:
+        raise ArchiveError(f"{filename} not in {path.name}")
+    try:
+        raw = zlib.decompress(_read_raw(path, members, data_start, filename))
+        if hashlib.sha256(raw).hexdigest() != members[filename]["sha256"]:
+            raise ArchiveError(f"{filename} in {path.name} is corrupt")
+        return json.loads(raw.decode("utf-8"))
+    except (zlib.error, ValueError, KeyError, TypeError) as e:
+        raise ArchiveError(f"{filename} in {path.name} is corrupt: {e}") from e
+
+
+def pack(path: Path, level=6):
+    """Write every TAB_FILES entry into one archive.
+
+    If `path` already exists, members whose content hash is unchanged are
+    copied over compressed instead of being compressed again. Returns the
+    names of the members that had to be (re)compressed.
+    """
+    previous, prev_start = {}, 0
+    if path.exists():
+        try:
+            previous, prev_start = read_index(path)
+        except ArchiveError:
+            previous = {}
+
+    members, blobs, changed = {}, [], []
+    offset = 0
+    for filename in TAB_FILES.values():
+        raw = json.dumps(read_json(DATA_DIR / filename), ensure_ascii=False,
+                         separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        if previous.get(filename, {}).get("sha256") == digest:
+            blob = _read_raw(path, previous, prev_start, filename)
+        else:
+            blob = zlib.compress(raw, level)
+            changed.append(filename)
+        members[filename] = {"offset": offset, "size": len(blob),
+                             "raw_size": len(raw), "sha256": digest}
+        blobs.append(blob)
+        offset += len(blob)
+
+    header = json.dumps({"members": members}).encode("utf-8")
+
+    def write(f):
+        f.write(MAGIC)
+        f.write(struct.pack(">Q", len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+
+    atomic_write_stream(path, write)
+    return changed
+
+
+def unpack(path: Path, only=None):
+    """Import members (all, or the filenames in `only`) into the data directory."""
+    members, _ = read_index(path)
+    names = [n for n in members if n in TAB_FILES.values() and (only is None or n in only)]
+    try:
+        for filename in names:
+            write_json(DATA_DIR / filename, load_member(path, filename))
+    finally:
+        # files written before a failure are in place; tabs should show them
+        notify_reloaded()
+    return names
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("pack", "unpack", "list"):
+        print("usage: archive.py pack|unpack|list ARCHIVE [file ...]")
+        sys.exit(2)
+    command, target = sys.argv[1], Path(sys.argv[2])
+    if command == "pack":
+        print("packed:", ", ".join(pack(target)) or "nothing changed")
+    elif command == "unpack":
+        print("imported:", ", ".join(unpack(target, sys.argv[3:] or None)))
+    else:
+        for name, m in read_index(target)[0].items():
+            print(f"{name:24} {m['raw_size']:>10} -> {m['size']:>10}  {m['sha256'][:12]}")
@@ -0,0 +1,255 @@
+# bulk_import.py
+import csv
+import math
+import sys
+from pathlib import Path
+
+from utils import (
+    DATA_DIR, TAB_FILES, TRAITS_LIST, ROLE_DISPLAY, read_json, write_json, notify_reloaded
+)
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 500
+
+CONTRACT_FIELDS = {
+    "contract.team": str,
+    "contract.length_weeks": int,
+    "contract.salary_m": float,
+    "contract.start_week": int,
+}
+
+# field -> type for each importable entity; dotted names are nested
+ENTITY_FIELDS = {
+    "drivers": {
+        "name": str, "team": str, "age": int, "talent": int, "train": int,
+        "base_lap_time_sim": float, "number": int, "cornering": int, "braking": int,
+        "consistency": int, "smoothness": int, "control": int,
+        "pay_driver_amount_m": float, "traits": list,
+        "history.seasons": int, "history.championships": int, "history.wins": int,
+        "history.podiums": int, "history.poles": int,
+        **CONTRACT_FIELDS, "contract.role": str,
+    },
+    "staff": {
+        "name": str, "role": str, "team": str, "skill": int, "age": int,
+        **CONTRACT_FIELDS,
+    },
+    "sponsors": {
+        "name": str, "rating": int, "amount_m": float,
+    },
+}
+
+# allowed values for categorical fields
+CHOICES = {
+    ("drivers", "contract.role"): {"main", "reserve"},
+    ("staff", "role"): set(ROLE_DISPLAY),
+}
+
+
+class RowError:
+    def __init__(self, row, column, message):
+        self.row = row
+        self.column = column
+        self.message = message
+
+    def __str__(self):
+        where = f"row {self.row}" + (f", column '{self.column}'" if self.column else "")
+        return f"{where}: {self.message}"
+
+
+class ImportResult:
+    def __init__(self):
+        self.rows = 0
+        self.added = 0
+        self.updated = 0
+        self.errors = []
+        self.error_count = 0
+        self.committed = False
+
+    def error(self, row, column, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(RowError(row, column, message))
+
+
+# --------------------
+# Column mapping
+# --------------------
+def default_mapping(entity, columns):
+    """Map CSV columns to fields; `contract_salary_m` style names become nested."""
+    fields = ENTITY_FIELDS[entity]
+    mapping = {}
+    for col in columns:
+        key = (col or "").strip()
+        for prefix in ("contract", "history"):
+            if key.startswith(prefix + "_") and f"{prefix}.{key[len(prefix) + 1:]}" in fields:
+                key = f"{prefix}.{key[len(prefix) + 1:]}"
+        if key in fields:
+            mapping[col] = key
+    return mapping
+
+
+def _convert(kind, text):
+    text = text.strip()
+    if kind is str:
+        return text or None
+    if kind is list:
+        return [t.strip() for t in text.replace("|", ";").split(";") if t.strip()]
+    if text == "":
+        return 0
+    number = float(text)
+    if not math.isfinite(number):
+        raise ValueError(f"{text!r} is not a finite number")
+    if kind is int:
+        if not number.is_integer():
+            raise ValueError(f"{text!r} is not a whole number")
+        return int(number)
+    return number
+
+
+def _has_path(record, path):
+    for part in path.split("."):
+        if not isinstance(record, dict) or part not in record:
+            return False
+        record = record[part]
+    return True
+
+
+def _set_path(record, path, value):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        record = record.setdefault(part, {})
+    record[parts[-1]] = value
+
+
+# --------------------
+# Streaming
+# --------------------
+def iter_rows(path: Path, delimiter=None):
+    """Yield (row number, dict) from a CSV or TSV file without loading it whole."""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if delimiter is None:
+            if path.suffix.lower() in (".tsv", ".tab"):
+                delimiter = "\t"
+            else:
+                sample = f.read(4096)
+                f.seek(0)
+                try:
+                    delimiter = csv.Sniffer().sniff(sample, delimiters=",;\t").delimiter
+                except csv.Error:
+                    delimiter = ","
+        reader = csv.DictReader(f, delimiter=delimiter)
+        for row in reader:
+            # header is line 1
+            yield reader.line_num, row
+
+
+def _validate_batch(entity, batch, mapping, result, seen_names):
+    fields = ENTITY_FIELDS[entity]
+    valid = []
+    for line, row in batch:
+        record, ok = {}, True
+        for col, field in mapping.items():
+            text = row.get(col)
+            if text is None or not text.strip():
+                # blank cells leave the field alone; new records get defaults later
+                continue
+            try:
+                value = _convert(fields[field], text)
+            except ValueError:
+                result.error(line, col, f"expected {fields[field].__name__}, got {text!r}")
+                ok = False
+                continue
+            allowed = CHOICES.get((entity, field))
+            if allowed and value is not None and value not in allowed:
+                result.error(line, col, f"{value!r} is not one of {sorted(allowed)}")
+                ok = False
+            if field == "traits":
+                unknown = [t for t in value if t not in TRAITS_LIST]
+                if unknown:
+                    result.error(line, col, f"unknown trait(s) {unknown}")
+                    ok = False
+            _set_path(record, field, value)
+
+        name = record.get("name")
+        if not name:
+            result.error(line, None, "missing name")
+            ok = False
+        elif name in seen_names:
+            result.error(line, None, f"duplicate name {name!r} in file")
+            ok = False
+        if ok:
+            seen_names.add(name)
+            valid.append(record)
+    return valid
+
+
+def import_file(entity, path: Path, mapping=None, skip_invalid=False, delimiter=None):
+    """Stream, validate in batches and commit the rows in a single write.
+
+    Rows update existing records with the same name and add the rest;
+    blank cells keep the existing value, or the default on new records.
+    Nothing is written when any row fails validation, unless
+    `skip_invalid` is set, in which case only the valid rows are committed.
+    """
+    if entity not in ENTITY_FIELDS:
+        raise ValueError(f"Cannot import {entity}")
+    result = ImportResult()
+    rows = iter_rows(Path(path), delimiter)
+    records, batch, seen = [], [], set()
+
+    for line, row in rows:
+        if mapping is None:
+            mapping = default_mapping(entity, row.keys())
+            if "name" not in mapping.values():
+                result.error(1, None, "no column maps to 'name'")
+                return result
+        batch.append((line, row))
+        result.rows += 1
+        if len(batch) >= BATCH_SIZE:
+            records.extend(_validate_batch(entity, batch, mapping, result, seen))
+            batch = []
+    if batch:
+        records.extend(_validate_batch(entity, batch, mapping, result, seen))
+
+    if result.error_count and not skip_invalid:
+        return result
+
+    file = DATA_DIR / TAB_FILES[entity]
+    existing = read_json(file) or []
+    by_name = {r.get("name"): i for i, r in enumerate(existing)}
+    for record in records:
+        i = by_name.get(record["name"])
+        if i is None:
+            for field in mapping.values():
+                if not _has_path(record, field):
+                    _set_path(record, field, _convert(ENTITY_FIELDS[entity][field], ""))
+            existing.append(record)
+            result.added += 1
+        else:
+            _merge(existing[i], record)
+            result.updated += 1
+
+    write_json(file, existing)
+    result.committed = True
+    notify_reloaded()
+    return result
+
+
+def _merge(target, source):
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("usage: bulk_import.py drivers|staff|sponsors FILE [--skip-invalid]")
+        sys.exit(2)
+    outcome = import_file(sys.argv[1], Path(sys.argv[2]), skip_invalid="--skip-invalid" in sys.argv)
+    for err in outcome.errors:
+        print(err)
+    print(f"{outcome.rows} rows, {outcome.added} added, {outcome.updated} updated, "
+          f"{outcome.error_count} errors, {'committed' if outcome.committed else 'not committed'}")
+    sys.exit(0 if outcome.committed else 1)
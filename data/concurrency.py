@@ -0,0 +1,280 @@
+# concurrency.py
+import json
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+
+import serialization
+from utils import (
+    DATA_DIR, FILE_NAMES, DataWriteError, read_json_file, write_json_file, flush_writes,
+    atomic_write_bytes, split_records, join_records, set_shared_guard, get_shared_guard,
+    notify_saved, notify_reloaded
+)
+
+META_DIR = DATA_DIR / ".meta"
+SHARED_ENV = "TP_SHARED_DATA"
+LOCK_TIMEOUT = 5.0
+# a lock older than this belongs to a crashed instance
+LOCK_STALE_AFTER = 30.0
+
+
+class LockTimeout(DataWriteError):
+    pass
+
+
+class Conflict:
+    def __init__(self, key, mine, theirs):
+        self.key = key
+        self.mine = mine  # None if deleted here
+        self.theirs = theirs  # None if deleted by the other instance
+
+    def __repr__(self):
+        return f"Conflict({self.key!r})"
+
+
+class ConflictError(Exception):
+    """Another instance saved different changes to the same records.
+
+    Call retry({key: "mine" | "theirs"}) once the user has picked a side
+    for every conflict; it may raise again if more saves came in meanwhile.
+    """
+
+    def __init__(self, guard, path, data, conflicts, owner=None):
+        super().__init__(f"{len(conflicts)} record(s) in {path.name} were changed elsewhere")
+        self.guard = guard
+        self.path = path
+        self.data = data
+        self.conflicts = conflicts
+        self.owner = owner
+
+    def retry(self, resolutions):
+        self.guard.write(self.path, self.data, resolutions, self.owner)
+
+
+# --------------------
+# Advisory lock
+# --------------------
+class FileLock:
+    """Lock file created with O_EXCL; only other editor instances honour it."""
+
+    def __init__(self, path: Path, timeout=LOCK_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+
+    def __enter__(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if self._break_stale():
+                    continue
+                if time.monotonic() > deadline:
+                    raise LockTimeout(self.path, f"locked by {self.owner()}")
+                time.sleep(0.05)
+                continue
+            with os.fdopen(fd, "w") as f:
+                json.dump({"host": socket.gethostname(), "pid": os.getpid(), "time": time.time()}, f)
+            return self
+
+    def __exit__(self, *exc):
+        self.path.unlink(missing_ok=True)
+
+    def owner(self):
+        try:
+            info = json.loads(self.path.read_text())
+            return f"{info.get('host')} (pid {info.get('pid')})"
+        except (OSError, ValueError):
+            return "another instance"
+
+    def _break_stale(self):
+        try:
+            age = time.time() - self.path.stat().st_mtime
+        except FileNotFoundError:
+            return True
+        if age > LOCK_STALE_AFTER:
+            self.path.unlink(missing_ok=True)
+            return True
+        return False
+
+
+# --------------------
+# Versions
+# --------------------
+def _unreferenced(data):
+    # the snapshot's attribute and this function's argument are the only references
+    return sys.getrefcount(data) <= 3
+
+
+def _fingerprint(record):
+    return None if record is None else hash(serialization.canonical(record))
+
+
+def versions_path(path: Path):
+    return META_DIR / (path.name + ".versions.json")
+
+
+def load_versions(path: Path):
+    versions = read_json_file(versions_path(path))
+    return versions if isinstance(versions, dict) else {}
+
+
+class Snapshot:
+    """What one read saw: {key: (version, fingerprint)}."""
+
+    def __init__(self, data, entries):
+        self.data = data  # kept alive so id(data) stays meaningful; None for owned reads
+        self.entries = entries
+
+
+class SharedGuard:
+    """Record-level optimistic concurrency for a data directory shared by instances.
+
+    Every record has a version counter in .meta/<file>.versions.json. Reads
+    remember the version and content fingerprint of each record; a save
+    takes the lock, re-reads the file and merges: records only this
+    instance changed are written, records only others changed are kept
+    (and announced through notify_saved), and records both changed
+    differently raise ConflictError.
+
+    A save merges against the read its data came from: the owner's last
+    read (tabs pass themselves, as they rebuild what they save), or else
+    the read that returned this very object. A save with no such read has
+    nothing to tell local edits from stale copies, so every record that
+    differs from the file is a conflict.
+    """
+
+    def __init__(self):
+        self.snapshots = {}  # path -> {("owner", owner) | ("data", id(data)): Snapshot}
+
+    # --- reads ---
+    def read(self, path: Path, owner=None):
+        data = read_json_file(path)
+        self._remember(path, owner, data, self._entries(path, data, load_versions(path)))
+        return data
+
+    @staticmethod
+    def _entries(path, data, versions):
+        name = FILE_NAMES.get(path.name, path.name)
+        return {k: (versions.get(k, 0), _fingerprint(r)) for k, r in split_records(name, data).items()}
+
+    def _remember(self, path, owner, data, entries):
+        shots = self.snapshots.setdefault(path, {})
+        # drop reads nobody holds on to any more
+        for key in [k for k, s in shots.items() if s.data is not None and _unreferenced(s.data)]:
+            del shots[key]
+        if owner is not None:
+            shots["owner", owner] = Snapshot(None, entries)
+        else:
+            shots["data", id(data)] = Snapshot(data, entries)
+
+    def _base(self, path, owner, data):
+        shots = self.snapshots.get(path) or {}
+        if owner is not None:
+            return shots.get(("owner", owner))
+        shot = shots.get(("data", id(data)))
+        return shot if shot is not None and shot.data is data else None
+
+    # --- writes ---
+    def write(self, path: Path, data, resolutions=None, owner=None):
+        META_DIR.mkdir(exist_ok=True)
+        name = FILE_NAMES.get(path.name, path.name)
+        with FileLock(META_DIR / (path.name + ".lock")):
+            versions = load_versions(path)
+            disk = split_records(name, read_json_file(path))
+            ours = split_records(name, data)
+            base = self._base(path, owner, data)
+            merged, taken, conflicts = self._merge(ours, disk, versions, base, resolutions or {})
+            if conflicts:
+                raise ConflictError(self, path, data, conflicts, owner)
+
+            for key in set(disk) | set(merged):
+                if _fingerprint(disk.get(key)) != _fingerprint(merged.get(key)):
+                    versions[key] = versions.get(key, 0) + 1
+            write_json_file(path, join_records(name, merged))
+            # other instances read the file as soon as the lock is released
+            flush_writes([path])
+            atomic_write_bytes(versions_path(path), serialization.dumps(versions))
+
+        self._rebase(path, owner, data, ours, merged, versions, base)
+        # records picked up from other instances reach the indexes like local saves
+        for key in taken:
+            notify_saved(name, _named(name, key, ours.get(key)), _named(name, key, merged.get(key)))
+
+    @staticmethod
+    def _merge(ours, disk, versions, base, resolutions):
+        entries = base.entries if base else {}
+        merged, taken, conflicts = {}, [], []
+        for key in list(ours) + [k for k in disk if k not in ours]:
+            mine, theirs = ours.get(key), disk.get(key)
+            seen = entries.get(key)
+            if base is None:
+                # no read to compare with: any difference may be a stale copy
+                mine_changed = theirs_changed = True
+            elif seen is None:
+                # unknown when we read: new on one side, or on both
+                mine_changed = mine is not None
+                theirs_changed = theirs is not None
+            else:
+                mine_changed = _fingerprint(mine) != seen[1]
+                theirs_changed = versions.get(key, 0) != seen[0]
+
+            if not theirs_changed or _fingerprint(mine) == _fingerprint(theirs):
+                result = mine
+            elif not mine_changed:
+                result = theirs
+                taken.append(key)
+            elif key in resolutions:
+                result = mine if resolutions[key] == "mine" else theirs
+                if result is theirs:
+                    taken.append(key)
+            else:
+                conflicts.append(Conflict(key, mine, theirs))
+                continue
+            if result is not None:
+                merged[key] = result
+        return merged, taken, conflicts
+
+    def _rebase(self, path, owner, data, ours, merged, versions, base):
+        # the caller's data now matches the file for every record it wrote;
+        # records it has stale copies of keep their old base, so the next
+        # save still recognises them as changed elsewhere
+        entries = dict(base.entries) if base else {}
+        for key in set(ours) | set(merged):
+            if _fingerprint(ours.get(key)) == _fingerprint(merged.get(key)):
+                entries[key] = (versions.get(key, 0), _fingerprint(merged.get(key)))
+        self._remember(path, owner, data, entries)
+
+
+def _named(name, key, record):
+    # keyed files carry their key as "name" in save notifications
+    if record is None or not isinstance(record, dict) or "name" in record:
+        return record
+    if name in ("engines", "tyre_suppliers"):
+        return {"name": key, **record}
+    return record
+
+
+# --------------------
+# Switch
+# --------------------
+def enable():
+    if get_shared_guard() is None:
+        set_shared_guard(SharedGuard())
+        # re-read everything so every tab's data has a snapshot to merge against
+        notify_reloaded()
+
+
+def disable():
+    if get_shared_guard() is not None:
+        set_shared_guard(None)
+
+
+def is_enabled():
+    return get_shared_guard() is not None
+
+
+def enabled_by_environment():
+    return os.environ.get(SHARED_ENV, "") not in ("", "0")
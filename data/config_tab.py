@@ -1,10 +1,12 @@
 # config_tab.py
 from PyQt6.QtWidgets import (
-    QWidget, QHBoxLayout, QVBoxLayout, QScrollArea, QFormLayout,
-    QLabel, QLineEdit, QListWidget, QPushButton, QMessageBox, QComboBox
+    QWidget, QHBoxLayout, QVBoxLayout, QListWidget, QMessageBox, QComboBox, QStackedWidget
 )
-from PyQt6.QtCore import Qt
-from utils import DATA_DIR, TAB_FILES, read_json, write_json, ACCENT, TEXT
+from utils import DATA_DIR, TAB_FILES, read_json
+from dialogs import save_json
+from form_builder import FormCache
+from sim_models import get_compiled_models
+from pit_strategy import STRATEGY_SECTIONS, solve_season, dominance_report, dominant_strategy
 
 
 class ConfigTab(QWidget):
@@ -21,14 +23,10 @@ class ConfigTab(QWidget):
         left_layout.addWidget(self.list)
         layout.addLayout(left_layout, 1)
 
-        # Scrollable detail panel
-        self.detail_area = QScrollArea()
-        self.detail_area.setWidgetResizable(True)
-        layout.addWidget(self.detail_area, 3)
-
-        detail_widget = QWidget()
-        self.form_layout = QFormLayout(detail_widget)
-        self.detail_area.setWidget(detail_widget)
+        # Detail panel: one cached, scrollable form per section
+        self.detail_stack = QStackedWidget()
+        layout.addWidget(self.detail_stack, 3)
+        self.forms = FormCache(self.detail_stack)
 
         self.fields = {}
         self.config_data = {}
@@ -38,76 +36,23 @@ class ConfigTab(QWidget):
         # Connections
         self.list.currentRowChanged.connect(self.display_section)
 
-    def add_section_header(self, title: str):
-        """Add styled header like drivers tab"""
-        lbl = QLabel(title)
-        lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        lbl.setStyleSheet(f"""
-            font-weight: bold;
-            border: 1px solid {ACCENT};
-            padding: 4px;
-            margin-top: 8px;
-            margin-bottom: 4px;
-            border-radius: 4px;
-            background-color: #2f3436;
-            color: {TEXT};
-        """)
-        self.form_layout.addRow(lbl)
-
     def load_data(self):
-        self.config_data = read_json(self.file) or {}
+        self.config_data = read_json(self.file, owner=self) or {}
+        self.models = get_compiled_models()
+        self.models.update_config(self.config_data)
+        self.forms.clear()
         self.list.clear()
         for key in self.config_data.keys():
             self.list.addItem(key.replace("_", " ").capitalize())
 
     def display_section(self, index):
-        # Clear form
-        while self.form_layout.rowCount():
-            self.form_layout.removeRow(0)
-        self.fields.clear()
-
         if index < 0:
+            self.fields = {}
             return
 
         section_key = list(self.config_data.keys())[index]
-        section_data = self.config_data[section_key]
-
-        # Add header
-        self.add_section_header(section_key.replace("_", " ").capitalize())
-
-        # Populate fields depending on section
-        if isinstance(section_data, dict):
-            for key, value in section_data.items():
-                self.add_field(section_key, key, value)
-        elif isinstance(section_data, list):
-            self.fields[section_key] = QLineEdit(str(section_data))
-            self.form_layout.addRow(section_key.capitalize(), self.fields[section_key])
-        else:
-            self.fields[section_key] = QLineEdit(str(section_data))
-            self.form_layout.addRow(section_key.capitalize(), self.fields[section_key])
-
-        # Save button
-        save_btn = QPushButton("Save Changes")
-        self.form_layout.addRow(save_btn)
-        save_btn.clicked.connect(lambda: self.save_section(section_key))
-
-    def add_field(self, section_key, key, value):
-        label = key.replace("_", " ").capitalize()
-        if isinstance(value, bool):
-            field = QComboBox()
-            field.addItems(["True", "False"])
-            field.setCurrentText("True" if value else "False")
-        elif isinstance(value, dict):
-            # Nested dicts (like tyre compounds, start probabilities)
-            self.add_section_header(label)
-            for subkey, subval in value.items():
-                self.add_field(section_key, f"{key}.{subkey}", subval)
-            return
-        else:
-            field = QLineEdit(str(value))
-
-        self.fields[f"{section_key}.{key}"] = field
-        self.form_layout.addRow(label, field)
+        page = self.forms.show(section_key, self.config_data[section_key], self.save_section)
+        self.fields = page.fields
 
     def save_section(self, section_key):
         section_data = self.config_data[section_key]
@@ -122,9 +67,27 @@ class ConfigTab(QWidget):
             widget = self.fields[section_key]
             self.config_data[section_key] = self.parse_value(widget.text())
 
-        write_json(self.file, self.config_data)
+        if not save_json(self, self.file, self.config_data):
+            return
+        self.forms.invalidate_values()
+        self.models.update_section(section_key, self.config_data[section_key])
         QMessageBox.information(self, "Saved", f"Config section '{section_key}' updated!")
 
+        if section_key in STRATEGY_SECTIONS:
+            self.check_strategies()
+
+    def check_strategies(self):
+        """Re-solve optimal pit strategies and warn if one plan dominates"""
+        results = solve_season(config=self.config_data)
+        dominant = dominant_strategy(results)
+        if dominant is None:
+            return
+        summary = "\n".join(f"{sig}: {share:.0%}" for sig, share in dominance_report(results)[:5])
+        QMessageBox.warning(
+            self, "Dominant Strategy",
+            f"'{dominant}' is the optimal plan for almost every entry.\n\n{summary}"
+        )
+
     def set_nested_value(self, data, path, widget):
         key = path[0]
         if len(path) == 1:
@@ -0,0 +1,184 @@
+# contract_index.py
+from bisect import bisect_left, bisect_right
+
+from utils import DATA_DIR, TAB_FILES, read_json, add_save_listener, add_reload_listener
+
+MAX_MAIN_DRIVERS = 2
+
+
+class Contract:
+    __slots__ = ("kind", "name", "team", "role", "start", "end")
+
+    def __init__(self, kind, name, team, role, start, end):
+        self.kind = kind  # "drivers" or "staff"
+        self.name = name
+        self.team = team
+        self.role = role
+        self.start = start  # first week
+        self.end = end  # first week no longer under contract
+
+    def __eq__(self, other):
+        return isinstance(other, Contract) and self._values() == other._values()
+
+    def _values(self):
+        return (self.kind, self.name, self.team, self.role, self.start, self.end)
+
+    def __repr__(self):
+        return f"Contract({self.kind}, {self.name!r}, {self.team!r}, weeks {self.start}-{self.end - 1})"
+
+
+def contract_from_record(kind, record):
+    contract = record.get("contract") or {}
+    team = contract.get("team")
+    if not team or team == "Null":
+        return None
+    try:
+        start = int(float(contract.get("start_week") or 1))
+        length = int(float(contract.get("length_weeks") or 0))
+    except (TypeError, ValueError):
+        return None
+    if length <= 0:
+        return None
+    if kind == "drivers":
+        # drivers signed to a team default to a main seat, as in DriversTab
+        role = contract.get("role") or "main"
+    else:
+        role = record.get("role")
+    return Contract(kind, record.get("name"), team, role, start, start + length)
+
+
+# --------------------
+# Interval tree
+# --------------------
+class _Node:
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+
+def _build(contracts):
+    if not contracts:
+        return None
+    points = sorted(p for c in contracts for p in (c.start, c.end - 1))
+    node = _Node()
+    node.center = points[len(points) // 2]
+    here, left, right = [], [], []
+    for c in contracts:
+        if c.end - 1 < node.center:
+            left.append(c)
+        elif c.start > node.center:
+            right.append(c)
+        else:
+            here.append(c)
+    node.by_start = sorted(here, key=lambda c: c.start)
+    node.by_end = sorted(here, key=lambda c: c.end, reverse=True)
+    node.left = _build(left)
+    node.right = _build(right)
+    return node
+
+
+class ContractIndex:
+    """Interval tree plus sorted end weeks over every driver and staff contract.
+
+    Point queries are O(log n + k); the index is rebuilt lazily after saves.
+    """
+
+    def __init__(self, contracts=()):
+        self.contracts = list(contracts)
+        self._root = None
+        self._ends = []
+        self._by_end = []
+        self._dirty = True
+
+    @classmethod
+    def from_files(cls):
+        index = cls()
+        index.reload()
+        return index
+
+    def reload(self):
+        self.contracts = []
+        for kind in ("drivers", "staff"):
+            for record in read_json(DATA_DIR / TAB_FILES[kind]) or []:
+                contract = contract_from_record(kind, record)
+                if contract is not None:
+                    self.contracts.append(contract)
+        self._dirty = True
+
+    def apply(self, name, old, new):
+        """Save listener for drivers and staff edits."""
+        if name not in ("drivers", "staff"):
+            return
+        if old is not None:
+            # names can repeat, so only drop the one contract built from old
+            contract = contract_from_record(name, old)
+            if contract in self.contracts:
+                self.contracts.remove(contract)
+        if new is not None:
+            contract = contract_from_record(name, new)
+            if contract is not None:
+                self.contracts.append(contract)
+        self._dirty = True
+
+    def _ensure(self):
+        if not self._dirty:
+            return
+        self._root = _build(self.contracts)
+        self._by_end = sorted(self.contracts, key=lambda c: c.end)
+        self._ends = [c.end for c in self._by_end]
+        self._dirty = False
+
+    # --------------------
+    # Queries
+    # --------------------
+    def at(self, week, kind=None):
+        """Contracts active in `week`."""
+        self._ensure()
+        found = []
+        node = self._root
+        while node is not None:
+            if week < node.center:
+                for c in node.by_start:
+                    if c.start > week:
+                        break
+                    found.append(c)
+                node = node.left
+            elif week > node.center:
+                for c in node.by_end:
+                    if c.end - 1 < week:
+                        break
+                    found.append(c)
+                node = node.right
+            else:
+                found.extend(node.by_start)
+                break
+        if kind is not None:
+            found = [c for c in found if c.kind == kind]
+        return found
+
+    def opening_between(self, first_week, last_week, kind=None):
+        """Contracts whose seat opens (first week off contract) in [first_week, last_week]."""
+        self._ensure()
+        lo = bisect_left(self._ends, first_week)
+        hi = bisect_right(self._ends, last_week)
+        found = self._by_end[lo:hi]
+        if kind is not None:
+            found = [c for c in found if c.kind == kind]
+        return found
+
+    def over_main_limit(self, week, limit=MAX_MAIN_DRIVERS):
+        """{team: [contracts]} for teams with more than `limit` main drivers in `week`."""
+        mains = {}
+        for c in self.at(week, "drivers"):
+            if c.role == "main":
+                mains.setdefault(c.team, []).append(c)
+        return {team: cs for team, cs in mains.items() if len(cs) > limit}
+
+
+_index = None
+
+def get_contract_index():
+    global _index
+    if _index is None:
+        _index = ContractIndex.from_files()
+        add_save_listener(_index.apply)
+        add_reload_listener(_index.reload)
+    return _index
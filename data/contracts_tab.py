@@ -0,0 +1,112 @@
+# contracts_tab.py
+from PyQt6.QtWidgets import (
+    QWidget, QHBoxLayout, QVBoxLayout, QLabel, QSpinBox, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView
+)
+from utils import add_save_listener
+from contract_index import get_contract_index
+
+TIMELINE_WEEKS = 156
+TIMELINE_CHARS = 52
+
+
+class ContractsTab(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.index = get_contract_index()
+
+        layout = QVBoxLayout(self)
+        self.setLayout(layout)
+
+        # --- Controls ---
+        controls = QHBoxLayout()
+        self.week_from = QSpinBox()
+        self.week_from.setRange(1, TIMELINE_WEEKS)
+        self.week_to = QSpinBox()
+        self.week_to.setRange(1, TIMELINE_WEEKS)
+        self.week_to.setValue(52)
+
+        self.active_btn = QPushButton("Under Contract")
+        self.opening_btn = QPushButton("Seats Opening")
+        self.over_btn = QPushButton("Over Two Mains")
+
+        controls.addWidget(QLabel("Week"))
+        controls.addWidget(self.week_from)
+        controls.addWidget(QLabel("to"))
+        controls.addWidget(self.week_to)
+        controls.addStretch()
+        controls.addWidget(self.active_btn)
+        controls.addWidget(self.opening_btn)
+        controls.addWidget(self.over_btn)
+        layout.addLayout(controls)
+
+        self.status = QLabel("")
+        layout.addWidget(self.status)
+
+        # --- Timeline table ---
+        self.table = QTableWidget()
+        self.table.setColumnCount(6)
+        self.table.setHorizontalHeaderLabels(["Type", "Name", "Team", "Role", "Weeks", "Timeline"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        # Connections
+        self.active_btn.clicked.connect(self.show_active)
+        self.opening_btn.clicked.connect(self.show_opening)
+        self.over_btn.clicked.connect(self.show_over_limit)
+        self.week_from.valueChanged.connect(self.refresh)
+        self.week_to.valueChanged.connect(self.refresh)
+        add_save_listener(self.on_record_saved)
+
+        self.mode = "active"
+        self.refresh()
+
+    def on_record_saved(self, name, old, new):
+        if name in ("drivers", "staff"):
+            self.refresh()
+
+    def refresh(self):
+        if self.mode == "opening":
+            self.show_opening()
+        elif self.mode == "over":
+            self.show_over_limit()
+        else:
+            self.show_active()
+
+    def show_active(self):
+        self.mode = "active"
+        week = self.week_from.value()
+        contracts = sorted(self.index.at(week), key=lambda c: (c.team or "", c.kind, c.name or ""))
+        self.status.setText(f"{len(contracts)} contracts active in week {week}")
+        self.fill_table(contracts)
+
+    def show_opening(self):
+        self.mode = "opening"
+        a, b = self.week_from.value(), self.week_to.value()
+        contracts = self.index.opening_between(min(a, b), max(a, b))
+        self.status.setText(f"{len(contracts)} seats open between weeks {min(a, b)} and {max(a, b)}")
+        self.fill_table(contracts)
+
+    def show_over_limit(self):
+        self.mode = "over"
+        week = self.week_from.value()
+        over = self.index.over_main_limit(week)
+        contracts = [c for team in sorted(over) for c in over[team]]
+        teams = ", ".join(sorted(over)) or "none"
+        self.status.setText(f"Teams over two main drivers in week {week}: {teams}")
+        self.fill_table(contracts)
+
+    def fill_table(self, contracts):
+        self.table.setRowCount(len(contracts))
+        for r, c in enumerate(contracts):
+            values = [c.kind.capitalize(), c.name or "", c.team or "", c.role or "",
+                      f"{c.start}-{c.end - 1}", timeline_bar(c.start, c.end)]
+            for col, value in enumerate(values):
+                self.table.setItem(r, col, QTableWidgetItem(value))
+
+
+def timeline_bar(start, end, weeks=TIMELINE_WEEKS, width=TIMELINE_CHARS):
+    """Text bar showing which part of the timeline a contract covers."""
+    scale = weeks / width
+    return "".join("█" if start <= (i + 0.5) * scale + 1 < end else "·" for i in range(width))
@@ -0,0 +1,239 @@
+# data_diff.py
+import sys
+from pathlib import Path
+
+from utils import (
+    DATA_DIR, TAB_FILES, FILE_NAMES, read_json, read_json_file, write_json, write_json_file,
+    split_records, join_records, flush_writes, notify_reloaded
+)
+
+# Sources are data sets to compare: "current" (what the editor shows),
+# "mod:<name>", "snapshot:<id>" or a directory path. Records are matched
+# by their stable key (see record_key in utils), so every comparison is a
+# pair of dict lookups per record and the whole diff is linear.
+
+_ABSENT = object()  # a missing record or field, unlike a JSON null
+
+
+# --------------------
+# Sources
+# --------------------
+class Source:
+    def __init__(self, spec):
+        self.spec = spec
+        self._files = {}
+
+    @property
+    def label(self):
+        return self.spec if self.spec != "current" else "current data"
+
+    def records(self, filename):
+        """{key: record} for one TAB_FILES entry; shared, do not mutate."""
+        if filename not in self._files:
+            self._files[filename] = self._read(filename)
+        return self._files[filename]
+
+    def _read(self, filename):
+        name = FILE_NAMES[filename]
+        if self.spec == "current":
+            return split_records(name, read_json(DATA_DIR / filename, owner=self))
+        if self.spec.startswith("mod:"):
+            import profiles
+            return profiles.get_profile(self.spec[4:]).resolved_records(filename)
+        if self.spec.startswith("snapshot:"):
+            import snapshots
+            store = snapshots.get_snapshot_store()
+            return store.records(store.get(self.spec[9:]), filename)
+        path = Path(self.spec) / filename
+        return split_records(name, read_json_file(path) if path.exists() else None)
+
+    def write(self, filename, records):
+        name = FILE_NAMES[filename]
+        if self.spec == "current":
+            write_json(DATA_DIR / filename, join_records(name, records), owner=self)
+        elif self.spec.startswith("mod:"):
+            import profiles
+            profile = profiles.get_profile(self.spec[4:])
+            profile.write(filename, join_records(name, records))
+            flush_writes([profile.overlay_path(filename)])
+        elif self.spec.startswith("snapshot:"):
+            raise ValueError(f"{self.label} is read-only")
+        else:
+            path = Path(self.spec) / filename
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_json_file(path, join_records(name, records))
+            flush_writes([path])
+        self._files[filename] = records
+
+
+# --------------------
+# Diff
+# --------------------
+class RecordDiff:
+    def __init__(self, filename, key, kind, fields):
+        self.filename = filename
+        self.key = key
+        self.kind = kind  # "added", "removed" or "changed"
+        self.fields = fields  # [(dotted path, left value, right value)]
+
+    def __repr__(self):
+        return f"RecordDiff({self.filename}, {self.key!r}, {self.kind})"
+
+
+def field_changes(left, right, prefix=""):
+    """[(dotted path, left, right)] where two values differ, recursing into dicts."""
+    if isinstance(left, dict) and isinstance(right, dict):
+        out = []
+        for k in dict.fromkeys(list(left) + list(right)):
+            a, b = left.get(k, _ABSENT), right.get(k, _ABSENT)
+            if a != b:
+                out += field_changes(a, b, f"{prefix}{k}.")
+        return out
+    return [(prefix[:-1], _shown(left), _shown(right))]
+
+
+def _shown(value):
+    return None if value is _ABSENT else value
+
+
+def diff_file(left, right, filename):
+    a, b = left.records(filename), right.records(filename)
+    out = []
+    for key, rec in a.items():
+        other = b.get(key, _ABSENT)
+        if other is _ABSENT:
+            out.append(RecordDiff(filename, key, "removed", []))
+        elif other != rec:
+            out.append(RecordDiff(filename, key, "changed", field_changes(rec, other)))
+    for key in b:
+        if key not in a:
+            out.append(RecordDiff(filename, key, "added", []))
+    return out
+
+
+def diff(left, right, files=None):
+    """{filename: [RecordDiff]} for files with differences, left to right."""
+    result = {}
+    for filename in files or TAB_FILES.values():
+        changes = diff_file(left, right, filename)
+        if changes:
+            result[filename] = changes
+    return result
+
+
+# --------------------
+# Three-way merge
+# --------------------
+class MergeConflict:
+    def __init__(self, filename, key, path, base, ours, theirs):
+        self.filename = filename
+        self.key = key
+        self.path = path  # dotted field path, "" for the whole record
+        self.base = _shown(base)
+        self.ours = _shown(ours)
+        self.theirs = _shown(theirs)
+
+    def __repr__(self):
+        return f"MergeConflict({self.filename}, {self.key!r}, {self.path!r})"
+
+
+def merge_value(base, ours, theirs, on_conflict, path=""):
+    """Three-way merge of one value; dicts merge key by key.
+
+    on_conflict(path, base, ours, theirs) picks the value where both sides
+    changed the same field differently. _ABSENT stands for a missing value.
+    """
+    if ours == theirs:
+        return ours
+    if ours == base:
+        return theirs
+    if theirs == base:
+        return ours
+    if isinstance(ours, dict) and isinstance(theirs, dict):
+        base = base if isinstance(base, dict) else {}
+        merged = {}
+        for k in dict.fromkeys(list(ours) + list(theirs)):
+            value = merge_value(base.get(k, _ABSENT), ours.get(k, _ABSENT), theirs.get(k, _ABSENT),
+                                on_conflict, f"{path}.{k}" if path else k)
+            if value is not _ABSENT:
+                merged[k] = value
+        return merged
+    return on_conflict(path, base, ours, theirs)
+
+
+def merge_file(base, ours, theirs, filename, keys=None, resolutions=None, prefer=None):
+    """Merged {key: record} and [MergeConflict] for one file.
+
+    Only records in `keys` (all if None) take changes from theirs; without
+    a base they simply become theirs. resolutions maps (key, path) or key
+    to "ours" / "theirs", prefer settles the rest; conflicts left over
+    keep ours and are reported.
+    """
+    resolutions = resolutions or {}
+    b = base.records(filename) if base is not None else {}
+    o, t = ours.records(filename), theirs.records(filename)
+    conflicts = []
+    merged = {}
+    for key in list(o) + [k for k in t if k not in o]:
+        mine = o.get(key, _ABSENT)
+        if keys is not None and key not in keys:
+            value = mine
+        else:
+            def on_conflict(path, bv, ov, tv, key=key):
+                choice = resolutions.get((key, path), resolutions.get(key, prefer))
+                if choice is None:
+                    conflicts.append(MergeConflict(filename, key, path, bv, ov, tv))
+                return tv if choice == "theirs" else ov
+            # with no base, theirs is compared against ours so its changes apply
+            old = b.get(key, _ABSENT) if base is not None else mine
+            value = merge_value(old, mine, t.get(key, _ABSENT), on_conflict)
+        if value is not _ABSENT:
+            merged[key] = value
+    return merged, conflicts
+
+
+def merge(base, ours, theirs, files=None, keys=None, resolutions=None, prefer=None, write=True):
+    """Merge theirs into ours file by file; returns {filename: [MergeConflict]}.
+
+    keys: {filename: set of record keys} to limit which records take
+    changes from theirs. Files only get written if something changed.
+    """
+    conflicts = {}
+    for filename in files or TAB_FILES.values():
+        only = None if keys is None else keys.get(filename, set())
+        if only is not None and not only:
+            continue
+        merged, found = merge_file(base, ours, theirs, filename, only, resolutions, prefer)
+        if found:
+            conflicts[filename] = found
+        if write and merged != ours.records(filename):
+            ours.write(filename, merged)
+    if write and ours.spec == "current":
+        notify_reloaded()
+    return conflicts
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if len(args) >= 2 and args[0] == "diff":
+        left, right = Source(args[1]), Source(args[2])
+        for filename, changes in diff(left, right, args[3:] or None).items():
+            print(f"{filename}: {len(changes)} record(s) differ")
+            for c in changes:
+                print(f"  {'+-~'['added removed changed'.split().index(c.kind)]} {c.key}")
+                for path, a, b in c.fields:
+                    print(f"      {path}: {a!r} -> {b!r}")
+    elif len(args) >= 4 and args[0] == "merge":
+        # merge BASE OURS THEIRS [--theirs]: conflicts keep ours unless --theirs
+        prefer = "theirs" if "--theirs" in args else None
+        base, ours, theirs = (Source(a) if a != "-" else None for a in args[1:4])
+        found = merge(base, ours, theirs, prefer=prefer)
+        for filename, conflicts in found.items():
+            for c in conflicts:
+                print(f"conflict {filename} {c.key} {c.path}: base {c.base!r}, ours {c.ours!r}, theirs {c.theirs!r}")
+        print("merged into", ours.label)
+    else:
+        print("usage: data_diff.py diff LEFT RIGHT [file ...]\n"
+              "       data_diff.py merge BASE|- OURS THEIRS [--theirs]\n"
+              "sources: current, mod:NAME, snapshot:ID or a folder")
+        sys.exit(2)
@@ -0,0 +1,269 @@
+# dedupe.py
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+
+from utils import DATA_DIR, TAB_FILES, read_json, write_json, notify_saved
+
+DEDUPE_ENTITIES = ("drivers", "staff", "sponsors")
+DEFAULT_THRESHOLD = 0.88
+NEIGHBOURHOOD = 3
+# blocks larger than this are split by name token; parts still larger are skipped
+MAX_BLOCK = 24
+# candidate pairs filtered per numpy batch
+PAIR_CHUNK = 1 << 20
+
+
+# --------------------
+# Normalisation and keys
+# --------------------
+def normalise(name):
+    name = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9 ]+", "", name.lower()).strip()
+
+
+_DIGITS = re.compile(r"\d")
+_ALPHABET = "abcdefghijklmnopqrstuvwxyz0123456789 "
+_ALPHABET_CODES = np.full(256, len(_ALPHABET), dtype=np.int64)
+_ALPHABET_CODES[np.frombuffer(_ALPHABET.encode("ascii"), dtype=np.uint8)] = np.arange(len(_ALPHABET))
+_SOUNDEX = str.maketrans("bfpvcgjkqsxzdtlmnr", "111122222222334556")
+
+@lru_cache(maxsize=65536)
+def soundex(word):
+    if not word:
+        return ""
+    word = word.lower()
+    codes = word.translate(_SOUNDEX)
+    out, last = word[0].upper(), codes[0]
+    for ch, code in zip(word[1:], codes[1:]):
+        if code.isdigit() and code != last:
+            out += code
+        if ch not in "hw":
+            last = code
+        if len(out) == 4:
+            break
+    return out.ljust(4, "0")
+
+
+def blocking_keys(norm):
+    """Phonetic keys for every token pair, so swapped or misspelt names collide."""
+    tokens = [t for t in norm.split() if t]
+    letters = [_DIGITS.sub("", t) for t in tokens]
+    sounds = sorted({soundex(t) for t in letters if t})
+    keys = {"ph:" + "|".join(sounds)}
+    if len(tokens) > 1:
+        # last token only helps with typos in first names ("Jon Smith" / "John Smith")
+        keys.add(f"last:{soundex(tokens[-1])}:{tokens[0][:1]}")
+    return keys
+
+
+def edit_distance(a, b, limit):
+    """Edits (insert, delete, change or swap two adjacent letters) from a to b,
+    or limit + 1 once there must be more than limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    # a shared prefix and suffix cost nothing, and typos leave most of a name alone
+    start, i, j = 0, len(a), len(b)
+    while start < i and start < j and a[start] == b[start]:
+        start += 1
+    while i > start and j > start and a[i - 1] == b[j - 1]:
+        i -= 1
+        j -= 1
+    a, b = a[start:i], b[start:j]
+    if len(a) > len(b):
+        a, b = b, a
+    if not a:
+        return len(b) if len(b) <= limit else limit + 1
+    if limit <= 1:
+        # what is left must be one changed letter or one swapped pair
+        if len(b) == 1 or (len(a) == len(b) == 2 and a == b[::-1]):
+            return 1
+        return limit + 1
+    before, prev = None, list(range(len(b) + 1))
+    for x, ca in enumerate(a, 1):
+        cur = [x]
+        for y, cb in enumerate(b, 1):
+            cost = min(prev[y] + 1, cur[y - 1] + 1, prev[y - 1] + (ca != cb))
+            if before is not None and y > 1 and ca == b[y - 2] and cb == a[x - 2]:
+                cost = min(cost, before[y - 2] + 1)
+            cur.append(cost)
+        if min(cur) > limit:
+            return limit + 1
+        before, prev = prev, cur
+    return prev[-1] if prev[-1] <= limit else limit + 1
+
+
+def similarity(a, b):
+    """1 - edits / length of the longer name; one typo in a 10 letter name scores 0.9."""
+    if a == b:
+        return 1.0
+    longest = max(len(a), len(b))
+    return 1 - edit_distance(a, b, longest) / longest
+
+
+# --------------------
+# Report
+# --------------------
+class Candidate:
+    def __init__(self, a, b, score):
+        self.a = a  # (entity, index, name)
+        self.b = b
+        self.score = score
+
+    @property
+    def cross_entity(self):
+        return self.a[0] != self.b[0]
+
+    def __repr__(self):
+        return f"Candidate({self.a[2]!r} [{self.a[0]}] ~ {self.b[2]!r} [{self.b[0]}], {self.score:.2f})"
+
+
+class DuplicateReport(list):
+    """Candidates, best first, plus what blocking could not compare."""
+
+    def __init__(self, candidates=(), skipped_blocks=0, unchecked=0):
+        super().__init__(candidates)
+        self.skipped_blocks = skipped_blocks
+        self.unchecked = unchecked  # records left out of every comparison block
+
+
+def find_duplicates(records_by_entity=None, threshold=DEFAULT_THRESHOLD):
+    """Candidate duplicate pairs across drivers, staff and sponsors, as a DuplicateReport.
+
+    Pairs come from two blocking passes, so the work is close to linear:
+    records sharing a phonetic key, and records within NEIGHBOURHOOD
+    places of each other once all names are sorted. Pairs are scored by
+    edit distance (see similarity). A driver and a staff member sharing
+    a name is reported whatever the threshold.
+    """
+    if records_by_entity is None:
+        records_by_entity = {e: read_json(DATA_DIR / TAB_FILES[e]) or [] for e in DEDUPE_ENTITIES}
+
+    items = []  # (norm, ref)
+    for entity, records in records_by_entity.items():
+        for i, record in enumerate(records):
+            name = record.get("name", "")
+            items.append((normalise(name), (entity, i, name)))
+
+    # pairs are encoded as i * n + j (i < j) so the set holds plain ints
+    n = len(items)
+    pairs = set()
+    blocks = {}
+    for idx, (norm, _) in enumerate(items):
+        for key in blocking_keys(norm):
+            blocks.setdefault(key, []).append(idx)
+    compared, skipped, skipped_blocks = set(), set(), 0
+    for members in blocks.values():
+        if len(members) > MAX_BLOCK:
+            # soundex keeps four letters, so long names pile up; one typo
+            # leaves another token of a name intact, so split on tokens
+            parts = {}
+            for i in members:
+                for token in set(items[i][0].split()):
+                    parts.setdefault(token, []).append(i)
+            groups = parts.values()
+        else:
+            groups = [members]
+        for group in groups:
+            if len(group) > MAX_BLOCK:
+                skipped_blocks += 1
+                skipped.update(group)
+                continue
+            compared.update(group)
+            for x, i in enumerate(group):
+                pairs.update(i * n + j if i < j else j * n + i for j in group[x + 1:])
+
+    # sorted neighbourhood, on the name and on the reversed token order
+    for sort_key in (lambda i: items[i][0], lambda i: " ".join(reversed(items[i][0].split()))):
+        order = sorted(range(n), key=sort_key)
+        for pos, i in enumerate(order):
+            for j in order[pos + 1:pos + 1 + NEIGHBOURHOOD]:
+                pairs.add(i * n + j if i < j else j * n + i)
+
+    # exact filters before the edit distance, for all pairs at once: a
+    # name within k edits is within k letters in length and its letter
+    # counts differ by at most 2k
+    first, second = np.divmod(np.fromiter(pairs, dtype=np.int64, count=len(pairs)), n)
+    lengths = np.array([len(norm) for norm, _ in items], dtype=np.int64)
+    is_sponsor = np.array([ref[0] == "sponsors" for _, ref in items])
+    limits = ((1 - threshold) * np.maximum(lengths[first], lengths[second]) + 1e-9).astype(np.int64)
+    keep = (is_sponsor[first] == is_sponsor[second]) & (np.abs(lengths[first] - lengths[second]) <= limits)
+    first, second, limits = first[keep], second[keep], limits[keep]
+
+    width = len(_ALPHABET) + 1
+    codes = _ALPHABET_CODES[np.frombuffer("".join(norm for norm, _ in items).encode("ascii"), dtype=np.uint8)]
+    rows = np.repeat(np.arange(n, dtype=np.int64), lengths)
+    letters = np.bincount(rows * width + codes, minlength=n * width).reshape(n, width).astype(np.int16)
+    keep = np.zeros(len(first), dtype=bool)
+    for lo in range(0, len(first), PAIR_CHUNK):
+        part = slice(lo, lo + PAIR_CHUNK)
+        moved = np.abs(letters[first[part]] - letters[second[part]]).sum(axis=1)
+        keep[part] = moved <= 2 * limits[part]
+    first, second, limits = first[keep].tolist(), second[keep].tolist(), limits[keep].tolist()
+
+    found = []
+    for i, j, limit in zip(first, second, limits):
+        (na, ra), (nb, rb) = items[i], items[j]
+        if na == nb:
+            score = 1.0
+        else:
+            edits = edit_distance(na, nb, limit)
+            if edits > limit:
+                continue
+            score = 1 - edits / max(len(na), len(nb))
+        same_person = ra[0] != rb[0] and na == nb
+        if score >= threshold or same_person:
+            found.append(Candidate(ra, rb, score))
+    found.sort(key=lambda c: -c.score)
+    return DuplicateReport(found, skipped_blocks, len(skipped - compared))
+
+
+# --------------------
+# Merge
+# --------------------
+def merge(keep, drop):
+    """Fold `drop` into `keep` (refs from a Candidate) and delete `drop`.
+
+    Only same-entity pairs can be merged. Fields missing from the kept
+    record are filled from the dropped one, then both changes go through
+    the normal write and save notification path.
+    """
+    if keep[0] != drop[0]:
+        raise ValueError("Only records of the same kind can be merged")
+    entity = keep[0]
+    file = DATA_DIR / TAB_FILES[entity]
+    records = read_json(file) or []
+    kept = _find(records, keep)
+    dropped = _find(records, drop)
+    if kept is None or dropped is None or kept is dropped:
+        raise ValueError("Records changed since the report was built")
+
+    old = {k: v for k, v in kept.items()}
+    for key, value in dropped.items():
+        if kept.get(key) in (None, "", [], {}):
+            kept[key] = value
+    records.remove(dropped)
+
+    write_json(file, records)
+    notify_saved(entity, old, kept)
+    notify_saved(entity, dropped, None)
+    return kept
+
+
+def _find(records, ref):
+    _, index, name = ref
+    if 0 <= index < len(records) and records[index].get("name") == name:
+        return records[index]
+    return next((r for r in records if r.get("name") == name), None)
+
+
+if __name__ == "__main__":
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    report = find_duplicates()
+    for candidate in report[:limit]:
+        print(candidate)
+    if report.skipped_blocks:
+        print(f"{report.skipped_blocks} oversized block(s) skipped, {report.unchecked} record(s) not compared")
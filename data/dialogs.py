@@ -0,0 +1,553 @@
+# dialogs.py
+import time
+from pathlib import Path
+
+from PyQt6.QtWidgets import (
+    QFileDialog, QMessageBox, QInputDialog, QDialog, QVBoxLayout, QHBoxLayout,
+    QTableWidget, QTableWidgetItem, QPushButton, QLabel, QAbstractItemView, QProgressDialog,
+    QApplication, QComboBox, QHeaderView, QPlainTextEdit
+)
+
+import bulk_import
+import data_diff
+import dedupe
+import export
+import generator
+import profiles
+import snapshots
+from concurrency import ConflictError
+from utils import DATA_DIR, DataWriteError, write_json, notify_reloaded
+
+
+def save_json(parent, path, data):
+    """write_json, telling the user instead of raising when it fails; True on success.
+
+    Conflicts with another instance's saves are settled in ConflictDialog.
+    """
+    try:
+        try:
+            write_json(path, data, owner=parent)
+        except ConflictError as e:
+            conflict = e
+            while conflict is not None:
+                resolutions = ConflictDialog(parent, conflict).ask()
+                if resolutions is None:
+                    return False
+                try:
+                    conflict.retry(resolutions)
+                    conflict = None
+                except ConflictError as again:
+                    conflict = again
+    except DataWriteError as e:
+        QMessageBox.critical(parent, "Save Failed", str(e))
+        return False
+    return True
+
+
+def _differences(mine, theirs):
+    if mine is None or theirs is None:
+        return "deleted here" if mine is None else "deleted elsewhere"
+    if not (isinstance(mine, dict) and isinstance(theirs, dict)):
+        return f"{mine!r} / {theirs!r}"
+    keys = [k for k in dict.fromkeys(list(mine) + list(theirs)) if mine.get(k) != theirs.get(k)]
+    return ", ".join(f"{k}: {mine.get(k)!r} / {theirs.get(k)!r}" for k in keys)
+
+
+class ConflictDialog(QDialog):
+    """Pick mine or theirs for every record another instance also changed."""
+
+    def __init__(self, parent, error):
+        super().__init__(parent)
+        self.setWindowTitle("Save Conflict")
+        self.resize(760, 360)
+        self.conflicts = error.conflicts
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(
+            f"{error}. Choose which version of each record to keep (mine / theirs):"
+        ))
+        self.table = QTableWidget(len(self.conflicts), 3)
+        self.table.setHorizontalHeaderLabels(["Record", "Differences (mine / theirs)", "Keep"])
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.choices = []
+        for row, c in enumerate(self.conflicts):
+            self.table.setItem(row, 0, QTableWidgetItem(c.key))
+            self.table.setItem(row, 1, QTableWidgetItem(_differences(c.mine, c.theirs)))
+            combo = QComboBox()
+            combo.addItems(["Mine", "Theirs"])
+            self.table.setCellWidget(row, 2, combo)
+            self.choices.append(combo)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        all_mine = QPushButton("All Mine")
+        all_theirs = QPushButton("All Theirs")
+        save_btn = QPushButton("Save")
+        cancel_btn = QPushButton("Cancel")
+        all_mine.clicked.connect(lambda: [c.setCurrentIndex(0) for c in self.choices])
+        all_theirs.clicked.connect(lambda: [c.setCurrentIndex(1) for c in self.choices])
+        save_btn.clicked.connect(self.accept)
+        cancel_btn.clicked.connect(self.reject)
+        for btn in (all_mine, all_theirs):
+            buttons.addWidget(btn)
+        buttons.addStretch()
+        buttons.addWidget(save_btn)
+        buttons.addWidget(cancel_btn)
+        layout.addLayout(buttons)
+
+    def resolutions(self):
+        return {c.key: combo.currentText().lower() for c, combo in zip(self.conflicts, self.choices)}
+
+    def ask(self):
+        """{key: "mine" | "theirs"}, or None if the save was cancelled."""
+        return self.resolutions() if self.exec() == QDialog.DialogCode.Accepted else None
+
+
+def import_csv_dialog(parent, entity):
+    """Pick a CSV/TSV file and bulk import it into `entity`; returns the result or None."""
+    path, _ = QFileDialog.getOpenFileName(
+        parent, f"Import {entity.capitalize()}", "", "Spreadsheets (*.csv *.tsv *.txt)"
+    )
+    if not path:
+        return None
+
+    try:
+        result = bulk_import.import_file(entity, Path(path))
+    except (DataWriteError, ConflictError) as e:
+        QMessageBox.critical(parent, "Import Failed", str(e))
+        return None
+    if result.error_count:
+        shown = "\n".join(str(e) for e in result.errors[:20])
+        more = result.error_count - min(20, len(result.errors))
+        if more > 0:
+            shown += f"\n... and {more} more"
+        reply = QMessageBox.question(
+            parent, "Import Errors",
+            f"{result.error_count} of {result.rows} rows are invalid:\n\n{shown}\n\n"
+            "Import the valid rows anyway?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return result
+        try:
+            result = bulk_import.import_file(entity, Path(path), skip_invalid=True)
+        except (DataWriteError, ConflictError) as e:
+            QMessageBox.critical(parent, "Import Failed", str(e))
+            return None
+
+    QMessageBox.information(
+        parent, "Imported",
+        f"{result.added} added, {result.updated} updated from {Path(path).name}"
+    )
+    return result
+
+
+def export_table_dialog(parent):
+    """Pick an entity and a CSV/TSV/NPZ target and export it."""
+    entity, ok = QInputDialog.getItem(parent, "Export Table", "Data:", list(export.EXPORTABLE), 0, False)
+    if not ok:
+        return
+    path, _ = QFileDialog.getSaveFileName(
+        parent, f"Export {entity.capitalize()}", f"{entity}.csv",
+        "CSV (*.csv);;TSV (*.tsv);;NumPy columns (*.npz)"
+    )
+    if not path:
+        return
+    try:
+        count = export.export(entity, Path(path))
+    except OSError as e:
+        QMessageBox.critical(parent, "Export Failed", str(e))
+        return
+    QMessageBox.information(parent, "Exported", f"Exported {count} {entity} to {Path(path).name}")
+
+
+def generate_data_dialog(parent):
+    """Ask for pool size, seed and target folder, then stream a generated database there."""
+    drivers, ok = QInputDialog.getInt(parent, "Generate Test Data", "Drivers:", 10000, 1, 10_000_000, 1000)
+    if not ok:
+        return
+    seed, ok = QInputDialog.getInt(parent, "Generate Test Data", "Seed:", 0, 0, 2**31 - 1)
+    if not ok:
+        return
+    folder = QFileDialog.getExistingDirectory(parent, "Generate Into Folder")
+    if not folder:
+        return
+    into_data = Path(folder).resolve() == DATA_DIR.resolve()
+    if into_data:
+        reply = QMessageBox.question(
+            parent, "Generate Test Data",
+            "This replaces the drivers, staff and sponsors in the current database. Continue?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+    counts = generator.default_counts(drivers)
+    progress = QProgressDialog("Generating...", None, 0, sum(counts.values()), parent)
+    progress.setWindowTitle("Generate Test Data")
+    progress.setMinimumDuration(500)
+    done_before = {}
+
+    def report(entity, done, total):
+        done_before[entity] = done
+        progress.setLabelText(f"Generating {entity}...")
+        progress.setValue(sum(done_before.values()))
+        QApplication.processEvents()
+
+    try:
+        written = generator.generate(Path(folder), counts, seed, progress=report)
+    except (ValueError, DataWriteError, OSError) as e:
+        progress.close()
+        QMessageBox.critical(parent, "Generate Failed", str(e))
+        return
+    progress.close()
+    if into_data:
+        notify_reloaded()
+    summary = ", ".join(f"{n} {entity}" for entity, n in written.items())
+    QMessageBox.information(parent, "Generated", f"Wrote {summary} to {folder}")
+
+
+class DedupeDialog(QDialog):
+    """Duplicate report across drivers, staff and sponsors with merge actions."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Find Duplicates")
+        self.resize(720, 420)
+        self.merged = False
+
+        layout = QVBoxLayout(self)
+        self.summary = QLabel()
+        layout.addWidget(self.summary)
+
+        self.table = QTableWidget(0, 5)
+        self.table.setHorizontalHeaderLabels(["Name", "Kind", "Possible Duplicate", "Kind", "Score"])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        self.keep_left_btn = QPushButton("Merge, Keep Left")
+        self.keep_right_btn = QPushButton("Merge, Keep Right")
+        refresh_btn = QPushButton("Refresh")
+        close_btn = QPushButton("Close")
+        self.keep_left_btn.clicked.connect(lambda: self.merge_selected(keep_left=True))
+        self.keep_right_btn.clicked.connect(lambda: self.merge_selected(keep_left=False))
+        refresh_btn.clicked.connect(self.refresh)
+        close_btn.clicked.connect(self.accept)
+        for btn in (self.keep_left_btn, self.keep_right_btn, refresh_btn):
+            buttons.addWidget(btn)
+        buttons.addStretch()
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+
+        self.table.itemSelectionChanged.connect(self.update_buttons)
+        self.refresh()
+
+    def refresh(self):
+        self.candidates = dedupe.find_duplicates()
+        self.table.setRowCount(len(self.candidates))
+        for row, c in enumerate(self.candidates):
+            values = [c.a[2], c.a[0], c.b[2], c.b[0], f"{c.score:.2f}"]
+            for col, value in enumerate(values):
+                self.table.setItem(row, col, QTableWidgetItem(value))
+        cross = sum(1 for c in self.candidates if c.cross_entity)
+        text = f"{len(self.candidates)} possible duplicates ({cross} across drivers/staff)"
+        if self.candidates.unchecked:
+            text += f"; {self.candidates.unchecked} record(s) with very common names were not compared"
+        self.summary.setText(text)
+        self.update_buttons()
+
+    def update_buttons(self):
+        row = self.table.currentRow()
+        mergeable = 0 <= row < len(self.candidates) and not self.candidates[row].cross_entity
+        self.keep_left_btn.setEnabled(mergeable)
+        self.keep_right_btn.setEnabled(mergeable)
+
+    def merge_selected(self, keep_left):
+        row = self.table.currentRow()
+        if not 0 <= row < len(self.candidates):
+            return
+        c = self.candidates[row]
+        keep, drop = (c.a, c.b) if keep_left else (c.b, c.a)
+        reply = QMessageBox.question(
+            self, "Merge",
+            f"Merge '{drop[2]}' into '{keep[2]}' and delete '{drop[2]}'?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        try:
+            dedupe.merge(keep, drop)
+        except ValueError as e:
+            QMessageBox.warning(self, "Merge", str(e))
+        except (DataWriteError, ConflictError) as e:
+            QMessageBox.critical(self, "Merge Failed", str(e))
+        else:
+            self.merged = True
+        self.refresh()
+
+    def done(self, result):
+        # tabs hold their own copies of the records, reload once on close
+        if self.merged:
+            notify_reloaded()
+            self.merged = False
+        super().done(result)
+
+
+def dedupe_dialog(parent):
+    DedupeDialog(parent).exec()
+
+
+class SnapshotDialog(QDialog):
+    """Take, compare and restore snapshots of the whole data set."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Snapshots")
+        self.resize(760, 520)
+        self.store = snapshots.get_snapshot_store()
+
+        layout = QVBoxLayout(self)
+        self.summary = QLabel()
+        layout.addWidget(self.summary)
+
+        self.table = QTableWidget(0, 3)
+        self.table.setHorizontalHeaderLabels(["Snapshot", "Taken", "Label"])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        self.diff_view = QPlainTextEdit()
+        self.diff_view.setReadOnly(True)
+        layout.addWidget(self.diff_view)
+
+        buttons = QHBoxLayout()
+        take_btn = QPushButton("Take Snapshot")
+        self.compare_btn = QPushButton("Compare")
+        self.restore_btn = QPushButton("Restore")
+        close_btn = QPushButton("Close")
+        take_btn.clicked.connect(self.take)
+        self.compare_btn.clicked.connect(self.compare)
+        self.restore_btn.clicked.connect(self.restore)
+        close_btn.clicked.connect(self.accept)
+        for btn in (take_btn, self.compare_btn, self.restore_btn):
+            buttons.addWidget(btn)
+        buttons.addStretch()
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+
+        self.table.itemSelectionChanged.connect(self.update_buttons)
+        self.refresh()
+
+    def refresh(self):
+        self.snaps = list(reversed(self.store.list()))
+        self.table.setRowCount(len(self.snaps))
+        for row, snap in enumerate(self.snaps):
+            taken = time.strftime("%Y-%m-%d %H:%M", time.localtime(snap["time"]))
+            for col, value in enumerate([snap["id"], taken, snap["label"]]):
+                self.table.setItem(row, col, QTableWidgetItem(value))
+        self.summary.setText(
+            f"{len(self.snaps)} snapshots, {self.store.disk_usage() / 1024:.0f} KB on disk. "
+            "Select one to compare with the current data, or two to compare them."
+        )
+        self.update_buttons()
+
+    def selected(self):
+        rows = sorted({i.row() for i in self.table.selectedIndexes()}, reverse=True)
+        return [self.snaps[r] for r in rows]  # oldest first
+
+    def update_buttons(self):
+        n = len(self.selected())
+        self.compare_btn.setEnabled(n in (1, 2))
+        self.restore_btn.setEnabled(n == 1)
+
+    def take(self):
+        label, ok = QInputDialog.getText(self, "Take Snapshot", "Label (optional):")
+        if not ok:
+            return
+        try:
+            _, stored = self.store.take(label.strip())
+        except (snapshots.SnapshotError, OSError) as e:
+            QMessageBox.critical(self, "Snapshot Failed", str(e))
+            return
+        self.refresh()
+        self.diff_view.setPlainText(f"Snapshot taken, {stored} new record(s) stored.")
+
+    def compare(self):
+        chosen = self.selected()
+        if len(chosen) not in (1, 2):
+            return
+        try:
+            old, new = chosen if len(chosen) == 2 else (chosen[0], self.store.current())
+            lines = self.diff_lines(old, new)
+        except (snapshots.SnapshotError, OSError) as e:
+            QMessageBox.critical(self, "Compare Failed", str(e))
+            return
+        if len(lines) == 1:
+            lines.append("No differences")
+        self.diff_view.setPlainText("\n".join(lines))
+
+    def diff_lines(self, old, new):
+        lines = [f"{old['id']} -> {new['id'] or 'current data'}"]
+        for filename, d in self.store.diff(old, new).items():
+            lines.append(f"{filename}: {len(d['added'])} added, {len(d['removed'])} removed, "
+                         f"{len(d['changed'])} changed")
+            lines += [f"  + {k}" for k in d["added"]]
+            lines += [f"  - {k}" for k in d["removed"]]
+            if d["changed"]:
+                before = self.store.records(old, filename, d["changed"])
+                after = self.store.records(new, filename, d["changed"])
+                for key in d["changed"]:
+                    lines.append(f"  ~ {key}: {_changed_fields(before[key], after[key])}")
+        return lines
+
+    def restore(self):
+        chosen = self.selected()
+        if len(chosen) != 1:
+            return
+        snap = chosen[0]
+        reply = QMessageBox.question(
+            self, "Restore",
+            f"Replace all data with snapshot {snap['id']}? The current data is snapshotted first.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        try:
+            names = self.store.restore(snap)
+        except (snapshots.SnapshotError, DataWriteError, ConflictError, OSError) as e:
+            QMessageBox.critical(self, "Restore Failed", str(e))
+            return
+        self.refresh()
+        self.diff_view.setPlainText(f"Restored {len(names)} file(s) from {snap['id']}.")
+
+
+def _changed_fields(old, new):
+    if not (isinstance(old, dict) and isinstance(new, dict)):
+        return f"{old!r} -> {new!r}"
+    keys = [k for k in dict.fromkeys(list(old) + list(new)) if old.get(k) != new.get(k)]
+    return ", ".join(f"{k}: {old.get(k)!r} -> {new.get(k)!r}" for k in keys)
+
+
+def snapshot_dialog(parent):
+    SnapshotDialog(parent).exec()
+
+
+class CompareDialog(QDialog):
+    """Record-level diff of two data sets, with selective three-way merges into the left one."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Compare Data")
+        self.resize(900, 560)
+        self.changes = []
+
+        layout = QVBoxLayout(self)
+        sources = QHBoxLayout()
+        self.left_combo, self.right_combo, self.base_combo = QComboBox(), QComboBox(), QComboBox()
+        self.base_combo.addItem("No base (take right as is)", None)
+        for combo in (self.left_combo, self.right_combo, self.base_combo):
+            combo.addItem("Current data", "current")
+            for name in profiles.list_profiles():
+                combo.addItem(f"Mod: {name}", f"mod:{name}")
+            for snap in reversed(snapshots.get_snapshot_store().list()):
+                combo.addItem(f"Snapshot: {snap['id']} {snap['label']}".strip(), f"snapshot:{snap['id']}")
+        folder_btn = QPushButton("Add Folder...")
+        compare_btn = QPushButton("Compare")
+        folder_btn.clicked.connect(self.add_folder)
+        compare_btn.clicked.connect(self.compare)
+        for label, combo in (("Left", self.left_combo), ("Right", self.right_combo), ("Base", self.base_combo)):
+            sources.addWidget(QLabel(label))
+            sources.addWidget(combo, 1)
+        sources.addWidget(folder_btn)
+        sources.addWidget(compare_btn)
+        layout.addLayout(sources)
+
+        self.summary = QLabel("Pick two data sets and press Compare.")
+        layout.addWidget(self.summary)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["File", "Record", "Change", "Fields (left -> right)"])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        self.merge_btn = QPushButton("Merge Selected Into Left")
+        close_btn = QPushButton("Close")
+        self.merge_btn.clicked.connect(self.merge_selected)
+        close_btn.clicked.connect(self.accept)
+        buttons.addWidget(self.merge_btn)
+        buttons.addStretch()
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+
+        self.table.itemSelectionChanged.connect(
+            lambda: self.merge_btn.setEnabled(bool(self.table.selectedIndexes()))
+        )
+        self.merge_btn.setEnabled(False)
+
+    def add_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Data Folder")
+        if not folder:
+            return
+        for combo in (self.left_combo, self.right_combo, self.base_combo):
+            combo.addItem(f"Folder: {folder}", folder)
+        self.right_combo.setCurrentIndex(self.right_combo.count() - 1)
+
+    def sources(self):
+        base = self.base_combo.currentData()
+        return (data_diff.Source(self.left_combo.currentData()),
+                data_diff.Source(self.right_combo.currentData()),
+                data_diff.Source(base) if base else None)
+
+    def compare(self):
+        left, right, _ = self.sources()
+        try:
+            result = data_diff.diff(left, right)
+        except (snapshots.SnapshotError, OSError) as e:
+            QMessageBox.critical(self, "Compare", str(e))
+            return
+        self.changes = [c for changes in result.values() for c in changes]
+        self.table.setRowCount(len(self.changes))
+        for row, c in enumerate(self.changes):
+            fields = ", ".join(f"{p}: {a!r} -> {b!r}" for p, a, b in c.fields)
+            for col, value in enumerate([c.filename, c.key, c.kind, fields]):
+                self.table.setItem(row, col, QTableWidgetItem(value))
+        files = ", ".join(f"{f} ({len(c)})" for f, c in result.items()) or "no differences"
+        self.summary.setText(f"{len(self.changes)} record(s) differ: {files}")
+
+    def merge_selected(self):
+        rows = sorted({i.row() for i in self.table.selectedIndexes()})
+        keys = {}
+        for row in rows:
+            c = self.changes[row]
+            keys.setdefault(c.filename, set()).add(c.key)
+        left, right, base = self.sources()
+        reply = QMessageBox.question(
+            self, "Merge",
+            f"Merge {len(rows)} record(s) from {right.label} into {left.label}?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        try:
+            # picking a record means taking the right side where both changed it
+            data_diff.merge(base, left, right, files=list(keys), keys=keys, prefer="theirs")
+        except (ValueError, DataWriteError, ConflictError) as e:
+            QMessageBox.critical(self, "Merge Failed", str(e))
+            return
+        self.compare()
+
+
+def compare_dialog(parent):
+    CompareDialog(parent).exec()
@@ -0,0 +1,237 @@
+# driver_query.py
+import re
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+
+# Query syntax, terms separated by spaces and all of them must match:
+#   talent>=90  age<25  contract.length_weeks<52     numeric comparisons
+#   team:"Red Boar"  role:reserve  trait:hotlapper    equality / membership
+#   -trait:nervous  team!=Mercurion                   negation
+#   ham                                               name contains "ham"
+
+FIELD_ALIASES = {
+    "trait": "traits",
+    "role": "contract.role",
+    "salary": "contract.salary_m",
+    "length": "contract.length_weeks",
+}
+# fields with a value -> positions hash index
+HASH_FIELDS = ("team", "contract.role", "traits")
+COMPARISONS = (">=", "<=", ">", "<")
+
+_TERM = re.compile(
+    r"""\s*(?P<neg>-)?
+    (?:(?P<field>[A-Za-z_][\w.]*)\s*(?P<op>>=|<=|!=|=|>|<|:)\s*)?
+    (?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\s"']+))""",
+    re.VERBOSE,
+)
+
+
+class QueryError(ValueError):
+    pass
+
+
+def get_field(record, path):
+    if path == "team":
+        # the contract is the source of truth, "team" mirrors it
+        contract = record.get("contract") or {}
+        return contract.get("team") or record.get("team")
+    value = record
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def as_number(value):
+    if isinstance(value, bool) or value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _norm(value):
+    return str(value).strip().lower()
+
+
+# --------------------
+# Index
+# --------------------
+class DriverIndex:
+    """Field indexes over a list of driver records, built on first use.
+
+    Numeric fields get a sorted (value, position) column for range lookups,
+    HASH_FIELDS a value -> positions dict. Build a new index whenever the
+    list changes; nothing is computed until a query needs it.
+    """
+
+    def __init__(self, records):
+        self.records = records
+        self._sorted = {}
+        self._hashed = {}
+        self._names = None
+
+    def __len__(self):
+        return len(self.records)
+
+    def column(self, path):
+        col = self._sorted.get(path)
+        if col is None:
+            pairs = sorted(
+                (num, i) for i, r in enumerate(self.records)
+                if (num := as_number(get_field(r, path))) is not None
+            )
+            col = ([v for v, _ in pairs], [i for _, i in pairs])
+            self._sorted[path] = col
+        return col
+
+    def range(self, path, low=None, high=None, low_inclusive=True, high_inclusive=True):
+        values, positions = self.column(path)
+        if low is None:
+            lo = 0
+        else:
+            lo = (bisect_left if low_inclusive else bisect_right)(values, low)
+        if high is None:
+            hi = len(values)
+        else:
+            hi = (bisect_right if high_inclusive else bisect_left)(values, high)
+        return set(positions[lo:hi])
+
+    def name_contains(self, text):
+        if self._names is None:
+            self._names = [_norm(r.get("name", "")) for r in self.records]
+        text = _norm(text)
+        return {i for i, name in enumerate(self._names) if text in name}
+
+    def lookup(self, path, value):
+        table = self._hashed.get(path)
+        if table is None:
+            table = {}
+            for i, r in enumerate(self.records):
+                field = get_field(r, path)
+                for v in field if isinstance(field, list) else [field]:
+                    if v not in (None, ""):
+                        table.setdefault(_norm(v), set()).add(i)
+            self._hashed[path] = table
+        return table.get(_norm(value), set())
+
+
+# --------------------
+# Terms
+# --------------------
+class Term:
+    def __init__(self, field, op, value, negate=False):
+        self.field = field
+        self.op = op
+        self.value = value
+        self.negate = negate
+        self.number = as_number(value)
+        if op in COMPARISONS and self.number is None:
+            raise QueryError(f"{field}{op}{value}: expected a number")
+
+    def candidates(self, index):
+        """Positions matching the term (ignoring negation), or None if no index applies."""
+        if self.field == "name":
+            return index.name_contains(self.value) if self.op == ":" else index.lookup("name", self.value)
+        if self.op in COMPARISONS:
+            n = self.number
+            return {
+                ">=": lambda: index.range(self.field, low=n),
+                ">": lambda: index.range(self.field, low=n, low_inclusive=False),
+                "<=": lambda: index.range(self.field, high=n),
+                "<": lambda: index.range(self.field, high=n, high_inclusive=False),
+            }[self.op]()
+        if self.field in HASH_FIELDS:
+            return index.lookup(self.field, self.value)
+        if self.number is not None:
+            return index.range(self.field, n := self.number, n)
+        return None
+
+    def _test(self, record):
+        if self.field == "name":
+            name = _norm(record.get("name", ""))
+            return _norm(self.value) == name if self.op == "=" else _norm(self.value) in name
+        value = get_field(record, self.field)
+        if self.op in COMPARISONS:
+            num = as_number(value)
+            if num is None:
+                return False
+            return {">=": num >= self.number, ">": num > self.number,
+                    "<=": num <= self.number, "<": num < self.number}[self.op]
+        values = value if isinstance(value, list) else [value]
+        if self.number is not None:
+            return any(as_number(v) == self.number for v in values)
+        return any(v not in (None, "") and _norm(v) == _norm(self.value) for v in values)
+
+    def test(self, record):
+        return self._test(record) != self.negate
+
+    def __repr__(self):
+        return f"Term({'-' if self.negate else ''}{self.field}{self.op}{self.value!r})"
+
+
+class Query:
+    def __init__(self, terms):
+        self.terms = terms
+
+    def matches(self, record):
+        return all(t.test(record) for t in self.terms)
+
+    def run(self, index):
+        """Positions of matching records, in list order.
+
+        Indexed terms are intersected smallest first; the rest are checked
+        record by record on what is left.
+        """
+        include, exclude, checks = [], [], []
+        for term in self.terms:
+            found = term.candidates(index)
+            if found is None:
+                checks.append(term)
+            elif term.negate:
+                exclude.append(found)
+            else:
+                include.append(found)
+
+        if include:
+            include.sort(key=len)
+            result = set(include[0])
+            for found in include[1:]:
+                result &= found
+                if not result:
+                    break
+        else:
+            result = set(range(len(index)))
+        for found in exclude:
+            result -= found
+        if checks:
+            records = index.records
+            result = {i for i in result if all(t.test(records[i]) for t in checks)}
+        return sorted(result)
+
+
+@lru_cache(maxsize=64)
+def compile_query(text):
+    terms, pos = [], 0
+    text = text.strip()
+    while pos < len(text):
+        m = _TERM.match(text, pos)
+        if not m or m.end() == pos:
+            raise QueryError(f"Cannot read query at {text[pos:]!r}")
+        pos = m.end()
+        value = next(v for v in (m["dq"], m["sq"], m["bare"]) if v is not None)
+        field = m["field"]
+        if field is None:
+            terms.append(Term("name", ":", value, bool(m["neg"])))
+            continue
+        field = FIELD_ALIASES.get(field, field)
+        op, negate = m["op"], bool(m["neg"])
+        if op == "!=":
+            op, negate = "=", not negate
+        elif op == ":" and field != "name":
+            op = "="
+        terms.append(Term(field, op, value, negate))
+    return Query(terms)
@@ -1,18 +1,20 @@
 # drivers_tab.py
+from copy import deepcopy
+
 from PyQt6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QScrollArea, QFormLayout,
     QLabel, QLineEdit, QListWidget, QPushButton, QMessageBox, QComboBox
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QStandardItemModel, QStandardItem
-from utils import DATA_DIR, TAB_FILES, read_json, write_json, ACCENT, TEXT
-
-TRAITS_LIST = [
-    "hotlapper", "tyre_whisperer", "pay_driver", "overtake_artist",
-    "mechanic", "clean_air_merchant", "bottlejob", "crash_happy",
-    "nervous", "tyre_abuser"
-]
+from form_builder import add_section_header
+from dialogs import import_csv_dialog, save_json
+from driver_query import DriverIndex, compile_query, QueryError
+from trait_index import get_trait_index
+from records import parse_number
+from utils import DATA_DIR, TAB_FILES, read_json, notify_saved, TRAITS_LIST, HISTORY_FIELDS
 
+TRAIT_MODES = ["Any", "AND", "OR", "NOT"]
 
 class DriversTab(QWidget):
     def __init__(self, parent=None):
@@ -27,10 +29,29 @@ class DriversTab(QWidget):
         left_layout = QVBoxLayout()
 
         self.search_box = QLineEdit()
-        self.search_box.setPlaceholderText("Search drivers...")
+        self.search_box.setPlaceholderText('Search drivers... e.g. talent>=90 team:"Red Boar" trait:hotlapper')
         self.search_box.textChanged.connect(self.filter_drivers)
         left_layout.addWidget(self.search_box)
 
+        self.search_status = QLabel()
+        left_layout.addWidget(self.search_status)
+
+        # Trait filter: AND = must have, OR = at least one of, NOT = must not have
+        self.trait_index = get_trait_index()
+        trait_form = QFormLayout()
+        add_section_header(trait_form, "Trait Filter")
+        self.trait_modes = {}
+        self.trait_labels = {}
+        for trait in TRAITS_LIST:
+            self.trait_labels[trait] = QLabel(trait)
+            self.trait_modes[trait] = QComboBox()
+            self.trait_modes[trait].addItems(TRAIT_MODES)
+            self.trait_modes[trait].currentIndexChanged.connect(
+                lambda *_: self.filter_drivers(self.search_box.text())
+            )
+            trait_form.addRow(self.trait_labels[trait], self.trait_modes[trait])
+        left_layout.addLayout(trait_form)
+
         self.list = QListWidget()
         left_layout.addWidget(self.list)
 
@@ -38,6 +59,10 @@ class DriversTab(QWidget):
         left_layout.addWidget(self.add_btn)
         self.add_btn.clicked.connect(self.add_driver)
 
+        self.import_btn = QPushButton("Import CSV")
+        left_layout.addWidget(self.import_btn)
+        self.import_btn.clicked.connect(lambda: import_csv_dialog(self, "drivers"))
+
         self.reload_btn = QPushButton("Reload Drivers")
         left_layout.addWidget(self.reload_btn)
         self.reload_btn.clicked.connect(self.load_data)
@@ -55,42 +80,27 @@ class DriversTab(QWidget):
 
         self.fields = {}
 
-        def add_section_header(title):
-            lbl = QLabel(title)
-            lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            lbl.setStyleSheet(f"""
-                font-weight: bold;
-                border: 1px solid {ACCENT};
-                padding: 4px;
-                margin-top: 8px;
-                margin-bottom: 4px;
-                border-radius: 4px;
-                background-color: #2f3436;
-                color: {TEXT};
-            """)
-            self.form_layout.addRow(lbl)
-
         # Driver Details
-        add_section_header("Driver Details")
+        add_section_header(self.form_layout, "Driver Details")
         for field in ["name", "age", "talent", "train"]:
             self.fields[field] = QLineEdit()
             self.form_layout.addRow(QLabel(field.capitalize()), self.fields[field])
 
         # Stats
-        add_section_header("Stats")
+        add_section_header(self.form_layout, "Stats")
         for field in ["base_lap_time_sim", "number", "cornering", "braking",
                       "consistency", "smoothness", "control"]:
             self.fields[field] = QLineEdit()
             self.form_layout.addRow(QLabel(field.capitalize()), self.fields[field])
 
         # History
-        add_section_header("History")
-        for field in ["seasons", "championships", "wins", "podiums", "poles"]:
+        add_section_header(self.form_layout, "History")
+        for field in HISTORY_FIELDS:
             self.fields[field] = QLineEdit()
             self.form_layout.addRow(QLabel(field.capitalize()), self.fields[field])
 
         # Contract
-        add_section_header("Contract")
+        add_section_header(self.form_layout, "Contract")
         self.fields["contract_team"] = QComboBox()
         self.load_active_teams()
         self.form_layout.addRow(QLabel("Team"), self.fields["contract_team"])
@@ -105,7 +115,7 @@ class DriversTab(QWidget):
             self.form_layout.addRow(QLabel(field.capitalize()), self.fields[key])
 
         # Traits
-        add_section_header("Traits")
+        add_section_header(self.form_layout, "Traits")
         self.fields["traits"] = QComboBox()
         self.fields["traits"].setEditable(True)
         self.fields["traits"].lineEdit().setReadOnly(True)
@@ -133,7 +143,6 @@ class DriversTab(QWidget):
         self.list.currentRowChanged.connect(self.display_driver)
         self.save_btn.clicked.connect(self.save_data)
         self.delete_btn.clicked.connect(self.delete_driver)   ### DELETE DRIVER
-        self.add_btn.clicked.connect(self.add_driver)
         self.fields["contract_team"].currentIndexChanged.connect(self.on_team_changed)
 
     # --------------------
@@ -185,21 +194,54 @@ class DriversTab(QWidget):
     # Loading / filtering
     # --------------------
     def load_data(self):
-        self.drivers = read_json(self.file) or []
-        self.filtered_drivers = list(self.drivers)
-        self.refresh_list()
+        self.drivers = read_json(self.file, owner=self) or []
+        self.index = DriverIndex(self.drivers)
+        # the file may have changed under us (merge, restore, Reload), even at the same length
+        self.trait_index.reload(self.drivers)
+        self.filter_drivers(self.search_box.text())
 
     def refresh_list(self):
         self.list.clear()
         for d in self.filtered_drivers:
             self.list.addItem(d.get("name", "Unnamed"))
 
+    def trait_selection(self):
+        """Bitmap of drivers passing the trait filter, or None if it is unused."""
+        picked = {mode: [] for mode in TRAIT_MODES}
+        for trait, combo in self.trait_modes.items():
+            picked[combo.currentText()].append(trait)
+        if not (picked["AND"] or picked["OR"] or picked["NOT"]):
+            return None
+        return self.trait_index.select(picked["AND"], picked["OR"], picked["NOT"])
+
     def filter_drivers(self, text):
-        text = (text or "").strip().lower()
-        if not text:
+        text = (text or "").strip()
+        traits = self.trait_selection()
+        if text:
+            try:
+                positions = compile_query(text).run(self.index)
+            except QueryError as e:
+                # keep the last results while the query is being typed
+                self.search_status.setText(str(e))
+                return
+            if traits is not None:
+                keep = set(self.trait_index.positions(traits))
+                positions = [i for i in positions if i in keep]
+        elif traits is not None:
+            positions = self.trait_index.positions(traits)
+        else:
+            positions = None
+
+        if positions is None:
             self.filtered_drivers = list(self.drivers)
+            self.search_status.clear()
         else:
-            self.filtered_drivers = [d for d in self.drivers if text in d.get("name", "").lower()]
+            self.filtered_drivers = [self.drivers[i] for i in positions]
+            self.search_status.setText(f"{len(positions)} of {len(self.drivers)} drivers")
+
+        counts = self.trait_index.counts(traits)
+        for trait, label in self.trait_labels.items():
+            label.setText(f"{trait} ({counts[trait]})")
         self.refresh_list()
 
     # --------------------
@@ -216,6 +258,7 @@ class DriversTab(QWidget):
 
         driver = self.filtered_drivers[index]
         contract = driver.get("contract") or {}
+        history = driver.get("history") or {}
         traits = driver.get("traits") or []
 
         for key, widget in self.fields.items():
@@ -231,6 +274,8 @@ class DriversTab(QWidget):
                     widget.setText(str(contract.get(contract_key, "")))
             elif key == "traits":
                 self.set_traits_checkboxes(traits)
+            elif key in HISTORY_FIELDS:
+                widget.setText(str(history.get(key, "")))
             else:
                 widget.setText(str(driver.get(key, "")))
 
@@ -251,12 +296,21 @@ class DriversTab(QWidget):
         if idx < 0 or idx >= len(self.filtered_drivers):
             return
         driver = self.filtered_drivers[idx]
-        try:
-            original_idx = next(i for i, d in enumerate(self.drivers) if d is driver or d.get("name") == driver.get("name"))
-        except StopIteration:
-            original_idx = None
+        # every line edit but the name holds a number; refuse text before touching the record
+        bad = [key for key, widget in self.fields.items()
+               if key != "name" and isinstance(widget, QLineEdit) and widget.text()
+               and not isinstance(parse_number(widget.text()), (int, float))]
+        if bad:
+            QMessageBox.warning(self, "Invalid Input", f"Not a number: {', '.join(bad)}")
+            return
+        # the record itself first: names are not unique
+        original_idx = next((i for i, d in enumerate(self.drivers) if d is driver), None)
+        if original_idx is None:
+            original_idx = next((i for i, d in enumerate(self.drivers) if d.get("name") == driver.get("name")), None)
 
+        old_driver = deepcopy(driver)
         driver_contract = driver.setdefault("contract", {})
+        history = driver.setdefault("history", {})
 
         for key, widget in self.fields.items():
             if key.startswith("contract_"):
@@ -264,11 +318,14 @@ class DriversTab(QWidget):
                 if contract_key in ("team", "role"):
                     driver_contract[contract_key] = widget.currentText()
                 else:
-                    driver_contract[contract_key] = widget.text() or "0"
+                    driver_contract[contract_key] = parse_number(widget.text() or "0")
             elif key == "traits":
                 driver["traits"] = [t.strip() for t in widget.currentText().split(",") if t.strip()]
-            else:
-                driver[key] = widget.text()
+            elif key in HISTORY_FIELDS:
+                history[key] = parse_number(widget.text() or "0")
+            elif widget.text() or key in driver:
+                # empty fields the record never had are not added
+                driver[key] = widget.text() if key == "name" else parse_number(widget.text())
 
         if driver.get("contract", {}).get("team") in ("Null", None, ""):
             driver["contract"]["team"] = None
@@ -282,7 +339,9 @@ class DriversTab(QWidget):
         else:
             self.drivers.append(driver)
 
-        write_json(self.file, self.drivers)
+        if not save_json(self, self.file, self.drivers):
+            return
+        notify_saved("drivers", old_driver, driver)
         QMessageBox.information(self, "Saved", f"Driver {driver.get('name')} updated!")
         self.load_data()
         name = driver.get("name")
@@ -298,7 +357,7 @@ class DriversTab(QWidget):
             "age": "",
             "talent": "",
             "train": "",
-            "pay_driver_amount_m": "0",
+            "pay_driver_amount_m": 0,
             "base_lap_time_sim": "",
             "number": "",
             "cornering": "",
@@ -306,11 +365,7 @@ class DriversTab(QWidget):
             "consistency": "",
             "smoothness": "",
             "control": "",
-            "seasons": "",
-            "championships": "",
-            "wins": "",
-            "podiums": "",
-            "poles": "",
+            "history": {field: 0 for field in HISTORY_FIELDS},
             "traits": [],
             "contract": {
                 "team": None,
@@ -321,7 +376,9 @@ class DriversTab(QWidget):
             }
         }
         self.drivers.append(new_driver)
-        write_json(self.file, self.drivers)
+        if not save_json(self, self.file, self.drivers):
+            return
+        notify_saved("drivers", None, new_driver)
         self.search_box.clear()
         self.load_data()
         sel_index = len(self.filtered_drivers) - 1
@@ -341,7 +398,9 @@ class DriversTab(QWidget):
         )
         if confirm == QMessageBox.StandardButton.Yes:
             self.drivers.remove(driver)
-            write_json(self.file, self.drivers)
+            if not save_json(self, self.file, self.drivers):
+                return
+            notify_saved("drivers", driver, None)
             QMessageBox.information(self, "Deleted", f"Driver '{name}' removed.")
             self.load_data()
             self.list.setCurrentRow(-1)
@@ -4,7 +4,8 @@ from PyQt6.QtWidgets import (
     QLabel, QLineEdit, QScrollArea, QMessageBox
 )
 from PyQt6.QtCore import Qt
-from utils import DATA_DIR, TAB_FILES, read_json, write_json, ACCENT, TEXT
+from utils import DATA_DIR, TAB_FILES, read_json, notify_saved, ACCENT, TEXT
+from dialogs import save_json
 
 
 class EnginesTab(QWidget):
@@ -60,7 +61,7 @@ class EnginesTab(QWidget):
         self.delete_btn.clicked.connect(self.delete_engine)
 
     def load_data(self):
-        data = read_json(self.file) or {}
+        data = read_json(self.file, owner=self) or {}
         self.engines = data.get("engines", {})
         self.list.clear()
         for name in self.engines.keys():
@@ -97,12 +98,16 @@ class EnginesTab(QWidget):
             "cost_m": float(self.fields["cost_m"].text())
         }
 
+        old_engine = {"name": old_name, **self.engines[old_name]}
+
         # Remove old name if changed
         if old_name != new_name:
             self.engines.pop(old_name, None)
         self.engines[new_name] = engine_data
 
-        write_json(self.file, {"engines": self.engines})
+        if not save_json(self, self.file, {"engines": self.engines}):
+            return
+        notify_saved("engines", old_engine, {"name": new_name, **engine_data})
         QMessageBox.information(self, "Saved", f"Engine {new_name} saved!")
         self.load_data()
         self.list.setCurrentRow(list(self.engines.keys()).index(new_name))
@@ -115,7 +120,9 @@ class EnginesTab(QWidget):
             new_name = f"New Engine {counter}"
             counter += 1
         self.engines[new_name] = {"lap_time_delta": 0, "reliability_mult": 1, "cost_m": 0}
-        write_json(self.file, {"engines": self.engines})
+        if not save_json(self, self.file, {"engines": self.engines}):
+            return
+        notify_saved("engines", None, {"name": new_name, **self.engines[new_name]})
         self.load_data()
         self.list.setCurrentRow(list(self.engines.keys()).index(new_name))
 
@@ -128,6 +135,9 @@ class EnginesTab(QWidget):
                                      f"Are you sure you want to delete {name}?",
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
-            self.engines.pop(name, None)
-            write_json(self.file, {"engines": self.engines})
+            old_engine = self.engines.pop(name, None)
+            if not save_json(self, self.file, {"engines": self.engines}):
+                return
+            if old_engine is not None:
+                notify_saved("engines", {"name": name, **old_engine}, None)
             self.load_data()
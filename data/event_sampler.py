@@ -0,0 +1,74 @@
+# event_sampler.py
+import numpy as np
+
+
+class EventSampler:
+    """Seasonal event draws built once from the events list.
+
+    Each event fires independently with its `chance` per season, so whole
+    batches of seasons are drawn as one Bernoulli mask. An alias table is
+    also built for picking a single event weighted by chance.
+    """
+
+    def __init__(self, events):
+        self.events = list(events or [])
+        self.chances = np.clip(
+            np.array([float(e.get("chance", 0) or 0) for e in self.events], dtype=float), 0.0, 1.0
+        )
+        self.prob, self.alias = build_alias_table(self.chances)
+
+    def __len__(self):
+        return len(self.events)
+
+    # --------------------
+    # Analytic
+    # --------------------
+    def expected_counts(self):
+        """Expected occurrences per season for each event."""
+        return self.chances.copy()
+
+    def expected_total(self):
+        return float(self.chances.sum())
+
+    # --------------------
+    # Sampling
+    # --------------------
+    def sample_seasons(self, seasons, rng=None):
+        """Bool mask of shape (seasons, events): which events fired in each season."""
+        rng = rng if rng is not None else np.random.default_rng()
+        return rng.random((seasons, len(self.chances))) < self.chances
+
+    def sample_counts(self, seasons, rng=None):
+        """How many times each event fired across `seasons` simulated seasons."""
+        return self.sample_seasons(seasons, rng).sum(axis=0)
+
+    def draw(self, n, rng=None):
+        """Indices of `n` events picked with probability proportional to chance."""
+        rng = rng if rng is not None else np.random.default_rng()
+        if not len(self.prob):
+            return np.empty(0, dtype=np.intp)
+        idx = rng.integers(len(self.prob), size=n)
+        keep = rng.random(n) < self.prob[idx]
+        return np.where(keep, idx, self.alias[idx])
+
+
+def build_alias_table(weights):
+    """Vose's alias method; returns (prob, alias) arrays."""
+    weights = np.asarray(weights, dtype=float)
+    n = len(weights)
+    prob = np.ones(n)
+    alias = np.arange(n)
+    total = weights.sum()
+    if n == 0 or total <= 0:
+        return prob, alias
+
+    scaled = weights * (n / total)
+    small = [i for i in range(n) if scaled[i] < 1.0]
+    large = [i for i in range(n) if scaled[i] >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] -= 1.0 - scaled[s]
+        (small if scaled[l] < 1.0 else large).append(l)
+    return prob, alias
@@ -1,10 +1,12 @@
 # events_tab.py
 from PyQt6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QScrollArea, QFormLayout,
-    QLabel, QLineEdit, QListWidget, QPushButton, QComboBox, QMessageBox
+    QLineEdit, QListWidget, QPushButton, QComboBox, QMessageBox
 )
-from PyQt6.QtCore import Qt
-from utils import DATA_DIR, TAB_FILES, read_json, write_json, ACCENT, TEXT
+from form_builder import add_section_header
+from utils import DATA_DIR, TAB_FILES, read_json
+from dialogs import save_json
+from event_sampler import EventSampler
 
 # nicer display names for event types
 EVENT_DISPLAY = {
@@ -70,19 +72,7 @@ class EventsTab(QWidget):
         self.team_names = [t.get("name") for t in self.teams_data]
 
     def create_fields(self):
-        lbl = QLabel("Event Details")
-        lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        lbl.setStyleSheet(f"""
-            font-weight: bold;
-            border: 1px solid {ACCENT};
-            padding: 4px;
-            margin-top: 8px;
-            margin-bottom: 4px;
-            border-radius: 4px;
-            background-color: #2f3436;
-            color: {TEXT};
-        """)
-        self.form_layout.addRow(lbl)
+        add_section_header(self.form_layout, "Event Details")
 
         self.fields["type"] = QComboBox()
         self.fields["type"].addItems(list(EVENT_DISPLAY.values()))
@@ -105,17 +95,21 @@ class EventsTab(QWidget):
 
     def load_data(self):
         try:
-            self.events_data = read_json(self.file) or []
+            self.events_data = read_json(self.file, owner=self) or []
         except FileNotFoundError:
             self.events_data = []
-            write_json(self.file, self.events_data)
+            save_json(self, self.file, self.events_data)
+
+        # rebuilt on every load, i.e. once per edit of the events file
+        self.sampler = EventSampler(self.events_data)
+        expected = self.sampler.expected_counts()
 
         self.list.clear()
-        for e in self.events_data:
+        for e, exp in zip(self.events_data, expected):
             event_type = EVENT_DISPLAY.get(e.get('type'), e.get('type', 'Unknown'))
             team = e.get('team')
             display_name = f"{event_type} – {team}" if team else event_type
-            self.list.addItem(display_name)
+            self.list.addItem(f"{display_name}  ({exp:.2f}/season)")
 
     def display_event(self, index):
         if index < 0 or index >= len(self.events_data):
@@ -143,7 +137,8 @@ class EventsTab(QWidget):
             event["team"] = None
         event["chance"] = float(self.fields["chance"].text())
 
-        write_json(self.file, self.events_data)
+        if not save_json(self, self.file, self.events_data):
+            return
         QMessageBox.information(self, "Saved", f"Event updated!")
         self.load_data()
         self.list.setCurrentRow(idx)
@@ -170,7 +165,8 @@ class EventsTab(QWidget):
             "chance": 0.05
         }
         self.events_data.append(new_event)
-        write_json(self.file, self.events_data)
+        if not save_json(self, self.file, self.events_data):
+            return
         self.load_data()
         self.list.setCurrentRow(len(self.events_data) - 1)
 
@@ -188,7 +184,8 @@ class EventsTab(QWidget):
 
         if confirm == QMessageBox.StandardButton.Yes:
             self.events_data.pop(idx)
-            write_json(self.file, self.events_data)
+            if not save_json(self, self.file, self.events_data):
+                return
             self.load_data()
             self.list.setCurrentRow(min(idx, len(self.events_data) - 1))
 
@@ -0,0 +1,150 @@
+# export.py
+import csv
+import shutil
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+from utils import iter_records
+
+EXPORTABLE = ("drivers", "staff", "teams", "sponsors")
+LIST_SEPARATOR = ";"
+
+
+def flatten(record, prefix=""):
+    """Flatten nested dicts to dotted keys; lists become ';'-joined strings."""
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, list):
+            flat[name] = LIST_SEPARATOR.join(str(v) for v in value)
+        else:
+            flat[name] = value
+    return flat
+
+
+class ColumnInfo:
+    """What pass one learns about a column: kind and string width."""
+
+    def __init__(self):
+        self.kind = None  # "bool", "int", "float" or "str"
+        self.width = 1
+        self.missing = False
+
+    def observe(self, value):
+        if value is None or value == "":
+            self.missing = True
+            return
+        if isinstance(value, bool):
+            kind = "bool"
+        elif not isinstance(value, (int, float)):
+            kind = "str"
+        elif isinstance(value, int):
+            kind = "int"
+        else:
+            kind = "float"
+        if self.kind is None or self.kind == kind:
+            self.kind = kind
+        elif {self.kind, kind} == {"int", "float"}:
+            self.kind = "float"
+        else:
+            self.kind = "str"
+        self.width = max(self.width, len(str(value)))
+
+    @property
+    def dtype(self):
+        if self.kind in ("bool", "int"):
+            # NaN marks missing values, so gaps force a float column (1.0/0.0 for bools)
+            whole = np.bool_ if self.kind == "bool" else np.int64
+            return np.float64 if self.missing else whole
+        if self.kind == "float":
+            return np.float64
+        return np.dtype(f"U{self.width}")
+
+
+def scan(entity):
+    """Pass one: column order, column kinds and the record count."""
+    columns = {}
+    count = 0
+    for record in iter_records(entity):
+        count += 1
+        flat = flatten(record)
+        for key in columns:
+            if key not in flat:
+                columns[key].missing = True
+        for key, value in flat.items():
+            if key not in columns:
+                columns[key] = ColumnInfo()
+                if count > 1:
+                    columns[key].missing = True
+            columns[key].observe(value)
+    return columns, count
+
+
+# --------------------
+# Writers
+# --------------------
+def export_csv(entity, path: Path, delimiter=","):
+    columns, count = scan(entity)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(columns), delimiter=delimiter)
+        writer.writeheader()
+        for record in iter_records(entity):
+            writer.writerow(flatten(record))
+    return count
+
+
+def export_npz(entity, path: Path, compress=True):
+    """One array per field, filled record by record through memory-mapped .npy files."""
+    columns, count = scan(entity)
+    tmp_dir = Path(tempfile.mkdtemp(prefix="tp_export_"))
+    try:
+        arrays = {}
+        for i, (name, info) in enumerate(columns.items()):
+            arrays[name] = np.lib.format.open_memmap(
+                tmp_dir / f"{i}.npy", mode="w+", dtype=info.dtype, shape=(count,)
+            )
+            if arrays[name].dtype.kind == "f":
+                arrays[name][:] = np.nan
+
+        for row, record in enumerate(iter_records(entity)):
+            for name, value in flatten(record).items():
+                if value is None or value == "":
+                    continue
+                arr = arrays[name]
+                arr[row] = str(value) if arr.dtype.kind == "U" else value
+
+        compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        with zipfile.ZipFile(path, "w", compression=compression, allowZip64=True) as zf:
+            for i, name in enumerate(columns):
+                arrays[name].flush()
+                zf.write(tmp_dir / f"{i}.npy", arcname=f"{name}.npy")
+        # release the memory maps before the temp files are removed
+        arrays.clear()
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return count
+
+
+def export(entity, path: Path):
+    if entity not in EXPORTABLE:
+        raise ValueError(f"Cannot export {entity}")
+    suffix = path.suffix.lower()
+    if suffix == ".npz":
+        return export_npz(entity, path)
+    if suffix in (".tsv", ".tab"):
+        return export_csv(entity, path, delimiter="\t")
+    return export_csv(entity, path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] not in EXPORTABLE:
+        print(f"usage: export.py {'|'.join(EXPORTABLE)} OUT.csv|OUT.tsv|OUT.npz")
+        sys.exit(2)
+    n = export(sys.argv[1], Path(sys.argv[2]))
+    print(f"exported {n} {sys.argv[1]} to {sys.argv[2]}")
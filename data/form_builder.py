@@ -0,0 +1,140 @@
+# form_builder.py
+import json
+
+from PyQt6.QtWidgets import (
+    QWidget, QScrollArea, QFormLayout, QLabel, QLineEdit, QComboBox, QPushButton
+)
+from PyQt6.QtCore import Qt
+
+# object name styled by the window stylesheet (see MainWindow.apply_styles)
+SECTION_HEADER = "sectionHeader"
+
+
+def section_header(title):
+    lbl = QLabel(title)
+    lbl.setObjectName(SECTION_HEADER)
+    lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
+    return lbl
+
+
+def add_section_header(form_layout, title):
+    form_layout.addRow(section_header(title))
+
+
+def pretty(key):
+    return key.replace("_", " ").capitalize()
+
+
+# --------------------
+# Schema
+# --------------------
+def form_schema(section_key, section_data):
+    """Declarative description of a config section's form.
+
+    A tuple of ("header", title) and ("field", fullkey, label, kind) rows.
+    It only depends on the keys and value types, so it doubles as the
+    cache key for the built widgets.
+    """
+    rows = [("header", pretty(section_key))]
+    if isinstance(section_data, dict):
+        _schema_rows(rows, section_key, "", section_data)
+    else:
+        rows.append(("field", section_key, section_key.capitalize(), "text"))
+    return tuple(rows)
+
+
+def _schema_rows(rows, section_key, prefix, data):
+    for key, value in data.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            rows.append(("header", pretty(key)))
+            _schema_rows(rows, section_key, f"{path}.", value)
+        else:
+            kind = "bool" if isinstance(value, bool) else "text"
+            rows.append(("field", f"{section_key}.{path}", pretty(key), kind))
+
+
+def lookup(section_key, section_data, fullkey):
+    if fullkey == section_key:
+        return section_data
+    value = section_data
+    for part in fullkey.split(".")[1:]:
+        value = value[part]
+    return value
+
+
+# --------------------
+# Pages
+# --------------------
+class FormPage(QScrollArea):
+    """A built form: scrollable widget tree plus the field widgets by key."""
+
+    def __init__(self, schema, parent=None):
+        super().__init__(parent)
+        self.setWidgetResizable(True)
+        self.fields = {}
+        self.generation = None
+
+        body = QWidget()
+        self.form_layout = QFormLayout(body)
+        for row in schema:
+            if row[0] == "header":
+                add_section_header(self.form_layout, row[1])
+                continue
+            _, fullkey, label, kind = row
+            if kind == "bool":
+                field = QComboBox()
+                field.addItems(["True", "False"])
+            else:
+                field = QLineEdit()
+            self.fields[fullkey] = field
+            self.form_layout.addRow(label, field)
+
+        self.save_btn = QPushButton("Save Changes")
+        self.form_layout.addRow(self.save_btn)
+        self.setWidget(body)
+
+    def fill(self, section_key, section_data):
+        for fullkey, field in self.fields.items():
+            value = lookup(section_key, section_data, fullkey)
+            if isinstance(field, QComboBox):
+                field.setCurrentText("True" if value else "False")
+            elif isinstance(value, (list, dict)):
+                field.setText(json.dumps(value))
+            else:
+                field.setText(str(value))
+
+
+class FormCache:
+    """Builds each section's page once and swaps it in on a QStackedWidget."""
+
+    def __init__(self, stack):
+        self.stack = stack
+        self.pages = {}
+        self.generation = 0
+
+    def invalidate_values(self):
+        """Data was reloaded or saved: refill pages the next time they are shown."""
+        self.generation += 1
+
+    def clear(self):
+        for page in self.pages.values():
+            self.stack.removeWidget(page)
+            page.deleteLater()
+        self.pages.clear()
+        self.generation += 1
+
+    def show(self, section_key, section_data, on_save=None):
+        key = (section_key, form_schema(section_key, section_data))
+        page = self.pages.get(key)
+        if page is None:
+            page = FormPage(key[1])
+            if on_save is not None:
+                page.save_btn.clicked.connect(lambda: on_save(section_key))
+            self.pages[key] = page
+            self.stack.addWidget(page)
+        if page.generation != self.generation:
+            page.fill(section_key, section_data)
+            page.generation = self.generation
+        self.stack.setCurrentWidget(page)
+        return page
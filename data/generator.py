@@ -0,0 +1,254 @@
+# generator.py
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from utils import (
+    DATA_DIR, TAB_FILES, TRAITS_LIST, ROLE_DISPLAY, read_json, atomic_write_stream,
+    flush_writes, get_active_profile
+)
+
+CHUNK_SIZE = 50_000
+
+FIRST_NAMES = [
+    "Alex", "Ben", "Carlos", "Daniel", "Emil", "Felix", "George", "Hugo", "Ivan", "Jonas",
+    "Kai", "Leo", "Marco", "Nico", "Oscar", "Pablo", "Quinn", "Rafael", "Sami", "Theo",
+    "Umar", "Victor", "Yuki", "Zane", "Ana", "Bea", "Clara", "Elena", "Freya", "Ines",
+    "Jade", "Lena", "Maya", "Nora", "Rosa", "Sofia", "Tess", "Vera", "Wren", "Zoe",
+]
+SYLLABLES = [
+    "ba", "ber", "ca", "dal", "den", "fa", "gor", "ha", "ker", "la",
+    "lin", "mar", "mo", "nes", "or", "pel", "ri", "ro", "san", "sel",
+    "ta", "ton", "va", "vic", "wen", "ya", "zo", "zan", "ul", "ek",
+]
+SPONSOR_SUFFIXES = ["Motors", "Corp", "Energy", "Group", "Tech", "Labs", "Foods", "Bank", "Air", "Telecom"]
+
+# sponsor rating -> yearly amount, as in the shipped sponsors.json
+SPONSOR_TIERS = {1: 20, 2: 30, 3: 40, 4: 50, 5: 60, 6: 70, 7: 80, 8: 90, 9: 110, 10: 150}
+CONTRACT_LENGTHS = np.array([52, 104, 156])
+DRIVER_STATS = ("cornering", "braking", "consistency", "smoothness", "control")
+
+
+# --------------------
+# Names
+# --------------------
+def _spell(n):
+    """Bijective base len(SYLLABLES): 0 is "", then one syllable, then two..."""
+    parts = []
+    while n:
+        n, digit = divmod(n - 1, len(SYLLABLES))
+        parts.append(SYLLABLES[digit])
+    return "".join(reversed(parts))
+
+
+# a surname is a prefix of up to two syllables plus exactly two more, so
+# distinct ids below NAME_SPACE give distinct surnames
+_PAIRS = [a + b for a in SYLLABLES for b in SYLLABLES]
+_PREFIXES = [_spell(n) for n in range(len(_PAIRS))]
+
+
+def _surname(n):
+    hi, lo = divmod(n, len(_PAIRS))
+    return (_PREFIXES[hi] + _PAIRS[lo]).capitalize()
+
+
+# ids are spread over a fixed block so neighbouring records do not look alike
+NAME_SPACE = len(_PAIRS) ** 2
+NAME_STRIDE = 7919  # prime, so n -> n * stride is a permutation of NAME_SPACE
+
+
+def _unique_names(start, count, offset, firsts):
+    """Distinct "<first> <surname>" names for records start..start+count.
+
+    Drivers, staff and sponsors use different offsets, so names never
+    repeat within or across entities.
+    """
+    names = []
+    for n in range(start, start + count):
+        first, ident = divmod(n * 3 + offset, len(firsts))[::-1]
+        names.append((firsts[first], _surname(ident * NAME_STRIDE % NAME_SPACE)))
+    return names
+
+
+# --------------------
+# Records, one chunk at a time
+# --------------------
+def _contract(team, length, salary, role=None):
+    contract = {"team": team, "length_weeks": length, "salary_m": salary, "start_week": 1}
+    if role:
+        contract["role"] = role
+    return contract
+
+
+def driver_chunk(rng, start, count, teams):
+    """Drivers start..start+count; the first ones are signed to the active teams."""
+    talent = np.clip(rng.normal(70, 12, count), 40, 99).round().astype(int)
+    # stats follow talent on the 1-20 scale with some spread
+    stats = np.clip(talent[:, None] / 5 + rng.normal(0, 1.5, (count, len(DRIVER_STATS))), 1, 20)
+    stats = stats.round().astype(int).tolist()
+    age = np.clip(rng.normal(27, 5, count), 17, 42).astype(int)
+    seasons = np.maximum(0, age - 18 - rng.integers(0, 4, count))
+    wins = rng.poisson(np.maximum(talent - 60, 0) / 10 * seasons)
+    podiums = wins + rng.poisson(np.maximum(talent - 55, 0) / 6 * seasons)
+    poles = rng.poisson(wins * 0.6)
+    titles = rng.binomial(seasons, np.where(talent > 90, 0.15, 0.0))
+    trait_count = rng.choice([0, 1, 2], count, p=[0.3, 0.45, 0.25])
+    trait_idx = rng.random((count, len(TRAITS_LIST))).argsort(axis=1)[:, :2].tolist()
+    salary = np.round(0.5 + (talent - 40) / 59 * 45 * rng.uniform(0.7, 1.1, count), 1).tolist()
+    length = rng.choice(CONTRACT_LENGTHS, count).tolist()
+    pay_amount = np.round(rng.uniform(2, 25, count), 1).tolist()
+    names = [f"{f} {s}" for f, s in _unique_names(start, count, 0, FIRST_NAMES)]
+
+    columns = (talent.tolist(), age.tolist(), seasons.tolist(), titles.tolist(), wins.tolist(),
+               podiums.tolist(), poles.tolist(), trait_count.tolist())
+    records = []
+    for i, (tal, ag, sea, cha, win, pod, pol, ntraits) in enumerate(zip(*columns)):
+        n = start + i
+        team, role = _driver_slot(n, teams)
+        record = {
+            "name": names[i],
+            "team": team,
+            "base_lap_time_sim": 80.0,
+            **dict(zip(DRIVER_STATS, stats[i])),
+            "age": ag,
+            "talent": tal,
+            "history": {"seasons": sea, "championships": cha, "wins": win,
+                        "podiums": pod, "poles": pol},
+            "traits": [TRAITS_LIST[t] for t in trait_idx[i][:ntraits]],
+        }
+        if team:
+            record["number"] = n + 2
+            record["contract"] = _contract(team, length[i], salary[i], role)
+        if "pay_driver" in record["traits"]:
+            record["pay_driver_amount_m"] = pay_amount[i]
+        records.append(record)
+    return records
+
+
+def _driver_slot(n, teams):
+    # two race seats per team, then one reserve each, everyone else a free agent
+    if n < 2 * len(teams):
+        return teams[n // 2], "main"
+    if n < 3 * len(teams):
+        return teams[n - 2 * len(teams)], "reserve"
+    return None, None
+
+
+def staff_chunk(rng, start, count, teams):
+    roles = list(ROLE_DISPLAY)
+    skill = np.clip(rng.normal(11, 4, count), 1, 20).round().astype(int)
+    age = np.clip(rng.normal(45, 8, count), 28, 70).astype(int).tolist()
+    salary = np.round(skill * 0.45 * rng.uniform(0.8, 1.2, count), 1).tolist()
+    length = rng.choice(CONTRACT_LENGTHS, count).tolist()
+    names = [f"{f} {s}" for f, s in _unique_names(start, count, 1, FIRST_NAMES)]
+
+    records = []
+    for i, sk in enumerate(skill.tolist()):
+        n = start + i
+        team = teams[n // len(roles)] if n < len(roles) * len(teams) else None
+        record = {"name": names[i], "role": roles[n % len(roles)], "team": team,
+                  "skill": sk, "age": age[i]}
+        if team:
+            record["contract"] = _contract(team, length[i], salary[i])
+        records.append(record)
+    return records
+
+
+def sponsor_chunk(rng, start, count, teams=None):
+    # most sponsors sit in the low tiers
+    rating = np.minimum(rng.geometric(0.3, count), max(SPONSOR_TIERS)).tolist()
+    names = _unique_names(start, count, 2, SPONSOR_SUFFIXES)
+    return [
+        {"name": f"{surname} {suffix}", "rating": r, "amount_m": SPONSOR_TIERS[r]}
+        for (suffix, surname), r in zip(names, rating)
+    ]
+
+
+GENERATORS = {"drivers": driver_chunk, "staff": staff_chunk, "sponsors": sponsor_chunk}
+
+
+# --------------------
+# Streaming output
+# --------------------
+def write_stream(path: Path, chunks):
+    """Write a JSON array chunk by chunk, atomically; returns the record count."""
+    count = 0
+
+    def write(f):
+        nonlocal count
+        f.write(b"[")
+        for records in chunks:
+            if not records:
+                continue
+            # one encoder call per chunk, without the surrounding brackets
+            f.write(b",\n" if count else b"\n")
+            f.write(json.dumps(records, ensure_ascii=False)[1:-1].encode("utf-8"))
+            count += len(records)
+        f.write(b"\n]\n")
+
+    atomic_write_stream(path, write)
+    return count
+
+
+def active_teams(data_dir=DATA_DIR):
+    teams = read_json(data_dir / TAB_FILES["teams"]) or []
+    return [t["name"] for t in teams if t.get("active") and t.get("name")]
+
+
+def generate(out_dir: Path, counts, seed=0, chunk_size=CHUNK_SIZE, progress=None):
+    """Generate `counts` ({entity: n}) records into out_dir.
+
+    Each entity gets its own stream from the seed, so the drivers for a
+    seed are the same however many staff or sponsors are asked for.
+    Files not generated are copied from the data directory, so out_dir
+    is a complete database. `progress(entity, done, total)` is called
+    after every chunk.
+    """
+    out_dir = Path(out_dir)
+    into_data = out_dir.resolve() == DATA_DIR.resolve()
+    if into_data and get_active_profile() is not None:
+        # the editor reads DATA_DIR through the profile, which would hide the new files
+        raise ValueError("A mod profile is active. Switch to Base data before generating into the data folder.")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if into_data:
+        # saves still waiting to be written would land on top of the generated files
+        flush_writes([out_dir / TAB_FILES[entity] for entity in counts])
+    teams = active_teams()
+    streams = dict(zip(GENERATORS, np.random.SeedSequence(seed).spawn(len(GENERATORS))))
+
+    written = {}
+    for entity, total in counts.items():
+        make = GENERATORS[entity]
+        rng = np.random.default_rng(streams[entity])
+
+        def chunks(make=make, rng=rng, total=total, entity=entity):
+            for start in range(0, total, chunk_size):
+                yield make(rng, start, min(chunk_size, total - start), teams)
+                if progress:
+                    progress(entity, min(start + chunk_size, total), total)
+
+        written[entity] = write_stream(out_dir / TAB_FILES[entity], chunks())
+
+    if not into_data:
+        for name, filename in TAB_FILES.items():
+            if name not in counts and (DATA_DIR / filename).exists():
+                shutil.copyfile(DATA_DIR / filename, out_dir / filename)
+    return written
+
+
+def default_counts(drivers):
+    """Staff and sponsor pool sizes in proportion to a driver count."""
+    return {"drivers": drivers, "staff": drivers * 3 // 5, "sponsors": drivers * 2 // 5}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("usage: generator.py OUT_DIR DRIVERS [SEED]")
+        sys.exit(2)
+    out, n = Path(sys.argv[1]), int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    for entity, count in generate(out, default_counts(n), seed).items():
+        print(f"{entity}: {count}")
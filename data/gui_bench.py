@@ -0,0 +1,225 @@
+# gui_bench.py
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Interaction latency benchmarks: MainWindow on the offscreen Qt platform,
+# driven through the same widget calls a user triggers, over generated
+# data. Each sample covers the handler plus the event processing and
+# repaint after it. Exits with status 1 if any p95 is over its budget.
+#
+#   python gui_bench.py 20000 --budget select_driver=30 --json out.json
+
+HERE = Path(__file__).parent
+
+# p95 budgets in milliseconds
+DEFAULT_BUDGETS = {
+    "switch_tab": 150,
+    "select_driver": 50,
+    "select_team": 50,
+    "search_keystroke": 100,
+    "save_driver": 1000,  # a save rewrites the whole file
+    "add_driver": 1500,
+}
+
+SEARCH_TEXT = 'talent>=80 team:"Red Boar" trait:hotlapper'
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * q / 100
+    lo = int(rank)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (rank - lo)
+
+
+# --------------------
+# Scenarios
+# --------------------
+# Each takes (bench, count) and returns latency samples in ms.
+class Bench:
+    def __init__(self, app, window, rng):
+        self.app = app
+        self.w = window
+        self.rng = rng
+
+    def timed(self, action):
+        t = time.perf_counter()
+        action()
+        self.app.processEvents()
+        return (time.perf_counter() - t) * 1000
+
+    def show(self, name):
+        self.w.tabs.setCurrentWidget(self.w.tab_objs[name])
+        self.app.processEvents()
+
+
+def switch_tab(bench, count):
+    tabs = bench.w.tabs
+    return [bench.timed(lambda i=i: tabs.setCurrentIndex(i % tabs.count())) for i in range(count)]
+
+
+def select_driver(bench, count):
+    bench.show("drivers")
+    lst = bench.w.tab_objs["drivers"].list
+    rows = [bench.rng.randrange(lst.count()) for _ in range(count)]
+    return [bench.timed(lambda r=r: lst.setCurrentRow(r)) for r in rows]
+
+
+def select_team(bench, count):
+    bench.show("teams")
+    lst = bench.w.tab_objs["teams"].list
+    rows = [bench.rng.randrange(lst.count()) for _ in range(count)]
+    return [bench.timed(lambda r=r: lst.setCurrentRow(r)) for r in rows]
+
+
+def search_keystroke(bench, count):
+    bench.show("drivers")
+    box = bench.w.tab_objs["drivers"].search_box
+    samples = []
+    while len(samples) < count:
+        box.clear()
+        bench.app.processEvents()
+        for i in range(1, len(SEARCH_TEXT) + 1):
+            samples.append(bench.timed(lambda i=i: box.setText(SEARCH_TEXT[:i])))
+    box.clear()
+    bench.app.processEvents()
+    return samples[:count]
+
+
+def save_driver(bench, count):
+    bench.show("drivers")
+    tab = bench.w.tab_objs["drivers"]
+    samples = []
+    for _ in range(count):
+        tab.list.setCurrentRow(bench.rng.randrange(tab.list.count()))
+        bench.app.processEvents()
+        samples.append(bench.timed(tab.save_data))
+    return samples
+
+
+def add_driver(bench, count):
+    bench.show("drivers")
+    return [bench.timed(bench.w.tab_objs["drivers"].add_driver) for _ in range(count)]
+
+
+SCENARIOS = {
+    "switch_tab": (switch_tab, 30),
+    "select_driver": (select_driver, 50),
+    "select_team": (select_team, 30),
+    "search_keystroke": (search_keystroke, len(SEARCH_TEXT)),
+    "save_driver": (save_driver, 10),
+    "add_driver": (add_driver, 5),
+}
+
+
+# --------------------
+# Running
+# --------------------
+def run(names, seed):
+    """Build MainWindow over TP_DATA_DIR and run the scenarios; {name: [ms]}."""
+    from PyQt6.QtWidgets import QApplication, QMessageBox
+
+    # dialogs would block: information boxes are dismissed, questions answered Yes
+    for kind in ("information", "warning", "critical"):
+        setattr(QMessageBox, kind, staticmethod(lambda *a, **k: QMessageBox.StandardButton.Ok))
+    QMessageBox.question = staticmethod(lambda *a, **k: QMessageBox.StandardButton.Yes)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    import main
+    from utils import flush_writes
+
+    t = time.perf_counter()
+    window = main.MainWindow()
+    window.show()
+    app.processEvents()
+    results = {"startup": [(time.perf_counter() - t) * 1000]}
+
+    bench = Bench(app, window, random.Random(seed))
+    for name in names:
+        scenario, count = SCENARIOS[name]
+        results[name] = scenario(bench, count)
+    flush_writes()
+    return results
+
+
+def report(results, budgets):
+    """Print the latency table; returns the names over budget."""
+    failed = []
+    print(f"{'interaction':18} {'n':>4} {'p50':>9} {'p95':>9} {'max':>9} {'budget':>9}")
+    for name, samples in results.items():
+        p50, p95 = percentile(samples, 50), percentile(samples, 95)
+        budget = budgets.get(name)
+        over = budget is not None and p95 > budget
+        if over:
+            failed.append(name)
+        shown = f"{budget:.0f}" if budget is not None else "-"
+        print(f"{name:18} {len(samples):>4} {p50:>7.1f}ms {p95:>7.1f}ms {max(samples):>7.1f}ms "
+              f"{shown:>7}ms{'  OVER' if over else ''}")
+    return failed
+
+
+def parse_args(args):
+    """usage: gui_bench.py [DRIVERS | DATA_DIR] [--seed N] [--only NAME,...]
+    [--budget NAME=MS ...] [--budgets FILE] [--json OUT]"""
+    opts = {"drivers": 20000, "data": None, "seed": 0, "only": list(SCENARIOS),
+            "budgets": dict(DEFAULT_BUDGETS), "json": None}
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        if arg == "--seed":
+            opts["seed"] = int(args.pop(0))
+        elif arg == "--only":
+            opts["only"] = [n for n in args.pop(0).split(",") if n in SCENARIOS]
+        elif arg == "--budget":
+            name, _, ms = args.pop(0).partition("=")
+            opts["budgets"][name] = float(ms)
+        elif arg == "--budgets":
+            opts["budgets"].update(json.loads(Path(args.pop(0)).read_text()))
+        elif arg == "--json":
+            opts["json"] = Path(args.pop(0))
+        elif arg.isdigit():
+            opts["drivers"] = int(arg)
+        else:
+            opts["data"] = Path(arg)
+    return opts
+
+
+def main():
+    opts = parse_args(sys.argv[1:])
+    with tempfile.TemporaryDirectory(prefix="tp-bench-") as tmp:
+        data_dir = Path(tmp) / "data"
+        if opts["data"]:
+            # the benchmark saves, so it works on a copy
+            shutil.copytree(opts["data"], data_dir)
+        else:
+            # a separate process, since DATA_DIR is fixed once utils is imported
+            subprocess.run([sys.executable, str(HERE / "generator.py"), str(data_dir),
+                            str(opts["drivers"]), str(opts["seed"])], check=True, stdout=subprocess.DEVNULL)
+        os.environ["TP_DATA_DIR"] = str(data_dir)
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        results = run(opts["only"], opts["seed"])
+
+    budgets = opts["budgets"]
+    failed = report(results, budgets)
+    if opts["json"]:
+        opts["json"].write_text(json.dumps({
+            name: {"samples": samples, "p50": percentile(samples, 50), "p95": percentile(samples, 95),
+                   "budget": budgets.get(name)}
+            for name, samples in results.items()
+        }, indent=2))
+    if failed:
+        print("over budget:", ", ".join(failed))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
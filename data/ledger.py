@@ -0,0 +1,254 @@
+# ledger.py
+from utils import DATA_DIR, TAB_FILES, read_json, add_save_listener, add_reload_listener
+
+SEASON_WEEKS = 52
+
+
+class LedgerEntry:
+    __slots__ = ("team", "income", "expense", "start", "end")
+
+    def __init__(self, team, income, expense, start, end):
+        self.team = team
+        self.income = income  # per week
+        self.expense = expense  # per week
+        self.start = start  # first week, 1-based
+        self.end = end  # last week + 1
+
+    @property
+    def weeks(self):
+        return max(0, self.end - self.start)
+
+    def __eq__(self, other):
+        return isinstance(other, LedgerEntry) and self._values() == other._values()
+
+    def _values(self):
+        return (self.team, self.income, self.expense, self.start, self.end)
+
+
+class TeamAccount:
+    def __init__(self, weeks):
+        self.opening = 0.0
+        self.income = 0.0
+        self.expense = 0.0
+        # difference arrays over weeks, so adding an entry is O(1)
+        self.income_diff = [0.0] * (weeks + 2)
+        self.expense_diff = [0.0] * (weeks + 2)
+
+    @property
+    def balance(self):
+        return self.opening + self.income - self.expense
+
+
+class Ledger:
+    """Per-team income, expense and balance over the season.
+
+    Every record that moves money is turned into one or more entries keyed
+    by (kind, record key). Saving a record swaps its old entries for new
+    ones, so an edit costs O(1) per entry instead of a rescan of every file.
+    Names need not be unique, so a key holds a list of entries and the old
+    record's entries are found by value.
+    Salaries, engine costs, tyre prices and sponsor amounts are treated as
+    per-season figures spread evenly over the weeks they apply to.
+    """
+
+    def __init__(self, weeks=SEASON_WEEKS):
+        self.weeks = weeks
+        self.accounts = {}
+        self.entries = {}
+
+        # team -> (engine name, tyre supplier, tyre contract type)
+        self.team_links = {}
+        self.engines = {}
+        self.suppliers = {}
+
+    @classmethod
+    def from_files(cls):
+        ledger = cls()
+        ledger.reload()
+        return ledger
+
+    def reload(self):
+        """Rebuild every aggregate from the data files."""
+        schedule = read_json(DATA_DIR / TAB_FILES["schedule"]) or []
+        self.__init__(len(schedule) or SEASON_WEEKS)
+        self.engines = (read_json(DATA_DIR / TAB_FILES["engines"]) or {}).get("engines", {})
+        self.suppliers = (read_json(DATA_DIR / TAB_FILES["tyre_suppliers"]) or {}).get("suppliers", {})
+        for team in read_json(DATA_DIR / TAB_FILES["teams"]) or []:
+            self.apply("teams", None, team)
+        for name in ("drivers", "staff", "sponsors"):
+            for record in read_json(DATA_DIR / TAB_FILES[name]) or []:
+                self.apply(name, None, record)
+
+    # --------------------
+    # Queries
+    # --------------------
+    def account(self, team):
+        if team not in self.accounts:
+            self.accounts[team] = TeamAccount(self.weeks)
+        return self.accounts[team]
+
+    def summary(self, team):
+        acc = self.accounts.get(team)
+        if acc is None:
+            return {"opening": 0.0, "income": 0.0, "expense": 0.0, "balance": 0.0}
+        return {"opening": acc.opening, "income": acc.income,
+                "expense": acc.expense, "balance": acc.balance}
+
+    def weekly(self, team):
+        """List of (week, income, expense, balance) for every week of the season."""
+        acc = self.accounts.get(team) or TeamAccount(self.weeks)
+        rows = []
+        income = expense = 0.0
+        balance = acc.opening
+        for week in range(1, self.weeks + 1):
+            income += acc.income_diff[week]
+            expense += acc.expense_diff[week]
+            balance += income - expense
+            rows.append((week, income, expense, balance))
+        return rows
+
+    # --------------------
+    # Entries
+    # --------------------
+    def _add(self, key, entry):
+        self.entries.setdefault(key, []).append(entry)
+        acc = self.account(entry.team)
+        acc.income += entry.income * entry.weeks
+        acc.expense += entry.expense * entry.weeks
+        acc.income_diff[entry.start] += entry.income
+        acc.income_diff[entry.end] -= entry.income
+        acc.expense_diff[entry.start] += entry.expense
+        acc.expense_diff[entry.end] -= entry.expense
+
+    def _remove(self, key, entry=None):
+        """Take out `entry` under key, or the latest one if not given."""
+        found = self.entries.get(key)
+        if not found:
+            return
+        if entry is None:
+            entry = found.pop()
+        elif entry in found:
+            entry = found.pop(found.index(entry))
+        else:
+            return
+        if not found:
+            del self.entries[key]
+        acc = self.account(entry.team)
+        acc.income -= entry.income * entry.weeks
+        acc.expense -= entry.expense * entry.weeks
+        acc.income_diff[entry.start] -= entry.income
+        acc.income_diff[entry.end] += entry.income
+        acc.expense_diff[entry.start] -= entry.expense
+        acc.expense_diff[entry.end] += entry.expense
+
+    def _season_entry(self, team, income=0.0, expense=0.0, start=1, length=None):
+        start = min(max(1, int(start)), self.weeks + 1)
+        end = self.weeks + 1 if length is None else min(start + max(0, int(length)), self.weeks + 1)
+        return LedgerEntry(team, income / self.weeks, expense / self.weeks, start, end)
+
+    # --------------------
+    # Updates
+    # --------------------
+    def apply(self, name, old, new):
+        """Save listener: swap the entries of `old` for those of `new`."""
+        if name in ("drivers", "staff", "sponsors"):
+            if old is not None:
+                for key, entry in self._record_entries(name, old):
+                    self._remove(key, entry)
+            if new is not None:
+                for key, entry in self._record_entries(name, new):
+                    self._add(key, entry)
+        elif name == "teams":
+            self._apply_team(old, new)
+        elif name == "engines":
+            self._apply_keyed(self.engines, old, new)
+            for team, (engine, _, _) in self.team_links.items():
+                if engine in _names(old, new):
+                    self._refresh_engine(team)
+        elif name == "tyre_suppliers":
+            self._apply_keyed(self.suppliers, old, new)
+            for team, (_, supplier, _) in self.team_links.items():
+                if supplier in _names(old, new):
+                    self._refresh_tyres(team)
+
+    def _record_entries(self, name, record):
+        """[(key, entry)] for one driver, staff or sponsor record."""
+        key = record.get("name")
+        if name == "sponsors":
+            if not record.get("team"):
+                return []
+            return [(("sponsors", key), self._season_entry(record["team"], income=_num(record.get("amount_m"))))]
+        contract = record.get("contract") or {}
+        team = contract.get("team")
+        if not team or team == "Null":
+            return []
+        start = _num(contract.get("start_week"), 1)
+        length = _num(contract.get("length_weeks"))
+        out = [((name, key), self._season_entry(
+            team, expense=_num(contract.get("salary_m")), start=start, length=length))]
+        if "pay_driver" in (record.get("traits") or []) and _num(record.get("pay_driver_amount_m")):
+            out.append(((name + "_pay", key), self._season_entry(
+                team, income=_num(record.get("pay_driver_amount_m")), start=start, length=length)))
+        return out
+
+    def _apply_team(self, old, new):
+        if old is not None:
+            team = old.get("name")
+            self.account(team).opening -= _num(old.get("budget_m"))
+            self.team_links.pop(team, None)
+            self._remove(("engine", team))
+            self._remove(("tyres", team))
+        if new is not None:
+            team = new.get("name")
+            tyre = new.get("tyre_contract") or {}
+            self.account(team).opening += _num(new.get("budget_m"))
+            self.team_links[team] = (new.get("engine"), tyre.get("supplier"), tyre.get("type"))
+            self._refresh_engine(team)
+            self._refresh_tyres(team)
+
+    def _refresh_engine(self, team):
+        self._remove(("engine", team))
+        engine = self.engines.get(self.team_links[team][0])
+        if engine:
+            self._add(("engine", team), self._season_entry(team, expense=_num(engine.get("cost_m"))))
+
+    def _refresh_tyres(self, team):
+        self._remove(("tyres", team))
+        _, supplier, contract_type = self.team_links[team]
+        prices = (self.suppliers.get(supplier) or {}).get("prices") or {}
+        price = _num(prices.get(contract_type))
+        if price:
+            self._add(("tyres", team), self._season_entry(team, expense=price))
+
+    @staticmethod
+    def _apply_keyed(mapping, old, new):
+        if old is not None:
+            mapping.pop(old.get("name"), None)
+        if new is not None:
+            mapping[new.get("name")] = {k: v for k, v in new.items() if k != "name"}
+
+
+def _names(*records):
+    return {r.get("name") for r in records if r is not None}
+
+
+def _num(value, default=0.0):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+# --------------------
+# Shared instance
+# --------------------
+_ledger = None
+
+def get_ledger():
+    """Ledger built from the data files on first use and kept current by saves."""
+    global _ledger
+    if _ledger is None:
+        _ledger = Ledger.from_files()
+        add_save_listener(_ledger.apply)
+        add_reload_listener(_ledger.reload)
+    return _ledger
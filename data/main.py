@@ -1,8 +1,24 @@
 # main.py
 import sys
-from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QTabWidget
+from PyQt6.QtWidgets import (
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTabWidget,
+    QLabel, QComboBox, QPushButton, QInputDialog, QMessageBox, QFileDialog
+)
+from PyQt6.QtCore import QTimer
+from pathlib import Path
 
-from utils import TAB_FILES, DATA_DIR, ACCENT, TEXT, BG, read_json, write_json
+from utils import (
+    TAB_FILES, DATA_DIR, ACCENT, TEXT, BG, read_json, write_json, add_reload_listener,
+    set_write_scheduler, add_write_error_listener, flush_writes, DataWriteError
+)
+import profiles
+import archive
+import concurrency
+import migrations
+from dialogs import (
+    export_table_dialog, dedupe_dialog, generate_data_dialog, snapshot_dialog,
+    compare_dialog
+)
 from drivers_tab import DriversTab
 from teams_tab import TeamsTab
 from table_tab import TableTab
@@ -13,6 +29,8 @@ from events_tab import  EventsTab
 from config_tab import ConfigTab
 from schedule_tab import ScheduleTab
 from tyre_supplier_tab import TyreSuppliersTab
+from contracts_tab import ContractsTab
+from power_ranking_tab import PowerRankingTab
 
 # --- Main Window ---
 class MainWindow(QMainWindow):
@@ -26,6 +44,15 @@ class MainWindow(QMainWindow):
         self.vlayout = QVBoxLayout()
         self.central.setLayout(self.vlayout)
 
+        # Mod profile selector
+        profile_bar = QHBoxLayout()
+        self.profile_combo = QComboBox()
+        self.new_profile_btn = QPushButton("New Profile")
+        profile_bar.addWidget(QLabel("Profile"))
+        profile_bar.addWidget(self.profile_combo, 1)
+        profile_bar.addWidget(self.new_profile_btn)
+        self.vlayout.addLayout(profile_bar)
+
         # Tabs
         self.tabs = QTabWidget()
         self.tab_objs = {}
@@ -54,9 +81,135 @@ class MainWindow(QMainWindow):
             self.tab_objs[name] = tab
             self.tabs.addTab(tab, name.capitalize())
 
+        # Derived views
+        self.tab_objs["contracts"] = ContractsTab()
+        self.tabs.addTab(self.tab_objs["contracts"], "Contracts")
+        self.tab_objs["power"] = PowerRankingTab()
+        self.tabs.addTab(self.tab_objs["power"], "Power Ranking")
+
         self.vlayout.addWidget(self.tabs)
         self.apply_styles()
 
+        self.create_menus()
+        self.load_profiles()
+        self.profile_combo.currentIndexChanged.connect(self.switch_profile)
+        self.new_profile_btn.clicked.connect(self.new_profile)
+        add_reload_listener(self.reload_all)
+
+        # saves are written out shortly after the last one in a burst
+        set_write_scheduler(lambda delay, callback: QTimer.singleShot(int(delay * 1000), callback))
+        add_write_error_listener(self.on_write_error)
+
+        # several editors on one data directory: merge saves record by record
+        self.shared_action.setChecked(concurrency.enabled_by_environment())
+
+    def on_write_error(self, error):
+        QMessageBox.critical(self, "Save Failed", f"{error}\n\nYour changes are kept and will be written with the next save.")
+
+    def closeEvent(self, event):
+        try:
+            flush_writes()
+        except DataWriteError as e:
+            reply = QMessageBox.question(
+                self, "Save Failed", f"{e}\n\nQuit anyway and lose the unsaved changes?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                event.ignore()
+                return
+        super().closeEvent(event)
+
+    def create_menus(self):
+        file_menu = self.menuBar().addMenu("File")
+        file_menu.addAction("Export Archive...").triggered.connect(self.export_archive)
+        file_menu.addAction("Import Archive...").triggered.connect(self.import_archive)
+        file_menu.addSeparator()
+        file_menu.addAction("Export Table...").triggered.connect(lambda: export_table_dialog(self))
+
+        tools_menu = self.menuBar().addMenu("Tools")
+        tools_menu.addAction("Find Duplicates...").triggered.connect(lambda: dedupe_dialog(self))
+        tools_menu.addAction("Generate Test Data...").triggered.connect(lambda: generate_data_dialog(self))
+        tools_menu.addAction("Snapshots...").triggered.connect(lambda: snapshot_dialog(self))
+        tools_menu.addAction("Compare Data...").triggered.connect(lambda: compare_dialog(self))
+        tools_menu.addSeparator()
+        self.shared_action = tools_menu.addAction("Shared Editing")
+        self.shared_action.setCheckable(True)
+        self.shared_action.toggled.connect(self.toggle_shared_editing)
+
+    def toggle_shared_editing(self, on):
+        if on:
+            concurrency.enable()
+        else:
+            concurrency.disable()
+
+    # --------------------
+    # Archives
+    # --------------------
+    def export_archive(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Archive", "", f"Data archive (*{archive.ARCHIVE_SUFFIX})")
+        if not path:
+            return
+        path = Path(path)
+        if path.suffix != archive.ARCHIVE_SUFFIX:
+            path = path.with_suffix(archive.ARCHIVE_SUFFIX)
+        try:
+            changed = archive.pack(path)
+        except (archive.ArchiveError, DataWriteError, OSError) as e:
+            QMessageBox.critical(self, "Export Failed", str(e))
+            return
+        QMessageBox.information(self, "Exported", f"Wrote {path.name} ({len(changed)} file(s) changed)")
+
+    def import_archive(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import Archive", "", f"Data archive (*{archive.ARCHIVE_SUFFIX})")
+        if not path:
+            return
+        try:
+            names = archive.unpack(Path(path))
+        except (archive.ArchiveError, DataWriteError, concurrency.ConflictError, OSError) as e:
+            QMessageBox.critical(self, "Import Failed", str(e))
+            return
+        QMessageBox.information(self, "Imported", f"Imported {len(names)} file(s)")
+
+    # --------------------
+    # Mod profiles
+    # --------------------
+    def load_profiles(self, select=None):
+        self.profile_combo.blockSignals(True)
+        self.profile_combo.clear()
+        self.profile_combo.addItem("Base data", None)
+        for name in profiles.list_profiles():
+            self.profile_combo.addItem(name, name)
+        idx = self.profile_combo.findData(select)
+        self.profile_combo.setCurrentIndex(idx if idx >= 0 else 0)
+        self.profile_combo.blockSignals(False)
+
+    def switch_profile(self, index):
+        profiles.activate(self.profile_combo.itemData(index))
+
+    def new_profile(self):
+        name, ok = QInputDialog.getText(self, "New Profile", "Profile name:")
+        if not ok or not name.strip():
+            return
+        parent = self.profile_combo.currentData()
+        try:
+            profiles.create_profile(name.strip(), parent)
+        except ValueError as e:
+            QMessageBox.warning(self, "New Profile", str(e))
+            return
+        self.load_profiles(select=name.strip())
+        profiles.activate(name.strip())
+
+    def reload_all(self):
+        for tab in self.tab_objs.values():
+            if hasattr(tab, "load_active_teams"):
+                tab.load_active_teams()
+            if hasattr(tab, "load_data"):
+                tab.load_data()
+            elif hasattr(tab, "load_from_file"):
+                tab.load_from_file()
+            elif hasattr(tab, "refresh"):
+                tab.refresh()
+
     def apply_styles(self):
         style = f"""
         QMainWindow, QWidget {{
@@ -92,6 +245,16 @@ class MainWindow(QMainWindow):
             background-color: #2e3132;
             gridline-color: #444;
         }}
+        QLabel#sectionHeader {{
+            font-weight: bold;
+            border: 1px solid {ACCENT};
+            padding: 4px;
+            margin-top: 8px;
+            margin-bottom: 4px;
+            border-radius: 4px;
+            background-color: #2f3436;
+            color: {TEXT};
+        }}
         QHeaderView::section {{
             background-color: #2b2f30;
             color: {TEXT};
@@ -123,11 +286,13 @@ def ensure_default_files():
                         "consistency": 85,
                         "smoothness": 80,
                         "control": 78,
-                        "seasons": 3,
-                        "championships": 1,
-                        "wins": 5,
-                        "podiums": 10,
-                        "poles": 2,
+                        "history": {
+                            "seasons": 3,
+                            "championships": 1,
+                            "wins": 5,
+                            "podiums": 10,
+                            "poles": 2
+                        },
                         "contract": {
                             "team": "Team A",
                             "length_weeks": 52,
@@ -145,6 +310,7 @@ def ensure_default_files():
 # --- Main entry ---
 def main():
     ensure_default_files()
+    migrations.migrate_all(DATA_DIR, profiles.MODS_DIR)
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -0,0 +1,181 @@
+# migrations.py
+import json
+import os
+import sys
+from pathlib import Path
+
+import serialization
+from profiles import MODS_DIR
+from records import RECORD_CLASSES
+from utils import (
+    DATA_DIR, TAB_FILES, HISTORY_FIELDS, read_json_file, write_json_file, iter_json_array,
+    flush_writes, atomic_write_bytes, read_error, DataWriteError
+)
+
+# Versioned, per-record migrations of the data files. schema.json in the
+# data directory records the version each file is at; on startup every
+# file with newer migrations is rewritten once, record by record, so the
+# rest of the editor can rely on the current layout.
+SCHEMA_FILE = "schema.json"
+
+MIGRATIONS = {}  # name -> [(version, description, fn(record) -> record)], by version
+
+
+def migration(name, version, description):
+    def register(fn):
+        steps = MIGRATIONS.setdefault(name, [])
+        steps.append((version, description, fn))
+        steps.sort(key=lambda step: step[0])
+        return fn
+    return register
+
+
+# --------------------
+# Migrations
+# --------------------
+@migration("drivers", 1, "move flat career stats under history")
+def nest_driver_history(record):
+    if not any(k in record for k in HISTORY_FIELDS):
+        return record
+    history = dict(record.get("history") or {})
+    out = {}
+    for key, value in record.items():
+        if key in HISTORY_FIELDS:
+            # a nested value wins over a stale flat copy
+            history.setdefault(key, value)
+        elif key != "history":
+            out[key] = value
+        if key in HISTORY_FIELDS or key == "history":
+            out["history"] = history  # where the first history field was
+    return out
+
+
+def _typed(name):
+    cls = RECORD_CLASSES[name]
+    return lambda record: cls.from_dict(record).to_dict()
+
+
+# numbers the editor saved as text; see records.parse_number
+for _name, _version in (("drivers", 2), ("staff", 1), ("teams", 1), ("sponsors", 1)):
+    migration(_name, _version, "store numeric text as numbers")(_typed(_name))
+
+
+# --------------------
+# Running them
+# --------------------
+def schema_versions(data_dir=DATA_DIR):
+    versions = read_json_file(data_dir / SCHEMA_FILE)
+    return versions if isinstance(versions, dict) else {}
+
+
+def latest_version(name):
+    steps = MIGRATIONS.get(name)
+    return steps[-1][0] if steps else 0
+
+
+def migrate_record(name, record, since=0):
+    for version, _, fn in MIGRATIONS.get(name, []):
+        if version > since and isinstance(record, dict):
+            record = fn(record)
+    return record
+
+
+def _write_array(path: Path, records):
+    """Stream records into path as the default pretty JSON; True if any record changed.
+
+    Produces exactly what json.dumps(list, indent=2) would, one record at a time.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.migrate")
+    changed = False
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("[")
+            count = 0
+            for old, new in records:
+                changed = changed or new != old
+                f.write(",\n  " if count else "\n  ")
+                f.write(json.dumps(new, indent=2, ensure_ascii=False).replace("\n", "\n  "))
+                count += 1
+            f.write("\n]" if count else "]")
+            f.flush()
+            os.fsync(f.fileno())
+        if changed:
+            os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return changed
+
+
+def migrate_file(name, data_dir=DATA_DIR, since=0):
+    """Bring one list file up from version `since`; returns the number of records."""
+    path = data_dir / TAB_FILES[name]
+    flush_writes([path])
+    if not path.exists():
+        return 0
+    if serialization.get_codec().name == "json" and serialization.is_text(path):
+        # bounded memory: one record in flight
+        count = 0
+
+        def pairs():
+            nonlocal count
+            for record in iter_json_array(path):
+                count += 1
+                yield record, migrate_record(name, record, since)
+
+        _write_array(path, pairs())
+        return count
+    # other codecs cannot be streamed; these files are loaded whole
+    records = read_json_file(path) or []
+    if read_error(path):
+        raise ValueError(read_error(path))
+    migrated = [migrate_record(name, r, since) for r in records]
+    if migrated != records:
+        write_json_file(path, migrated)
+        flush_writes([path])
+    return len(migrated)
+
+
+def migrate_overlays(name, since, mods_dir):
+    """Mod profiles store whole records too, so their overlays move with the base file."""
+    for path in mods_dir.glob(f"*/{TAB_FILES[name]}.overlay.json"):
+        overlay = read_json_file(path)
+        if not isinstance(overlay, dict) or not overlay.get("set"):
+            continue
+        migrated = {k: migrate_record(name, r, since) for k, r in overlay["set"].items()}
+        if migrated != overlay["set"]:
+            overlay["set"] = migrated
+            write_json_file(path, overlay)
+            flush_writes([path])
+
+
+def migrate_all(data_dir=DATA_DIR, mods_dir=None):
+    """Run every pending migration; returns {name: (from version, to version, records)}."""
+    versions = schema_versions(data_dir)
+    done = {}
+    for name in MIGRATIONS:
+        filename = TAB_FILES[name]
+        since, target = versions.get(filename, 0), latest_version(name)
+        if since >= target:
+            continue
+        try:
+            count = migrate_file(name, data_dir, since)
+            if mods_dir is not None and mods_dir.exists():
+                migrate_overlays(name, since, mods_dir)
+        except (ValueError, OSError, DataWriteError) as e:
+            # left at its version, so the next start tries again; the tabs report the bad file
+            print(f"Could not migrate {filename}: {e}")
+            continue
+        versions[filename] = target
+        # recorded per file, so an interrupted run resumes where it stopped
+        atomic_write_bytes(data_dir / SCHEMA_FILE, json.dumps(versions, indent=2).encode("utf-8"))
+        done[name] = (since, target, count)
+    return done
+
+
+if __name__ == "__main__":
+    target = Path(sys.argv[1]) if len(sys.argv) > 1 else DATA_DIR
+    results = migrate_all(target, MODS_DIR if target == DATA_DIR else None)
+    for name, (since, version, count) in results.items():
+        print(f"{TAB_FILES[name]}: v{since} -> v{version}, {count} records")
+    if not results:
+        print("all files are up to date")
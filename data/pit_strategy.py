@@ -0,0 +1,215 @@
+# pit_strategy.py
+from collections import Counter
+from functools import lru_cache
+
+from utils import DATA_DIR, TAB_FILES, read_json
+
+DEFAULT_RACE_LAPS = 58
+DOMINANCE_SHARE = 0.9
+
+# driver traits that change how fast a driver wears tyres
+TRAIT_WEAR_MULT = {
+    "tyre_whisperer": 0.85,
+    "tyre_abuser": 1.2,
+}
+
+# config sections the solver depends on
+STRATEGY_SECTIONS = ("tyres", "pitstops")
+
+
+class StintPlan:
+    def __init__(self, total_time, stints):
+        self.total_time = total_time
+        self.stints = stints  # [(compound, laps), ...]
+
+    @property
+    def stops(self):
+        return len(self.stints) - 1
+
+    @property
+    def signature(self):
+        return "-".join(c for c, _ in self.stints)
+
+    def __repr__(self):
+        stints = ", ".join(f"{c} x{n}" for c, n in self.stints)
+        return f"StintPlan({self.total_time:.2f}s, {self.stops} stop(s): {stints})"
+
+
+# --------------------
+# Lap time model
+# --------------------
+def lap_delta_table(compound, tyres, pitstops, supplier, wear_mult, max_stint):
+    """Lap time delta (s) of a compound for tyre ages 1..max_stint."""
+    params = tyres["compounds"][compound]
+    pace = supplier.get("pace", {}).get(compound, 0.0)
+    durability = supplier.get("durability", {}).get(compound, 0.0)
+
+    deg = params.get("deg_per_lap", 0.0) * (1 - durability) * wear_mult
+    cliff = max(params.get("cliff_lap", 1) * (1 + durability) / wear_mult, 1e-6)
+    wear_penalty = tyres.get("wear_to_laptime_mult", 0.0)
+    threshold = pitstops.get("wear_threshold", 1.0)
+    base = params.get("base_delta", 0.0) + pace
+
+    table = [0.0]  # index 0 unused, ages start at 1
+    for age in range(1, max_stint + 1):
+        wear = age / cliff
+        table.append(base + deg * age + wear_penalty * max(0.0, wear - threshold))
+    return table
+
+
+# --------------------
+# Solver
+# --------------------
+def solve(laps, tyres, pitstops, supplier=None, wear_mult=1.0):
+    """Race-time-minimising stint plan via DP over (lap, compound, tyre age)."""
+    return _solve_cached(laps, _freeze(tyres), _freeze(pitstops),
+                         _freeze(supplier or {}), round(wear_mult, 6))
+
+
+@lru_cache(maxsize=4096)
+def _solve_cached(laps, tyres, pitstops, supplier, wear_mult):
+    tyres, pitstops, supplier = _thaw(tyres), _thaw(pitstops), _thaw(supplier)
+    compounds = list(tyres.get("compounds", {}).keys())
+    if not compounds or laps <= 0:
+        return StintPlan(0.0, [])
+
+    max_stint = max(1, int(laps * pitstops.get("max_lap_fraction", 1.0)))
+    pit_loss = pitstops.get("pit_lane_loss_s", 0.0)
+    deltas = [lap_delta_table(c, tyres, pitstops, supplier, wear_mult, max_stint)
+              for c in compounds]
+    inf = float("inf")
+
+    # best[c][a]: minimum race time after the current lap on compound c aged a
+    best = [[inf] * (max_stint + 1) for _ in compounds]
+    for c in range(len(compounds)):
+        best[c][1] = deltas[c][1]
+    pit_froms = []  # per lap from lap 2: state pitted from onto fresh tyres
+
+    for _ in range(2, laps + 1):
+        # cheapest state to pit from, shared by every new compound
+        pit_from, pit_cost = None, inf
+        for c, row in enumerate(best):
+            for a in range(1, max_stint + 1):
+                if row[a] < pit_cost:
+                    pit_from, pit_cost = (c, a), row[a]
+
+        nxt = []
+        for c, row in enumerate(best):
+            delta = deltas[c]
+            new_row = [inf] * (max_stint + 1)
+            new_row[1] = pit_cost + pit_loss + delta[1]
+            for a in range(1, max_stint):
+                if row[a] < inf:
+                    new_row[a + 1] = row[a] + delta[a + 1]
+            nxt.append(new_row)
+
+        best = nxt
+        pit_froms.append(pit_from)
+
+    total, state = inf, None
+    for c, row in enumerate(best):
+        for a in range(1, max_stint + 1):
+            if row[a] < total:
+                total, state = row[a], (c, a)
+    if state is None:
+        return StintPlan(inf, [])
+
+    # walk back one stint at a time: a stint of age a ending on lap L began on L - a + 1
+    stints = []
+    lap, (c, a) = laps, state
+    while True:
+        stints.append((compounds[c], a))
+        start_lap = lap - a + 1
+        if start_lap == 1:
+            break
+        c, a = pit_froms[start_lap - 2]
+        lap = start_lap - 1
+    stints.reverse()
+    return StintPlan(total, stints)
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return ("__list__",) + tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, tuple):
+        if value and value[0] == "__list__":
+            return [_thaw(v) for v in value[1:]]
+        return {k: _thaw(v) for k, v in value}
+    return value
+
+
+# --------------------
+# Season runs
+# --------------------
+def race_laps_for(track, config):
+    tracks = config.get("tracks") or {}
+    laps = (tracks.get(track) or {}).get("laps")
+    if laps is None:
+        laps = (config.get("race") or {}).get("laps", DEFAULT_RACE_LAPS)
+    return int(laps)
+
+
+def wear_multiplier(team, driver=None):
+    mult = 1.0 / max(float(team.get("tyre_management", 1.0) or 1.0), 1e-6)
+    for trait in (driver or {}).get("traits") or []:
+        mult *= TRAIT_WEAR_MULT.get(trait, 1.0)
+    return mult
+
+
+def solve_season(config=None, teams=None, drivers=None, suppliers=None, schedule=None):
+    """Optimal plan per (track, team, driver) for every race in the schedule.
+
+    Anything not passed in is read from the data directory.
+    """
+    if config is None:
+        config = read_json(DATA_DIR / TAB_FILES["config"]) or {}
+    if teams is None:
+        teams = read_json(DATA_DIR / TAB_FILES["teams"]) or []
+    if drivers is None:
+        drivers = read_json(DATA_DIR / TAB_FILES["drivers"]) or []
+    if suppliers is None:
+        suppliers = (read_json(DATA_DIR / TAB_FILES["tyre_suppliers"]) or {}).get("suppliers", {})
+    if schedule is None:
+        schedule = read_json(DATA_DIR / TAB_FILES["schedule"]) or []
+
+    tyres = config.get("tyres") or {}
+    pitstops = config.get("pitstops") or {}
+    tracks = [t for t in schedule if t and t != "test"]
+
+    drivers_by_team = {}
+    for d in drivers:
+        team = (d.get("contract") or {}).get("team") or d.get("team")
+        if team:
+            drivers_by_team.setdefault(team, []).append(d)
+
+    results = {}
+    for track in tracks:
+        laps = race_laps_for(track, config)
+        for team in teams:
+            if not team.get("active", False):
+                continue
+            supplier = suppliers.get((team.get("tyre_contract") or {}).get("supplier"), {})
+            for driver in drivers_by_team.get(team.get("name"), []):
+                plan = solve(laps, tyres, pitstops, supplier, wear_multiplier(team, driver))
+                results[(track, team.get("name"), driver.get("name"))] = plan
+    return results
+
+
+def dominance_report(results):
+    """Share of entries using each plan signature, most common first."""
+    counts = Counter(plan.signature for plan in results.values())
+    total = sum(counts.values()) or 1
+    return [(sig, n / total) for sig, n in counts.most_common()]
+
+
+def dominant_strategy(results, share=DOMINANCE_SHARE):
+    report = dominance_report(results)
+    if report and report[0][1] >= share:
+        return report[0][0]
+    return None
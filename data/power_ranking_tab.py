@@ -0,0 +1,57 @@
+# power_ranking_tab.py
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView
+)
+from utils import add_save_listener
+from team_strength import get_team_strength, COMPONENTS
+
+INPUT_FILES = ("teams", "engines", "tyre_suppliers", "drivers", "staff")
+
+
+class PowerRankingTab(QWidget):
+    """Live ranking of the active teams by effective pace (see team_strength.py)."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.model = get_team_strength()
+        self.shown = None  # ranking currently in the table
+
+        layout = QVBoxLayout(self)
+        self.setLayout(layout)
+
+        self.status = QLabel("Lap-time delta in seconds per component; lower is faster.")
+        layout.addWidget(self.status)
+
+        self.table = QTableWidget()
+        headers = ["Rank", "Team"] + [c.capitalize() for c in COMPONENTS] + ["Total"]
+        self.table.setColumnCount(len(headers))
+        self.table.setHorizontalHeaderLabels(headers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.verticalHeader().setVisible(False)
+        layout.addWidget(self.table)
+
+        # the model registered its own listener first, so it is current here
+        add_save_listener(self.on_record_saved)
+        self.refresh()
+
+    def on_record_saved(self, name, old, new):
+        if name in INPUT_FILES:
+            self.refresh()
+
+    def refresh(self):
+        ranking = self.model.ranking()
+        # the memoized ranking is the same object until an input below it changes
+        if ranking is self.shown:
+            return
+        self.shown = ranking
+        self.table.setRowCount(len(ranking))
+        for r, (team, breakdown) in enumerate(ranking):
+            values = [str(r + 1), team] + [f"{breakdown[c]:+.3f}" for c in COMPONENTS]
+            values.append(f"{breakdown['total']:+.3f}")
+            for col, value in enumerate(values):
+                item = self.table.item(r, col)
+                if item is None:
+                    self.table.setItem(r, col, QTableWidgetItem(value))
+                elif item.text() != value:
+                    item.setText(value)
@@ -0,0 +1,171 @@
+# profiles.py
+import re
+
+from utils import (
+    BASE_DIR, DATA_DIR, TAB_FILES, FILE_NAMES, read_json_file, write_json_file,
+    split_records, join_records, set_active_profile, notify_reloaded, file_stamp,
+    flush_writes
+)
+
+MODS_DIR = BASE_DIR / "mods"
+PROFILE_FILE = "profile.json"
+OVERLAY_SUFFIX = ".overlay.json"
+
+
+# --------------------
+# Parsed file cache
+# --------------------
+_parsed = {}
+
+def _load(path):
+    """Parse a file once per content stamp and keep it for every later lookup."""
+    stamp = file_stamp(path)
+    if stamp is None:
+        return None
+    cached = _parsed.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, read_json_file(path))
+        _parsed[path] = cached
+    return cached[1]
+
+
+def _clone(value):
+    """Structural copy of JSON data (much cheaper than deepcopy)."""
+    if isinstance(value, dict):
+        return {k: _clone(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_clone(v) for v in value]
+    return value
+
+
+# --------------------
+# Profiles
+# --------------------
+class Profile:
+    """A mod layer: record-level overrides, additions and deletions over a parent.
+
+    Only the changed records are stored, one overlay file per data file:
+    {"set": {key: record}, "delete": [key, ...]}. Resolved views are built
+    lazily per file and memoized until a layer in the chain changes.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.dir = MODS_DIR / name
+        meta = _load(self.dir / PROFILE_FILE) or {}
+        self.parent_name = meta.get("parent") if isinstance(meta, dict) else None
+        self._resolved = {}
+
+    @property
+    def parent(self):
+        return get_profile(self.parent_name) if self.parent_name else None
+
+    def chain(self):
+        profile, seen = self, []
+        while profile is not None and profile.name not in seen:
+            seen.append(profile.name)
+            yield profile
+            profile = profile.parent
+
+    def overlay_path(self, filename):
+        return self.dir / (filename + OVERLAY_SUFFIX)
+
+    def overlay(self, filename):
+        return _load(self.overlay_path(filename)) or {"set": {}, "delete": []}
+
+    # --------------------
+    # Resolution
+    # --------------------
+    def _stamp(self, filename):
+        paths = [DATA_DIR / filename] + [p.overlay_path(filename) for p in self.chain()]
+        return tuple(file_stamp(p) for p in paths)
+
+    def resolved_records(self, filename):
+        """{key: record} view of a file through every layer; shared, do not mutate."""
+        stamp = self._stamp(filename)
+        cached = self._resolved.get(filename)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        name = FILE_NAMES.get(filename, filename)
+        if self.parent is not None:
+            records = dict(self.parent.resolved_records(filename))
+        else:
+            records = split_records(name, _load(DATA_DIR / filename) or [])
+        overlay = self.overlay(filename)
+        for key in overlay.get("delete", []):
+            records.pop(key, None)
+        records.update(overlay.get("set", {}))
+
+        self._resolved[filename] = (stamp, records)
+        return records
+
+    def read(self, filename):
+        name = FILE_NAMES.get(filename, filename)
+        return _clone(join_records(name, self.resolved_records(filename)))
+
+    def write(self, filename, data):
+        """Store only the records that differ from the parent layer."""
+        name = FILE_NAMES.get(filename, filename)
+        if self.parent is not None:
+            below = self.parent.resolved_records(filename)
+        else:
+            below = split_records(name, _load(DATA_DIR / filename) or [])
+        records = split_records(name, data)
+
+        overlay = {
+            "set": {k: v for k, v in records.items() if below.get(k, _MISSING) != v},
+            "delete": [k for k in below if k not in records],
+        }
+        self.dir.mkdir(parents=True, exist_ok=True)
+        write_json_file(self.overlay_path(filename), overlay)
+
+    def disk_usage(self):
+        return sum(p.stat().st_size for p in self.dir.glob("*") if p.is_file())
+
+
+_MISSING = object()
+_profiles = {}
+
+
+def get_profile(name):
+    if name not in _profiles:
+        _profiles[name] = Profile(name)
+    return _profiles[name]
+
+
+def list_profiles():
+    if not MODS_DIR.exists():
+        return []
+    return sorted(p.parent.name for p in MODS_DIR.glob(f"*/{PROFILE_FILE}"))
+
+
+def create_profile(name, parent=None):
+    if not re.fullmatch(r"[\w\- ]+", name or ""):
+        raise ValueError(f"Invalid profile name: {name!r}")
+    folder = MODS_DIR / name
+    if (folder / PROFILE_FILE).exists():
+        raise ValueError(f"Profile '{name}' already exists")
+    folder.mkdir(parents=True, exist_ok=True)
+    write_json_file(folder / PROFILE_FILE, {"parent": parent})
+    # list_profiles looks for the file on disk
+    flush_writes([folder / PROFILE_FILE])
+    _profiles.pop(name, None)
+    return get_profile(name)
+
+
+def activate(name):
+    """Route read_json/write_json through a profile (None for the base data)."""
+    set_active_profile(get_profile(name) if name else None)
+    notify_reloaded()
+
+
+def export_resolved(name, out_dir):
+    """Write a profile's fully merged data as plain files, e.g. for the game."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    profile = get_profile(name)
+    paths = [out_dir / filename for filename in TAB_FILES.values()]
+    for path in paths:
+        write_json_file(path, profile.read(path.name))
+    # the files are meant for another program, so do not leave them pending
+    flush_writes(paths)
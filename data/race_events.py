@@ -0,0 +1,188 @@
+# race_events.py
+import heapq
+import sys
+
+import numpy as np
+
+from sim_models import get_compiled_models
+
+INCIDENT_KINDS = ("spin", "collision", "mech_dnf")
+
+# incidents that bring out the safety car
+SAFETY_CAR_TRIGGERS = ("collision", "mech_dnf")
+DEFAULT_SC_LAPS = 3
+
+
+class RaceEvent:
+    __slots__ = ("lap", "kind", "car", "extra_s")
+
+    def __init__(self, lap, kind, car=None, extra_s=0.0):
+        self.lap = lap
+        self.kind = kind
+        self.car = car
+        self.extra_s = extra_s
+
+    def __repr__(self):
+        return f"RaceEvent(lap={self.lap}, kind={self.kind!r}, car={self.car}, extra_s={self.extra_s:.2f})"
+
+
+class RaceTimeline:
+    def __init__(self, laps, cars, events, retired):
+        self.laps = laps
+        self.cars = cars
+        self.events = events  # sorted by lap
+        self.retired = retired  # car -> lap of retirement
+
+    def count(self, kind):
+        return sum(1 for e in self.events if e.kind == kind)
+
+    def counts(self):
+        return {kind: self.count(kind) for kind in INCIDENT_KINDS + ("pit_fail", "safety_car")}
+
+
+# --------------------
+# Event-driven mode
+# --------------------
+def simulate_race(model, cars, laps, pit_laps=None, rng=None, sc_laps=DEFAULT_SC_LAPS, sc_prob=1.0):
+    """Advance a heap of sampled events instead of rolling dice every lap.
+
+    The lap of each car's next incident of each kind is drawn from the
+    geometric distribution, so the work done scales with the number of
+    events rather than with laps x cars. `pit_laps` maps car -> laps on
+    which that car pits.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    probs = dict(zip(INCIDENT_KINDS, (model.spin_prob, model.collision_prob, model.dnf_prob)))
+
+    queue = []
+    seq = 0
+    for kind, p in probs.items():
+        if p <= 0:
+            continue
+        for car, lap in enumerate(rng.geometric(p, size=cars)):
+            if lap <= laps:
+                queue.append((int(lap), seq, kind, car))
+                seq += 1
+    for car, car_laps in (pit_laps or {}).items():
+        for lap in car_laps:
+            if 1 <= lap <= laps:
+                queue.append((lap, seq, "pit", car))
+                seq += 1
+    heapq.heapify(queue)
+
+    # pit stop failures are counted in stops rather than laps
+    stops_done = 0
+    next_fail = rng.geometric(model.pit_fail_prob) if model.pit_fail_prob > 0 else None
+
+    events = []
+    retired = {}
+    sc_until = 0
+    while queue:
+        lap, _, kind, car = heapq.heappop(queue)
+        if car is not None and car in retired and lap > retired[car]:
+            continue
+
+        if kind == "pit":
+            stops_done += 1
+            if next_fail is not None and stops_done == next_fail:
+                events.append(RaceEvent(lap, "pit_fail", car, rng.uniform(*model.pit_fail_extra)))
+                next_fail = stops_done + rng.geometric(model.pit_fail_prob)
+            continue
+
+        if kind == "safety_car":
+            events.append(RaceEvent(lap, "safety_car"))
+            continue
+
+        extra = rng.uniform(*model.spin_loss) if kind == "spin" else 0.0
+        events.append(RaceEvent(lap, kind, car, extra))
+
+        if kind == "mech_dnf":
+            retired[car] = lap
+        else:
+            nxt = lap + int(rng.geometric(probs[kind]))
+            if nxt <= laps:
+                heapq.heappush(queue, (nxt, seq, kind, car))
+                seq += 1
+
+        if kind in SAFETY_CAR_TRIGGERS and lap >= sc_until and rng.random() < sc_prob:
+            sc_until = lap + sc_laps
+            heapq.heappush(queue, (lap, seq, "safety_car", None))
+            seq += 1
+
+    return RaceTimeline(laps, cars, events, retired)
+
+
+# --------------------
+# Per-lap reference model
+# --------------------
+def simulate_race_per_lap(model, cars, laps, pit_laps=None, rng=None, sc_laps=DEFAULT_SC_LAPS, sc_prob=1.0):
+    """Reference model that rolls for every car on every lap."""
+    # without a seeded rng the masks come from the model's pre-drawn batch
+    masks = model.draw(laps, cars, rng)
+    rng = rng if rng is not None else np.random.default_rng()
+    pits_by_lap = {}
+    for car, car_laps in (pit_laps or {}).items():
+        for lap in car_laps:
+            pits_by_lap.setdefault(lap, []).append(car)
+
+    events = []
+    retired = {}
+    sc_until = 0
+    for lap in range(1, laps + 1):
+        spin, collision, dnf, spin_loss = masks.lap(lap - 1)
+        for car in pits_by_lap.get(lap, []):
+            if car not in retired and rng.random() < model.pit_fail_prob:
+                events.append(RaceEvent(lap, "pit_fail", car, rng.uniform(*model.pit_fail_extra)))
+        for car in range(cars):
+            if car in retired:
+                continue
+            if spin[car]:
+                events.append(RaceEvent(lap, "spin", car, spin_loss[car]))
+            for kind, hit in (("collision", collision[car]), ("mech_dnf", dnf[car])):
+                if not hit:
+                    continue
+                events.append(RaceEvent(lap, kind, car))
+                if lap >= sc_until and rng.random() < sc_prob:
+                    sc_until = lap + sc_laps
+                    events.append(RaceEvent(lap, "safety_car"))
+            if dnf[car]:
+                retired[car] = lap
+
+    return RaceTimeline(laps, cars, events, retired)
+
+
+# --------------------
+# Statistical check
+# --------------------
+def compare_models(model, cars=20, laps=60, races=2000, seed=0, pit_laps=None):
+    """Mean events per race for both modes, keyed by event kind."""
+    rng = np.random.default_rng(seed)
+    totals = {"event": {}, "per_lap": {}}
+    for mode, fn in (("event", simulate_race), ("per_lap", simulate_race_per_lap)):
+        for _ in range(races):
+            for kind, n in fn(model, cars, laps, pit_laps, rng).counts().items():
+                totals[mode][kind] = totals[mode].get(kind, 0) + n
+    return {mode: {k: v / races for k, v in counts.items()} for mode, counts in totals.items()}
+
+
+def check_against_per_lap(model, cars=20, laps=60, races=2000, seed=0, sigmas=4.0):
+    """True when every mean count agrees within `sigmas` standard errors."""
+    pit_laps = {car: [laps // 3, 2 * laps // 3] for car in range(cars)}
+    means = compare_models(model, cars, laps, races, seed, pit_laps)
+    ok = True
+    for kind, ev in means["event"].items():
+        pl = means["per_lap"].get(kind, 0.0)
+        # counts are roughly Poisson, so the variance of a mean is about mean / races
+        err = np.sqrt(max(ev + pl, 1e-9) / races)
+        if abs(ev - pl) > sigmas * err:
+            ok = False
+    return ok, means
+
+
+if __name__ == "__main__":
+    incident_model = get_compiled_models().incidents
+    passed, result = check_against_per_lap(incident_model)
+    for name, counts in result.items():
+        print(name, {k: round(v, 4) for k, v in counts.items()})
+    print("OK" if passed else "MISMATCH")
+    sys.exit(0 if passed else 1)
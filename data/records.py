@@ -0,0 +1,233 @@
+# records.py
+import math
+import re
+import sys
+import time
+import tracemalloc
+
+from utils import iter_records
+
+# Compact stand-ins for the dict records of the large list files. Each
+# class has a fixed set of slots instead of a per-record dict, repeated
+# strings (teams, roles, traits) are interned so every record shares one
+# copy, and numbers saved as text by the editor come back as numbers.
+#
+# Conversion is lossless otherwise: keys the class does not know about,
+# absent keys and the original key order all survive to_dict().
+
+_ORDERS = {}  # key order tuples, shared by every record with the same layout
+_TAGS = {}  # interned trait tuples
+
+
+def _keep(value):
+    return value
+
+
+def _category(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+# plain ASCII numbers only: no padding, underscores or other scripts' digits
+_INT = re.compile(r"[+-]?[0-9]+", re.ASCII)
+_FLOAT = re.compile(r"[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?", re.ASCII)
+
+
+def parse_number(value):
+    """int or float for numeric text, anything else unchanged."""
+    if type(value) is not str:
+        return value
+    if _INT.fullmatch(value):
+        return int(value)
+    if not _FLOAT.fullmatch(value):
+        return value
+    number = float(value)
+    return number if math.isfinite(number) else value
+
+
+def _tags(value):
+    if type(value) is not list:
+        return value
+    tags = tuple(_category(v) for v in value)
+    return _TAGS.setdefault(tags, tags)
+
+
+def _untag(value):
+    return list(value) if type(value) is tuple else value
+
+
+def _to_value(value):
+    return value.to_dict() if isinstance(value, Record) else value
+
+
+# (decode, encode) pairs for FIELDS
+TEXT = (_keep, _keep)
+CATEGORY = (_category, _keep)
+NUMBER = (parse_number, _keep)
+TAGS = (_tags, _untag)
+
+
+def nested(cls):
+    return (lambda value: cls.from_dict(value) if type(value) is dict else value, _to_value)
+
+
+class Record:
+    """Base for slotted records; subclasses list their FIELDS and matching __slots__."""
+
+    __slots__ = ("_order", "_extra")
+    FIELDS = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # plain values are stored as they are, without a call per field
+        cls._DECODERS = tuple((key, None if spec[0] is _keep else spec[0]) for key, spec in cls.FIELDS.items())
+
+    @classmethod
+    def from_dict(cls, data):
+        self = cls.__new__(cls)
+        get = data.get
+        for key, decode in cls._DECODERS:
+            value = get(key)
+            setattr(self, key, value if decode is None or value is None else decode(value))
+        if cls.FIELDS.keys() >= data.keys():
+            self._extra = None
+        else:
+            self._extra = {k: v for k, v in data.items() if k not in cls.FIELDS}
+        order = tuple(data)
+        self._order = _ORDERS.setdefault(order, order)
+        return self
+
+    def to_dict(self):
+        fields = self.FIELDS
+        out = {}
+        for key in self._order:
+            spec = fields.get(key)
+            out[key] = self._extra[key] if spec is None else spec[1](getattr(self, key))
+        # fields assigned after loading that the source record did not have
+        for key, spec in fields.items():
+            if key not in out:
+                value = getattr(self, key)
+                if value is not None:
+                    out[key] = spec[1](value)
+        return out
+
+    def get(self, key, default=None):
+        """dict-style access, so code written for the JSON records keeps working."""
+        if key in self.FIELDS:
+            value = getattr(self, key)
+            return default if value is None and key not in self._order else value
+        return (self._extra or {}).get(key, default)
+
+    def __eq__(self, other):
+        if not isinstance(other, Record):
+            return NotImplemented
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({getattr(self, 'name', None)!r})"
+
+
+class Contract(Record):
+    FIELDS = {
+        "team": CATEGORY, "length_weeks": NUMBER, "salary_m": NUMBER,
+        "start_week": NUMBER, "role": CATEGORY,
+    }
+    __slots__ = tuple(FIELDS)
+
+
+class History(Record):
+    FIELDS = {
+        "seasons": NUMBER, "championships": NUMBER, "wins": NUMBER,
+        "podiums": NUMBER, "poles": NUMBER,
+    }
+    __slots__ = tuple(FIELDS)
+
+
+class Driver(Record):
+    FIELDS = {
+        "name": TEXT, "team": CATEGORY, "number": NUMBER, "age": NUMBER, "talent": NUMBER,
+        "base_lap_time_sim": NUMBER, "cornering": NUMBER, "braking": NUMBER,
+        "consistency": NUMBER, "smoothness": NUMBER, "control": NUMBER,
+        "traits": TAGS, "trait": CATEGORY, "pay_driver_amount_m": NUMBER,
+        "history": nested(History), "contract": nested(Contract),
+    }
+    __slots__ = tuple(FIELDS)
+
+
+class Staff(Record):
+    FIELDS = {
+        "name": TEXT, "role": CATEGORY, "team": CATEGORY, "skill": NUMBER, "age": NUMBER,
+        "contract": nested(Contract),
+    }
+    __slots__ = tuple(FIELDS)
+
+
+class Team(Record):
+    FIELDS = {
+        "name": TEXT, "short_name": TEXT, "country": CATEGORY, "active": TEXT,
+        "color_rgb": TEXT, "budget_m": NUMBER, "team_pace": NUMBER, "attr": TEXT,
+        "tyre_management": NUMBER, "dirty_air_sensitivity": NUMBER, "prestige_base": NUMBER,
+        "history": nested(History), "engine": CATEGORY, "engine_contract_seasons": NUMBER,
+        "upgrades": TEXT, "headquarters": TEXT, "negotiation_points": NUMBER,
+        "tyre_contract": TEXT,
+    }
+    __slots__ = tuple(FIELDS)
+
+
+class Sponsor(Record):
+    FIELDS = {"name": TEXT, "rating": NUMBER, "amount_m": NUMBER}
+    __slots__ = tuple(FIELDS)
+
+
+RECORD_CLASSES = {"drivers": Driver, "staff": Staff, "teams": Team, "sponsors": Sponsor}
+
+
+def from_json(name, data):
+    cls = RECORD_CLASSES[name]
+    return [cls.from_dict(r) if type(r) is dict else r for r in data or []]
+
+
+def to_json(records):
+    return [r.to_dict() if isinstance(r, Record) else r for r in records]
+
+
+def load(name):
+    """Records of a list file, converted while streaming so the dicts never pile up."""
+    cls = RECORD_CLASSES[name]
+    return [cls.from_dict(r) if type(r) is dict else r for r in iter_records(name)]
+
+
+# --------------------
+# Comparison
+# --------------------
+def _measure(build):
+    tracemalloc.start()
+    t = time.perf_counter()
+    value = build()
+    elapsed = time.perf_counter() - t
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size, elapsed
+
+
+if __name__ == "__main__":
+    name = sys.argv[1] if len(sys.argv) > 1 else "drivers"
+    dicts, dict_bytes, _ = _measure(lambda: list(iter_records(name)))
+    recs, rec_bytes, _ = _measure(lambda: load(name))
+    n = max(len(dicts), 1)
+    print(f"{len(dicts)} {name}")
+    print(f"  dicts    {dict_bytes / n:8.0f} bytes/record")
+    print(f"  records  {rec_bytes / n:8.0f} bytes/record ({dict_bytes / max(rec_bytes, 1):.1f}x smaller)")
+
+    field = {"drivers": "talent", "staff": "skill", "teams": "budget_m", "sponsors": "amount_m"}[name]
+    t = time.perf_counter()
+    sum(parse_number(d.get(field)) or 0 for d in dicts)
+    dict_scan = time.perf_counter() - t
+    t = time.perf_counter()
+    sum(getattr(r, field) or 0 for r in recs)
+    rec_scan = time.perf_counter() - t
+    print(f"  scan {field}: dicts {dict_scan * 1000:.1f} ms, records {rec_scan * 1000:.1f} ms")
+
+    changed = sum(1 for d, r in zip(dicts, recs) if r.to_dict() != d)
+    print(f"  round trip: {changed} record(s) normalised (numeric text to numbers)")
@@ -4,7 +4,20 @@ from PyQt6.QtWidgets import (
     QLabel, QLineEdit, QPushButton, QMessageBox
 )
 from PyQt6.QtCore import Qt
-from utils import DATA_DIR, TAB_FILES, read_json, write_json, ACCENT, TEXT
+from utils import DATA_DIR, TAB_FILES, read_json, ACCENT, TEXT
+from dialogs import save_json
+from season_calendar import (
+    Calendar, SEASON_WEEKS, EMPTY, TEST, INVALID, BAD_ENTRY, PROBLEMS, parse_slot
+)
+
+# Fields are coloured through the "state" dynamic property, so an edit only
+# re-polishes the fields whose state changed instead of swapping stylesheets.
+FIELD_STYLE = """
+QLineEdit[state="empty"] { color: gray; }
+QLineEdit[state="ok"] { color: green; }
+QLineEdit[state="warning"] { color: orange; }
+QLineEdit[state="invalid"] { color: red; }
+"""
 
 
 class ScheduleTab(QWidget):
@@ -21,11 +34,18 @@ class ScheduleTab(QWidget):
         layout.addWidget(self.detail_area, 1)
 
         detail_widget = QWidget()
+        detail_widget.setStyleSheet(FIELD_STYLE)
         self.form_layout = QFormLayout(detail_widget)
         self.detail_area.setWidget(detail_widget)
 
         self.fields = []
         self.schedule_data = []
+        self.calendar = Calendar()
+        self.states = []  # (state, tooltip) shown per field
+
+        self.summary = QLabel("")
+        self.summary.setWordWrap(True)
+        layout.addWidget(self.summary)
 
         # Buttons
         self.save_btn = QPushButton("Save Schedule")
@@ -40,56 +60,74 @@ class ScheduleTab(QWidget):
         self.load_data()
 
     def load_data(self):
-        self.schedule_data = read_json(self.file) or [None] * 52
+        self.schedule_data = read_json(self.file, owner=self) or [None] * SEASON_WEEKS
+        self.calendar = Calendar.from_schedule(self.schedule_data)
+        seasons = len(self.calendar.slots)
 
         # Clear old fields
         while self.form_layout.rowCount():
             self.form_layout.removeRow(0)
         self.fields = []
+        self.states = []
 
-        for week, race in enumerate(self.schedule_data, start=1):
-            lbl = QLabel(f"Week {week}")
+        for i, race in enumerate(self.schedule_data):
+            season, week = divmod(i, SEASON_WEEKS)
+            text = f"Week {week + 1}" if seasons == 1 else f"Season {season + 1}, Week {week + 1}"
+            lbl = QLabel(text)
             lbl.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
 
             field = QLineEdit()
             field.setText("" if race is None else str(race))
-            field.textChanged.connect(lambda text, f=field: self.validate_input(f, text))
+            field.textChanged.connect(lambda text, i=i: self.validate_input(i, text))
             self.form_layout.addRow(lbl, field)
             self.fields.append(field)
-
-    def validate_input(self, field: QLineEdit, text: str):
-        text = text.strip().lower()
-
-        if text in ("", "null"):
-            field.setStyleSheet("color: gray;")
-            return
-        elif text == "test":
-            field.setStyleSheet("color: green;")
-            return
-        elif len(text) == 3 and text.isalpha():
-            field.setStyleSheet("color: green;")
-            return
-        else:
-            field.setStyleSheet("color: red;")
-
-        # force lowercase
-        if text != field.text():
-            field.setText(text)
+            self.states.append(None)
+        self.update_checks()
+
+    def validate_input(self, index, text):
+        self.calendar.set(index // SEASON_WEEKS, index % SEASON_WEEKS, text)
+        self.update_checks()
+
+    def update_checks(self):
+        """Run the calendar rules and restyle only the fields whose result changed."""
+        flags = self.calendar.problems().ravel()
+        slots = self.calendar.slots.ravel()
+        for i, field in enumerate(self.fields):
+            flag = int(flags[i])
+            if flag & BAD_ENTRY:
+                state = "invalid"
+            elif flag:
+                state = "warning"
+            elif slots[i] == EMPTY:
+                state = "empty"
+            else:
+                state = "ok"
+            tooltip = "; ".join(text for bit, text in PROBLEMS.items() if flag & bit)
+            if self.states[i] == (state, tooltip):
+                continue
+            self.states[i] = (state, tooltip)
+            field.setProperty("state", state)
+            field.setToolTip(tooltip)
+            field.style().unpolish(field)
+            field.style().polish(field)
+
+        counts = self.calendar.race_counts()
+        tests = (self.calendar.slots == TEST).sum(axis=1)
+        problems = int((flags != 0).sum())
+        parts = [f"Season {s + 1}: {n} races, {t} test weeks" for s, (n, t) in enumerate(zip(counts, tests))]
+        parts.append(f"{problems} week(s) need attention" if problems else "No calendar problems")
+        self.summary.setText(" | ".join(parts))
 
     def save_schedule(self):
         new_schedule = []
         for field in self.fields:
-            val = field.text().strip().lower()
-            if val in ("", "null"):
-                new_schedule.append(None)
-            elif val == "test":
-                new_schedule.append("test")
-            elif len(val) == 3 and val.isalpha():
-                new_schedule.append(val)
-            else:
-                QMessageBox.warning(self, "Invalid Input", f"Invalid entry: {val}")
+            entry = parse_slot(field.text())
+            if entry is INVALID:
+                QMessageBox.warning(self, "Invalid Input", f"Invalid entry: {field.text().strip().lower()}")
                 return
+            new_schedule.append(entry)
 
-        write_json(self.file, new_schedule)
+        if not save_json(self, self.file, new_schedule):
+            return
         QMessageBox.information(self, "Saved", "Schedule updated successfully!")
 
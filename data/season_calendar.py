@@ -0,0 +1,168 @@
+# season_calendar.py
+import sys
+
+import numpy as np
+
+from utils import DATA_DIR, TAB_FILES, read_json
+
+SEASON_WEEKS = 52
+
+# Slot codes: 0 empty, 1 test, 2.. tracks, -1 anything unreadable.
+EMPTY, TEST, INVALID = 0, 1, -1
+FIRST_TRACK = 2
+
+# Calendar rules
+MIN_GAP = 2  # weeks from one race to the next; 2 leaves a free week between races
+MAX_RUN = 3  # longest run of races in consecutive weeks
+MIN_TESTS = 1  # test weeks before the first race of a season
+
+# Problem flags, per slot
+BAD_ENTRY = 1
+DUPLICATE = 2
+TOO_CLOSE = 4
+LONG_RUN = 8
+NO_TEST = 16
+
+PROBLEMS = {
+    BAD_ENTRY: "not a track code, 'test' or empty",
+    DUPLICATE: "track already raced this season",
+    TOO_CLOSE: f"less than {MIN_GAP} week(s) after the previous race",
+    LONG_RUN: f"more than {MAX_RUN} races in a row",
+    NO_TEST: f"fewer than {MIN_TESTS} test week(s) before the first race",
+}
+
+
+def parse_slot(value):
+    """Normalised schedule entry (None, "test" or a track code), or INVALID."""
+    text = "" if value is None else str(value).strip().lower()
+    if text in ("", "null"):
+        return None
+    if text == "test" or (len(text) == 3 and text.isalpha()):
+        return text
+    return INVALID
+
+
+class Calendar:
+    """Seasons of weekly slots as an integer-coded (seasons, weeks) array.
+
+    Track codes map to small integers through `tracks`, so every rule is a
+    few whole-array operations however many seasons there are.
+    """
+
+    def __init__(self, seasons=1, weeks=SEASON_WEEKS):
+        self.weeks = weeks
+        self.slots = np.zeros((seasons, weeks), dtype=np.int16)
+        self.tracks = [None, "test"]  # code -> entry
+        self.codes = {None: EMPTY, "test": TEST}
+        self.raw = {}  # (season, week) -> text of INVALID slots, kept for saving
+
+    @classmethod
+    def from_schedule(cls, schedule, weeks=SEASON_WEEKS):
+        """A flat schedule list; every `weeks` entries are one season."""
+        schedule = list(schedule or [])
+        calendar = cls(max(1, -(-len(schedule) // weeks)), weeks)
+        for i, value in enumerate(schedule):
+            calendar.set(i // weeks, i % weeks, value)
+        return calendar
+
+    @classmethod
+    def from_files(cls):
+        return cls.from_schedule(read_json(DATA_DIR / TAB_FILES["schedule"]) or [])
+
+    def code(self, entry):
+        if entry not in self.codes:
+            self._compact()
+            self.codes[entry] = len(self.tracks)
+            self.tracks.append(entry)
+        return self.codes[entry]
+
+    def _compact(self):
+        """Drop track codes no slot uses any more, so edits do not grow `tracks`."""
+        used = np.unique(self.slots[self.slots >= FIRST_TRACK])
+        if len(used) == len(self.tracks) - FIRST_TRACK:
+            return
+        remap = np.zeros(len(self.tracks), dtype=np.int16)
+        remap[:FIRST_TRACK] = [EMPTY, TEST]
+        remap[used] = np.arange(FIRST_TRACK, FIRST_TRACK + len(used))
+        valid = self.slots != INVALID
+        self.slots[valid] = remap[self.slots[valid]]
+        self.tracks = self.tracks[:FIRST_TRACK] + [self.tracks[c] for c in used]
+        self.codes = {entry: code for code, entry in enumerate(self.tracks)}
+
+    def set(self, season, week, value):
+        entry = parse_slot(value)
+        if entry is INVALID:
+            self.raw[season, week] = value
+            self.slots[season, week] = INVALID
+        else:
+            self.raw.pop((season, week), None)
+            self.slots[season, week] = self.code(entry)
+
+    def to_schedule(self):
+        out = []
+        for (season, week), code in np.ndenumerate(self.slots):
+            out.append(self.raw.get((season, week)) if code == INVALID else self.tracks[code])
+        return out
+
+    # --------------------
+    # Checks
+    # --------------------
+    def race_counts(self):
+        return (self.slots >= FIRST_TRACK).sum(axis=1)
+
+    def problems(self):
+        """(seasons, weeks) array of problem flags, 0 where a slot is fine."""
+        slots = self.slots
+        seasons, weeks = slots.shape
+        races = slots >= FIRST_TRACK
+        flags = np.where(slots == INVALID, BAD_ENTRY, 0).astype(np.uint8)
+
+        season_of, week_of = np.nonzero(races)  # row-major, so ordered by season then week
+        if len(season_of):
+            # duplicates: count each (season, track) pair, numbering only the tracks in use
+            used, track_of = np.unique(slots[season_of, week_of], return_inverse=True)
+            keys = season_of * len(used) + track_of
+            counts = np.bincount(keys)
+            flags[season_of, week_of] |= np.where(counts[keys] > 1, DUPLICATE, 0).astype(np.uint8)
+
+            # gaps between consecutive races of the same season
+            same = season_of[1:] == season_of[:-1]
+            close = same & (np.diff(week_of) < MIN_GAP)
+            flags[season_of[1:][close], week_of[1:][close]] |= TOO_CLOSE
+
+        # runs of back-to-back races: label each run, then measure it
+        padded = np.zeros((seasons, weeks + 1), dtype=bool)
+        padded[:, :weeks] = races
+        flat = padded.ravel()
+        starts = flat & ~np.concatenate(([False], flat[:-1]))
+        run_id = np.cumsum(starts) * flat
+        lengths = np.bincount(run_id)
+        long_run = flat & (lengths[run_id] > MAX_RUN)
+        flags |= np.where(long_run.reshape(seasons, weeks + 1)[:, :weeks], LONG_RUN, 0).astype(np.uint8)
+
+        # test weeks before each season's first race
+        has_race = races.any(axis=1)
+        first = np.where(has_race, races.argmax(axis=1), weeks)
+        before = np.arange(weeks) < first[:, None]
+        short = has_race & (((slots == TEST) & before).sum(axis=1) < MIN_TESTS)
+        flags[short, first[short]] |= NO_TEST
+        return flags
+
+    def report(self):
+        """Text lines: races per season, then every problem by week."""
+        flags = self.problems()
+        lines = [f"Season {s + 1}: {n} races" for s, n in enumerate(self.race_counts())]
+        for season, week in zip(*np.nonzero(flags)):
+            reasons = "; ".join(text for bit, text in PROBLEMS.items() if flags[season, week] & bit)
+            lines.append(f"Season {season + 1}, week {week + 1}: {reasons}")
+        return lines
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from serialization import load
+        from pathlib import Path
+        calendar = Calendar.from_schedule(load(Path(sys.argv[1])))
+    else:
+        calendar = Calendar.from_files()
+    print("\n".join(calendar.report()))
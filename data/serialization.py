@@ -0,0 +1,203 @@
+# serialization.py
+import json
+import os
+import sys
+import time
+import zlib
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # optional accelerated backend
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional binary backend
+    msgpack = None
+
+# Data files keep their .json names whatever the codec. Binary codecs start
+# with a magic prefix so any file can be read back without knowing which
+# codec wrote it; everything else is treated as JSON text.
+CODEC_ENV = "TP_DATA_CODEC"
+
+
+class Codec:
+    name = ""
+    magic = b""
+
+    def dumps(self, data) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, raw: bytes):
+        raise NotImplementedError
+
+
+class JsonCodec(Codec):
+    """Stdlib JSON, pretty (indent=2, the historical format) or compact."""
+
+    def __init__(self, pretty=True):
+        self.pretty = pretty
+        self.name = "json" if pretty else "json-compact"
+
+    def dumps(self, data):
+        if self.pretty:
+            text = json.dumps(data, indent=2, ensure_ascii=False)
+        else:
+            text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        return text.encode("utf-8")
+
+    def loads(self, raw):
+        return json.loads(raw.decode("utf-8-sig"))
+
+
+class OrjsonCodec(Codec):
+    def __init__(self, pretty=True):
+        self.pretty = pretty
+        self.name = "orjson" if pretty else "orjson-compact"
+
+    def dumps(self, data):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if self.pretty else 0)
+
+    def loads(self, raw):
+        return orjson.loads(raw)
+
+
+class ZlibJsonCodec(Codec):
+    """Compact JSON, deflated. Needs nothing outside the stdlib."""
+
+    name = "json-zlib"
+    magic = b"TPZ1"
+
+    def dumps(self, data):
+        return self.magic + zlib.compress(JsonCodec(pretty=False).dumps(data), 6)
+
+    def loads(self, raw):
+        return _decode_json(zlib.decompress(raw[len(self.magic):]))
+
+
+class MsgpackCodec(Codec):
+    name = "msgpack"
+    magic = b"TPM1"
+
+    def dumps(self, data):
+        return self.magic + msgpack.packb(data, use_bin_type=True)
+
+    def loads(self, raw):
+        return msgpack.unpackb(raw[len(self.magic):], raw=False, strict_map_key=False)
+
+
+# --------------------
+# Registry
+# --------------------
+CODECS = {}
+
+def register_codec(codec):
+    CODECS[codec.name] = codec
+
+register_codec(JsonCodec(pretty=True))
+register_codec(JsonCodec(pretty=False))
+register_codec(ZlibJsonCodec())
+if orjson is not None:
+    register_codec(OrjsonCodec(pretty=True))
+    register_codec(OrjsonCodec(pretty=False))
+if msgpack is not None:
+    register_codec(MsgpackCodec())
+
+_write_codec = CODECS.get(os.environ.get(CODEC_ENV, ""), CODECS["json"])
+
+def set_codec(name):
+    """Codec used for every write from now on; reads detect the format."""
+    global _write_codec
+    if name not in CODECS:
+        raise ValueError(f"Unknown codec {name!r}, available: {', '.join(CODECS)}")
+    _write_codec = CODECS[name]
+
+def get_codec():
+    return _write_codec
+
+
+def _decode_json(raw):
+    # the fast backend when there is one; the stdlib also takes what orjson rejects
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw.decode("utf-8-sig"))
+
+
+def codec_for(raw: bytes):
+    """Codec that wrote `raw`, or None for JSON text."""
+    for codec in CODECS.values():
+        if codec.magic and raw.startswith(codec.magic):
+            return codec
+    return None
+
+
+def loads(raw: bytes):
+    codec = codec_for(raw)
+    return codec.loads(raw) if codec else _decode_json(raw)
+
+
+def dumps(data, codec=None) -> bytes:
+    return (codec or _write_codec).dumps(data)
+
+
+def canonical(data) -> bytes:
+    """Compact, key-sorted JSON, for comparing records rather than storing them."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def is_text(path: Path):
+    """True if the file holds JSON text (and can be streamed with iter_json_array)."""
+    with open(path, "rb") as f:
+        head = f.read(8)
+    return codec_for(head) is None
+
+
+def load(path: Path):
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def dump(path: Path, data, codec=None):
+    with open(path, "wb") as f:
+        f.write(dumps(data, codec))
+
+
+# --------------------
+# Benchmark
+# --------------------
+def benchmark(paths, repeat=3):
+    """{file: {codec: (encode s, decode s, bytes)}}, best of `repeat` runs."""
+    results = {}
+    for path in paths:
+        data = load(path)
+        results[path.name] = {}
+        for codec in CODECS.values():
+            enc = dec = float("inf")
+            for _ in range(repeat):
+                t = time.perf_counter()
+                raw = codec.dumps(data)
+                enc = min(enc, time.perf_counter() - t)
+                t = time.perf_counter()
+                codec.loads(raw)
+                dec = min(dec, time.perf_counter() - t)
+            results[path.name][codec.name] = (enc, dec, len(raw))
+    return results
+
+
+if __name__ == "__main__":
+    from utils import DATA_DIR
+
+    if len(sys.argv) > 1:
+        files = [Path(p) for p in sys.argv[1:]]
+    else:
+        files = sorted(DATA_DIR.glob("*.json"), key=lambda p: p.stat().st_size, reverse=True)[:3]
+    for filename, by_codec in benchmark(files).items():
+        print(filename)
+        for name, (enc, dec, size) in sorted(by_codec.items(), key=lambda kv: kv[1][1]):
+            print(f"  {name:16} encode {enc * 1000:9.2f} ms  decode {dec * 1000:9.2f} ms  {size:>12} bytes")
@@ -0,0 +1,186 @@
+# sim_models.py
+from copy import deepcopy
+
+import numpy as np
+
+from utils import DATA_DIR, TAB_FILES, read_json
+
+# gap resolution (s) of the dirty air lookup table
+DIRTY_AIR_STEP = 0.001
+
+# incident masks drawn ahead per batch, each big enough for one race
+MASK_BATCH_RACES = 32
+MASK_LAPS = 80
+MASK_CARS = 26
+
+# config sections each compiled model is built from
+MODEL_SECTIONS = {
+    "dirty_air": ("dirty_air",),
+    "incidents": ("incidents", "pitstops"),
+}
+
+
+# --------------------
+# Dirty air
+# --------------------
+class DirtyAirModel:
+    """Dirty air curve compiled into a flat lookup table over gap."""
+
+    def __init__(self, section):
+        section = section or {}
+        self.enabled = bool(section.get("enabled", True))
+        self.max_stack = max(1, int(section.get("max_stack", 1)))
+        self.stack_decay = float(section.get("stack_decay", 0.0))
+
+        curve = sorted(section.get("curve") or [], key=lambda p: p["gap"])
+        if not curve or not self.enabled:
+            self.table = np.ones(1)
+            self.max_gap = 0.0
+        else:
+            gaps = np.array([p["gap"] for p in curve], dtype=float)
+            mults = np.array([p["mult"] for p in curve], dtype=float)
+            self.max_gap = float(gaps[-1])
+            grid = np.arange(0.0, self.max_gap + DIRTY_AIR_STEP, DIRTY_AIR_STEP)
+            self.table = np.interp(grid, gaps, mults)
+
+        # weight of the k-th car ahead when stacking
+        self.stack_weights = self.stack_decay ** np.arange(self.max_stack)
+
+    def multiplier(self, gaps):
+        """Lap time multiplier for each gap (s) to the car directly ahead."""
+        idx = np.asarray(gaps, dtype=float) * (1.0 / DIRTY_AIR_STEP)
+        idx = np.clip(idx, 0, len(self.table) - 1).astype(np.intp)
+        return self.table[idx]
+
+    def stacked_multiplier(self, gaps_ahead):
+        """Combined multiplier from a (cars, k) matrix of gaps to the cars ahead.
+
+        Gaps are sorted nearest first; use inf where there is no car.
+        """
+        gaps_ahead = np.asarray(gaps_ahead, dtype=float)
+        if gaps_ahead.ndim == 1:
+            gaps_ahead = gaps_ahead[:, None]
+        k = min(self.max_stack, gaps_ahead.shape[1])
+        excess = self.multiplier(gaps_ahead[:, :k]) - 1.0
+        return 1.0 + excess @ self.stack_weights[:k]
+
+
+# --------------------
+# Incidents
+# --------------------
+class IncidentModel:
+    """Per-lap incident probabilities with pre-drawn random event masks.
+
+    Masks for MASK_BATCH_RACES races are drawn in one go when the model is
+    compiled and again whenever they run out; each is handed out once.
+    """
+
+    def __init__(self, incidents, pitstops):
+        incidents = incidents or {}
+        pitstops = pitstops or {}
+        self.spin_prob = float(incidents.get("spin_prob_per_lap", 0.0))
+        self.collision_prob = float(incidents.get("collision_prob_per_lap", 0.0))
+        self.dnf_prob = float(incidents.get("mech_dnf_prob_per_lap", 0.0))
+        self.spin_loss = tuple(incidents.get("spin_loss_s") or (0.0, 0.0))
+        self.pit_fail_prob = float(pitstops.get("fail_prob", 0.0))
+        self.pit_fail_extra = tuple(pitstops.get("fail_extra_s") or (0.0, 0.0))
+
+        self.probs = np.array([self.spin_prob, self.collision_prob, self.dnf_prob])
+        self.ready = []  # pre-drawn IncidentMasks of MASK_LAPS x MASK_CARS
+
+    def predraw(self, races=MASK_BATCH_RACES, rng=None):
+        rng = rng if rng is not None else np.random.default_rng()
+        hits = rng.random((races, 3, MASK_LAPS, MASK_CARS)) < self.probs[None, :, None, None]
+        losses = np.where(hits[:, 0], rng.uniform(*self.spin_loss, size=(races, MASK_LAPS, MASK_CARS)), 0.0)
+        self.ready.extend(IncidentMasks(h[0], h[1], h[2], loss) for h, loss in zip(hits, losses))
+
+    def draw(self, laps, cars, rng=None):
+        """Masks of shape (laps, cars) for spins, collisions and DNFs.
+
+        Without an rng they come from the pre-drawn batch; a seeded rng
+        always draws fresh so results stay reproducible.
+        """
+        if rng is None and laps <= MASK_LAPS and cars <= MASK_CARS:
+            if not self.ready:
+                self.predraw()
+            return self.ready.pop().cropped(laps, cars)
+        rng = rng if rng is not None else np.random.default_rng()
+        hits = rng.random((3, laps, cars)) < self.probs[:, None, None]
+        spin_loss = np.where(hits[0], rng.uniform(*self.spin_loss, size=(laps, cars)), 0.0)
+        return IncidentMasks(hits[0], hits[1], hits[2], spin_loss)
+
+    def draw_pit_failures(self, stops, rng=None):
+        """Extra seconds lost on each of `stops` pit stops (0 where the stop went fine)."""
+        rng = rng if rng is not None else np.random.default_rng()
+        failed = rng.random(stops) < self.pit_fail_prob
+        return np.where(failed, rng.uniform(*self.pit_fail_extra, size=stops), 0.0)
+
+
+class IncidentMasks:
+    def __init__(self, spin, collision, dnf, spin_loss):
+        self.spin = spin
+        self.collision = collision
+        self.dnf = dnf
+        self.spin_loss = spin_loss
+
+    def lap(self, lap):
+        return self.spin[lap], self.collision[lap], self.dnf[lap], self.spin_loss[lap]
+
+    def cropped(self, laps, cars):
+        return IncidentMasks(self.spin[:laps, :cars], self.collision[:laps, :cars],
+                             self.dnf[:laps, :cars], self.spin_loss[:laps, :cars])
+
+
+# --------------------
+# Compiled set
+# --------------------
+class CompiledModels:
+    """Holds every compiled model and rebuilds only those a config edit touches."""
+
+    def __init__(self, config):
+        self.config = deepcopy(config or {})
+        self.dirty_air = None
+        self.incidents = None
+        for name in MODEL_SECTIONS:
+            self.compile(name)
+
+    def compile(self, name):
+        if name == "dirty_air":
+            self.dirty_air = DirtyAirModel(self.config.get("dirty_air"))
+        elif name == "incidents":
+            self.incidents = IncidentModel(self.config.get("incidents"), self.config.get("pitstops"))
+            self.incidents.predraw()
+
+    def update_section(self, section_key, section_data):
+        """Store an edited section; returns the names of the models recompiled."""
+        if self.config.get(section_key) == section_data:
+            return []
+        self.config[section_key] = deepcopy(section_data)
+        rebuilt = [name for name, sections in MODEL_SECTIONS.items() if section_key in sections]
+        for name in rebuilt:
+            self.compile(name)
+        return rebuilt
+
+    def update_config(self, config):
+        """Take a whole reloaded config; returns the names of the models recompiled."""
+        config = config or {}
+        rebuilt = []
+        for key in [k for k in self.config if k not in config]:
+            del self.config[key]
+            rebuilt += [name for name, sections in MODEL_SECTIONS.items() if key in sections]
+        for name in dict.fromkeys(rebuilt):
+            self.compile(name)
+        for key, section_data in config.items():
+            rebuilt += self.update_section(key, section_data)
+        return list(dict.fromkeys(rebuilt))
+
+
+_models = None
+
+def get_compiled_models():
+    """Models compiled from the config file, shared by the config tab and the simulation."""
+    global _models
+    if _models is None:
+        _models = CompiledModels(read_json(DATA_DIR / TAB_FILES["config"]) or {})
+    return _models
+
@@ -0,0 +1,289 @@
+# snapshots.py
+import hashlib
+import json
+import struct
+import sys
+import time
+import zlib
+from pathlib import Path
+
+from utils import (
+    TAB_FILES, DATA_DIR, FILE_NAMES, read_json, read_json_file, write_json,
+    split_records, join_records, atomic_write_bytes, notify_reloaded
+)
+
+# kept with the data folder they snapshot, so TP_DATA_DIR folders each get their own
+SNAPSHOT_DIR = DATA_DIR / ".snapshots"
+
+# Layout of SNAPSHOT_DIR:
+#   objects.pack    append-only, zlib-compressed blobs back to back
+#   objects.idx     append-only entries: sha256 digest, u64 offset, u32 size
+#   snapshots.json  {"snapshots": [{id, time, label, files: {filename: hash}}],
+#                    "contents": {file content hash: manifest hash}}
+# Every record is one blob named by the hash of its compact JSON, and each
+# file in a snapshot is a manifest blob {"keys": [...], "hashes": [...]}.
+# Records and manifests that did not change are stored once and shared by
+# every snapshot that has them.
+INDEX_ENTRY = struct.Struct(">32sQI")
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def _encode(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _digest(raw):
+    return hashlib.sha256(raw).digest()
+
+
+class SnapshotStore:
+    def __init__(self, root: Path = SNAPSHOT_DIR):
+        self.root = root
+        self.pack_path = root / "objects.pack"
+        self.index_path = root / "objects.idx"
+        self.catalog_path = root / "snapshots.json"
+        self._index = None  # digest -> (offset, size)
+        self._catalog = None
+
+    # --------------------
+    # Objects
+    # --------------------
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = {}
+            if self.index_path.exists():
+                pack_size = self.pack_path.stat().st_size if self.pack_path.exists() else 0
+                raw = self.index_path.read_bytes()
+                usable = len(raw) - len(raw) % INDEX_ENTRY.size
+                for digest, offset, size in INDEX_ENTRY.iter_unpack(raw[:usable]):
+                    # entries past the end of the pack come from an interrupted write
+                    if offset + size <= pack_size:
+                        self._index[digest] = (offset, size)
+        return self._index
+
+    def _store(self, blobs):
+        """Append {digest: raw} blobs the store does not have yet; returns how many."""
+        new = [(d, raw) for d, raw in blobs.items() if d not in self.index]
+        if not new:
+            return 0
+        self.root.mkdir(parents=True, exist_ok=True)
+        entries = []
+        with open(self.pack_path, "ab") as pack:
+            offset = pack.tell()
+            for digest, raw in new:
+                blob = zlib.compress(raw, 6)
+                pack.write(blob)
+                entries.append((digest, offset, len(blob)))
+                offset += len(blob)
+        # the index is written after the pack, so it never points at missing data
+        with open(self.index_path, "ab") as idx:
+            for digest, offset, size in entries:
+                idx.write(INDEX_ENTRY.pack(digest, offset, size))
+                self.index[digest] = (offset, size)
+        return len(new)
+
+    def _load_many(self, digests, unsaved=None):
+        """[decoded value] for hex digests, reading the pack in offset order."""
+        wanted = []
+        out = [None] * len(digests)
+        for i, hexdigest in enumerate(digests):
+            digest = bytes.fromhex(hexdigest)
+            if unsaved and digest in unsaved:
+                out[i] = json.loads(unsaved[digest].decode("utf-8"))
+                continue
+            entry = self.index.get(digest)
+            if entry is None:
+                raise SnapshotError(f"Snapshot store is missing object {hexdigest[:12]}")
+            wanted.append((entry[0], entry[1], i))
+        with open(self.pack_path, "rb") as pack:
+            for offset, size, i in sorted(wanted):
+                pack.seek(offset)
+                try:
+                    out[i] = json.loads(zlib.decompress(pack.read(size)).decode("utf-8"))
+                except (zlib.error, ValueError) as e:
+                    raise SnapshotError(f"Snapshot store object {digests[i][:12]} is damaged: {e}") from e
+        return out
+
+    # --------------------
+    # Catalog
+    # --------------------
+    @property
+    def catalog(self):
+        if self._catalog is None:
+            data = read_json_file(self.catalog_path) if self.catalog_path.exists() else {}
+            self._catalog = data if isinstance(data, dict) else {}
+            self._catalog.setdefault("snapshots", [])
+            self._catalog.setdefault("contents", {})
+        return self._catalog
+
+    def _save_catalog(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(self.catalog_path, json.dumps(self.catalog, indent=2).encode("utf-8"))
+
+    def list(self):
+        """Snapshots, oldest first: [{"id", "time", "label", "files"}]."""
+        return list(self.catalog["snapshots"])
+
+    def get(self, snapshot_id):
+        for snap in self.catalog["snapshots"]:
+            if snap["id"] == snapshot_id:
+                return snap
+        raise SnapshotError(f"No snapshot {snapshot_id!r}")
+
+    # --------------------
+    # Taking snapshots
+    # --------------------
+    def _manifest(self, filename, blobs):
+        """Hash of the file's manifest, adding new record and manifest blobs to `blobs`."""
+        name = FILE_NAMES[filename]
+        data = read_json(DATA_DIR / filename, owner=self)
+        content = hashlib.sha256(_encode(data)).hexdigest()
+        known = self.catalog["contents"].get(content)
+        if known is not None and bytes.fromhex(known) in self.index:
+            return known, content
+
+        keys, hashes = [], []
+        for key, record in split_records(name, data).items():
+            raw = _encode(record)
+            digest = _digest(raw)
+            blobs.setdefault(digest, raw)
+            keys.append(key)
+            hashes.append(digest.hex())
+        raw = _encode({"keys": keys, "hashes": hashes})
+        digest = _digest(raw)
+        blobs.setdefault(digest, raw)
+        return digest.hex(), content
+
+    def take(self, label=""):
+        """Snapshot every TAB_FILES entry; returns (snapshot, number of new objects)."""
+        blobs, files, contents = {}, {}, {}
+        for filename in TAB_FILES.values():
+            files[filename], content = self._manifest(filename, blobs)
+            contents[content] = files[filename]
+        stored = self._store(blobs)
+
+        snap = {
+            "id": time.strftime("%Y%m%d-%H%M%S"),
+            "time": time.time(),
+            "label": label,
+            "files": files,
+        }
+        taken = {s["id"] for s in self.catalog["snapshots"]}
+        n = 2
+        while snap["id"] in taken:
+            snap["id"] = f"{time.strftime('%Y%m%d-%H%M%S')}-{n}"
+            n += 1
+        self.catalog["snapshots"].append(snap)
+        self.catalog["contents"].update(contents)
+        self._save_catalog()
+        return snap, stored
+
+    def current(self):
+        """The live data as an unsaved snapshot, for diffing against."""
+        blobs, files = {}, {}
+        for filename in TAB_FILES.values():
+            files[filename], _ = self._manifest(filename, blobs)
+        # blobs not in the store yet travel with the snapshot
+        return {"id": None, "time": time.time(), "label": "current data", "files": files, "unsaved": blobs}
+
+    # --------------------
+    # Reading back
+    # --------------------
+    def _file_manifest(self, snap, filename):
+        digest = snap["files"].get(filename)
+        if digest is None:
+            return {"keys": [], "hashes": []}
+        return self._load_many([digest], snap.get("unsaved"))[0]
+
+    def records(self, snap, filename, keys=None):
+        """{key: record} of one file in a snapshot, or of just `keys` in it."""
+        manifest = self._file_manifest(snap, filename)
+        pairs = zip(manifest["keys"], manifest["hashes"])
+        if keys is not None:
+            keys = set(keys)
+            pairs = [(k, h) for k, h in pairs if k in keys]
+        else:
+            pairs = list(pairs)
+        values = self._load_many([h for _, h in pairs], snap.get("unsaved"))
+        return {k: v for (k, _), v in zip(pairs, values)}
+
+    def file_data(self, snap, filename):
+        return join_records(FILE_NAMES[filename], self.records(snap, filename))
+
+    def diff(self, old, new):
+        """{filename: {"added": [keys], "removed": [keys], "changed": [keys]}} for files that differ.
+
+        Works on record hashes only; no record is decoded.
+        """
+        result = {}
+        for filename in TAB_FILES.values():
+            if old["files"].get(filename) == new["files"].get(filename):
+                continue
+            a = self._file_manifest(old, filename)
+            b = self._file_manifest(new, filename)
+            before = dict(zip(a["keys"], a["hashes"]))
+            after = dict(zip(b["keys"], b["hashes"]))
+            result[filename] = {
+                "added": [k for k in after if k not in before],
+                "removed": [k for k in before if k not in after],
+                "changed": [k for k in after if k in before and before[k] != after[k]],
+            }
+        return result
+
+    def restore(self, snap, only=None):
+        """Write a snapshot's files back (all, or the filenames in `only`).
+
+        The data being replaced is snapshotted first, so a restore can be undone.
+        """
+        before, _ = self.take(f"before restoring {snap['id']}")
+        # files that already match are left alone
+        names = [f for f in TAB_FILES.values()
+                 if (only is None or f in only) and snap["files"].get(f) != before["files"].get(f)]
+        data = {f: self.file_data(snap, f) for f in names}
+        try:
+            for filename in names:
+                write_json(DATA_DIR / filename, data[filename], owner=self)
+        finally:
+            # files written before a failure are in place; tabs should show them
+            notify_reloaded()
+        return names
+
+    def disk_usage(self):
+        return sum(p.stat().st_size for p in self.root.glob("*") if p.is_file())
+
+
+_store_instance = None
+
+def get_snapshot_store():
+    global _store_instance
+    if _store_instance is None:
+        _store_instance = SnapshotStore()
+    return _store_instance
+
+
+if __name__ == "__main__":
+    store = get_snapshot_store()
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if command == "take":
+        snap, stored = store.take(" ".join(sys.argv[2:]))
+        print(f"{snap['id']}: {stored} new object(s), store is {store.disk_usage()} bytes")
+    elif command == "diff" and len(sys.argv) > 2:
+        old = store.get(sys.argv[2])
+        new = store.get(sys.argv[3]) if len(sys.argv) > 3 else store.current()
+        for filename, d in store.diff(old, new).items():
+            print(f"{filename}: +{len(d['added'])} -{len(d['removed'])} ~{len(d['changed'])}")
+            for kind, sign in (("added", "+"), ("removed", "-"), ("changed", "~")):
+                for key in d[kind]:
+                    print(f"  {sign} {key}")
+    elif command == "restore" and len(sys.argv) > 2:
+        print("restored:", ", ".join(store.restore(store.get(sys.argv[2]), sys.argv[3:] or None)))
+    elif command == "list":
+        for snap in store.list():
+            print(f"{snap['id']:20} {time.strftime('%Y-%m-%d %H:%M', time.localtime(snap['time']))}  {snap['label']}")
+    else:
+        print("usage: snapshots.py list | take [LABEL] | diff ID [ID] | restore ID [file ...]")
+        sys.exit(2)
@@ -1,10 +1,13 @@
 # sponsors_tab.py
+from copy import deepcopy
+
 from PyQt6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QScrollArea, QFormLayout,
-    QLabel, QLineEdit, QListWidget, QPushButton, QMessageBox
+    QLineEdit, QListWidget, QPushButton, QMessageBox
 )
-from PyQt6.QtCore import Qt
-from utils import DATA_DIR, TAB_FILES, read_json, write_json, ACCENT, TEXT
+from form_builder import add_section_header
+from dialogs import import_csv_dialog, save_json
+from utils import DATA_DIR, TAB_FILES, read_json, notify_saved
 
 
 class SponsorsTab(QWidget):
@@ -20,8 +23,10 @@ class SponsorsTab(QWidget):
         left_layout = QVBoxLayout()
         self.list = QListWidget()
         self.add_btn = QPushButton("Add Sponsor")
+        self.import_btn = QPushButton("Import CSV")
         left_layout.addWidget(self.list)
         left_layout.addWidget(self.add_btn)
+        left_layout.addWidget(self.import_btn)
         layout.addLayout(left_layout, 1)
 
         # Right: scrollable form
@@ -42,21 +47,10 @@ class SponsorsTab(QWidget):
         # Connections
         self.list.currentRowChanged.connect(self.display_sponsor)
         self.add_btn.clicked.connect(self.add_sponsor)
+        self.import_btn.clicked.connect(lambda: import_csv_dialog(self, "sponsors"))
 
     def create_fields(self):
-        lbl = QLabel("Sponsor Details")
-        lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        lbl.setStyleSheet(f"""
-            font-weight: bold;
-            border: 1px solid {ACCENT};
-            padding: 4px;
-            margin-top: 8px;
-            margin-bottom: 4px;
-            border-radius: 4px;
-            background-color: #2f3436;
-            color: {TEXT};
-        """)
-        self.form_layout.addRow(lbl)
+        add_section_header(self.form_layout, "Sponsor Details")
 
         self.fields["name"] = QLineEdit()
         self.fields["rating"] = QLineEdit()
@@ -71,7 +65,7 @@ class SponsorsTab(QWidget):
         self.save_btn.clicked.connect(self.save_sponsor)
 
     def load_data(self):
-        self.sponsor_data = read_json(self.file) or []
+        self.sponsor_data = read_json(self.file, owner=self) or []
         self.list.clear()
         for s in self.sponsor_data:
             self.list.addItem(s.get("name", "Unnamed"))
@@ -89,12 +83,15 @@ class SponsorsTab(QWidget):
         if idx < 0:
             return
         sponsor = self.sponsor_data[idx]
+        old_sponsor = deepcopy(sponsor)
 
         sponsor["name"] = self.fields["name"].text()
         sponsor["rating"] = int(self.fields["rating"].text())
         sponsor["amount_m"] = float(self.fields["amount_m"].text())
 
-        write_json(self.file, self.sponsor_data)
+        if not save_json(self, self.file, self.sponsor_data):
+            return
+        notify_saved("sponsors", old_sponsor, sponsor)
         QMessageBox.information(self, "Saved", f"Sponsor {sponsor['name']} updated!")
         self.load_data()
         self.list.setCurrentRow(idx)
@@ -106,6 +103,8 @@ class SponsorsTab(QWidget):
             "amount_m": 10
         }
         self.sponsor_data.append(new_sponsor)
-        write_json(self.file, self.sponsor_data)
+        if not save_json(self, self.file, self.sponsor_data):
+            return
+        notify_saved("sponsors", None, new_sponsor)
         self.load_data()
         self.list.setCurrentRow(len(self.sponsor_data) - 1)
@@ -1,18 +1,14 @@
 # staff_tab.py
+from copy import deepcopy
+
 from PyQt6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QScrollArea, QFormLayout,
-    QLabel, QLineEdit, QListWidget, QPushButton, QComboBox, QMessageBox
+    QLineEdit, QListWidget, QPushButton, QComboBox, QMessageBox
 )
-from PyQt6.QtCore import Qt
-from utils import DATA_DIR, TAB_FILES, read_json, write_json, ACCENT, TEXT
-
-# mapping for nicer role names in the UI
-ROLE_DISPLAY = {
-    "technical_director": "Technical Director",
-    "chief_designer": "Chief Designer",
-    "head_of_dynamics": "Head of Dynamics",
-    "chief_mechanic": "Chief Mechanic"
-}
+from form_builder import add_section_header
+from dialogs import import_csv_dialog, save_json
+from utils import DATA_DIR, TAB_FILES, read_json, notify_saved, ROLE_DISPLAY
+
 DISPLAY_ROLE_TO_JSON = {v: k for k, v in ROLE_DISPLAY.items()}
 
 
@@ -28,8 +24,10 @@ class StaffTab(QWidget):
         left_layout = QVBoxLayout()
         self.list = QListWidget()
         self.add_btn = QPushButton("Add Staff")
+        self.import_btn = QPushButton("Import CSV")
         left_layout.addWidget(self.list)
         left_layout.addWidget(self.add_btn)
+        left_layout.addWidget(self.import_btn)
         layout.addLayout(left_layout, 1)
 
         # Right: scrollable form
@@ -50,24 +48,10 @@ class StaffTab(QWidget):
         # Connections
         self.list.currentRowChanged.connect(self.display_staff)
         self.add_btn.clicked.connect(self.add_staff)
-
-    def add_section_header(self, title):
-        lbl = QLabel(title)
-        lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        lbl.setStyleSheet(f"""
-            font-weight: bold;
-            border: 1px solid {ACCENT};
-            padding: 4px;
-            margin-top: 8px;
-            margin-bottom: 4px;
-            border-radius: 4px;
-            background-color: #2f3436;
-            color: {TEXT};
-        """)
-        self.form_layout.addRow(lbl)
+        self.import_btn.clicked.connect(lambda: import_csv_dialog(self, "staff"))
 
     def create_fields(self):
-        self.add_section_header("Staff Details")
+        add_section_header(self.form_layout, "Staff Details")
 
         self.fields["name"] = QLineEdit()
         self.fields["role"] = QComboBox()
@@ -80,7 +64,7 @@ class StaffTab(QWidget):
             label = key.replace("_", " ").capitalize()
             self.form_layout.addRow(label, self.fields[key])
 
-        self.add_section_header("Contract")
+        add_section_header(self.form_layout, "Contract")
 
         self.fields["contract_team"] = QLineEdit()
         self.fields["contract_length"] = QLineEdit()
@@ -96,7 +80,7 @@ class StaffTab(QWidget):
         self.save_btn.clicked.connect(self.save_staff)
 
     def load_data(self):
-        self.staff_data = read_json(self.file) or []
+        self.staff_data = read_json(self.file, owner=self) or []
         self.list.clear()
         for s in self.staff_data:
             self.list.addItem(s.get("name", "Unnamed"))
@@ -125,6 +109,7 @@ class StaffTab(QWidget):
         if idx < 0:
             return
         staff = self.staff_data[idx]
+        old_staff = deepcopy(staff)
 
         staff["name"] = self.fields["name"].text()
         staff["role"] = DISPLAY_ROLE_TO_JSON.get(
@@ -155,7 +140,9 @@ class StaffTab(QWidget):
             "start_week": safe_int(self.fields["contract_start"]),
         }
 
-        write_json(self.file, self.staff_data)
+        if not save_json(self, self.file, self.staff_data):
+            return
+        notify_saved("staff", old_staff, staff)
         QMessageBox.information(self, "Saved", f"Staff {staff['name']} updated!")
         self.load_data()
         self.list.setCurrentRow(idx)
@@ -175,6 +162,8 @@ class StaffTab(QWidget):
             },
         }
         self.staff_data.append(new_staff)
-        write_json(self.file, self.staff_data)
+        if not save_json(self, self.file, self.staff_data):
+            return
+        notify_saved("staff", None, new_staff)
         self.load_data()
         self.list.setCurrentRow(len(self.staff_data) - 1)
@@ -1,5 +1,6 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox
-from utils import TAB_FILES, DATA_DIR
+from utils import TAB_FILES, DATA_DIR, read_json, read_error
+from dialogs import save_json
 import json
 
 class TableTab(QWidget):
@@ -7,6 +8,7 @@ class TableTab(QWidget):
         super().__init__(parent)
         self.name = name
         self.file = DATA_DIR / TAB_FILES[name]
+        self.load_failed = False
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
 
@@ -51,11 +53,11 @@ class TableTab(QWidget):
             self.table.removeRow(r)
 
     def load_from_file(self):
-        try:
-            with open(self.file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to read {self.file.name}: {e}")
+        data = read_json(self.file, owner=self)
+        error = read_error(self.file)
+        self.load_failed = error is not None
+        if error is not None:
+            QMessageBox.critical(self, "Error", f"Failed to read {self.file.name}: {error}")
             return
 
         self.table.clearContents()
@@ -80,6 +82,10 @@ class TableTab(QWidget):
             self.table.setItem(r, 1, QTableWidgetItem(str(data)))
 
     def save_to_file(self):
+        if self.load_failed:
+            # the table does not hold the file's contents; saving would replace them
+            QMessageBox.warning(self, "Not Saved", f"{self.file.name} could not be read. Fix it and press Load first.")
+            return
         rows = []
         for r in range(self.table.rowCount()):
             key_item = self.table.item(r, 0)
@@ -95,12 +101,9 @@ class TableTab(QWidget):
         else:
             output = {k: self._try_parse_json_scalar(v) for k, v in rows if k != ""}
 
-        try:
-            with open(self.file, "w", encoding="utf-8") as f:
-                json.dump(output, f, indent=2, ensure_ascii=False)
-            QMessageBox.information(self, "Saved", f"Saved to {self.file}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save {self.file}: {e}")
+        if not save_json(self, self.file, output):
+            return
+        QMessageBox.information(self, "Saved", f"Saved to {self.file}")
 
     @staticmethod
     def _try_parse_json_scalar(s: str):
@@ -0,0 +1,261 @@
+# team_strength.py
+from utils import DATA_DIR, TAB_FILES, read_json, add_save_listener, add_reload_listener
+
+# Effective pace is a lap-time delta in seconds; lower is faster.
+UPGRADE_STEP = -0.03  # per upgrade level, any part
+HQ_WEIGHTS = {"wind_tunnel": -0.02, "test_track": -0.01, "engine_plant": -0.01}
+REFERENCE_TALENT = 80
+TALENT_WEIGHT = -0.01  # per talent point above the reference
+SEATS = 2  # the best SEATS drivers of a team count
+STAFF_WEIGHTS = {  # per skill point above STAFF_REFERENCE
+    "technical_director": -0.015,
+    "chief_designer": -0.012,
+    "head_of_dynamics": -0.008,
+    "chief_mechanic": -0.005,
+}
+STAFF_REFERENCE = 10
+COMPONENTS = ("chassis", "engine", "tyres", "drivers", "staff")
+
+
+def _num(value, default=0.0):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+# --------------------
+# Dependency graph
+# --------------------
+class DependencyGraph:
+    """Memoized nodes with explicit dependencies.
+
+    Inputs are set from outside; derived nodes are computed on demand from
+    their dependencies and cached until something upstream changes.
+    """
+
+    _MISSING = object()
+
+    def __init__(self):
+        self.funcs = {}  # key -> (fn, deps), derived nodes only
+        self.values = {}
+        self.dependents = {}  # key -> set of nodes that read it
+        self.recomputed = 0  # computations since creation, for checking the memo
+
+    def set_input(self, key, value):
+        if self.values.get(key, self._MISSING) == value:
+            return
+        self.values[key] = value
+        self._invalidate_downstream(key)
+
+    def define(self, key, fn, deps):
+        old = self.funcs.get(key)
+        if old is not None:
+            for dep in old[1]:
+                self.dependents.get(dep, set()).discard(key)
+        self.funcs[key] = (fn, tuple(deps))
+        for dep in deps:
+            self.dependents.setdefault(dep, set()).add(key)
+        self.values.pop(key, None)
+        self._invalidate_downstream(key)
+
+    def _invalidate_downstream(self, key):
+        stack = list(self.dependents.get(key, ()))
+        while stack:
+            node = stack.pop()
+            if self.values.pop(node, self._MISSING) is not self._MISSING:
+                stack.extend(self.dependents.get(node, ()))
+
+    def get(self, key):
+        value = self.values.get(key, self._MISSING)
+        if value is not self._MISSING:
+            return value
+        fn, deps = self.funcs.get(key, (None, ()))
+        if fn is None:
+            return None  # an input nobody has set
+        value = fn(*[self.get(dep) for dep in deps])
+        self.values[key] = value
+        self.recomputed += 1
+        return value
+
+
+# --------------------
+# Components
+# --------------------
+def chassis_delta(team):
+    team = team or {}
+    attr = team.get("attr") or {}
+    delta = _num(team.get("team_pace"))
+    if attr:
+        delta += sum(_num(v) for v in attr.values()) / len(attr)
+    delta += UPGRADE_STEP * sum(_num(v) for v in (team.get("upgrades") or {}).values())
+    hq = team.get("headquarters") or {}
+    delta += sum(w * _num(hq.get(k)) for k, w in HQ_WEIGHTS.items())
+    return delta
+
+
+def engine_delta(engine):
+    return _num((engine or {}).get("lap_time_delta"))
+
+
+def tyre_delta(supplier):
+    pace = (supplier or {}).get("pace") or {}
+    return sum(_num(v) for v in pace.values()) / len(pace) if pace else 0.0
+
+
+def drivers_delta(roster):
+    talents = sorted((_num(d.get("talent"), REFERENCE_TALENT) for d in roster.values()), reverse=True)[:SEATS]
+    if not talents:
+        return 0.0
+    return TALENT_WEIGHT * (sum(talents) / len(talents) - REFERENCE_TALENT)
+
+
+def staff_delta(roster):
+    best = {}
+    for member in roster.values():
+        role = member.get("role")
+        if role in STAFF_WEIGHTS:
+            best[role] = max(best.get(role, 0.0), _num(member.get("skill")))
+    return sum(STAFF_WEIGHTS[role] * (skill - STAFF_REFERENCE) for role, skill in best.items())
+
+
+def _signed_team(record):
+    contract = record.get("contract") or {}
+    team = contract.get("team") or record.get("team")
+    return None if team in (None, "", "Null") else team
+
+
+# --------------------
+# Model
+# --------------------
+class TeamStrength:
+    """Power ranking of the active teams as a dependency graph.
+
+    Node keys: inputs "team/<t>", "engine/<e>", "supplier/<s>",
+    "drivers/<t>", "staff/<t>"; derived "<component>:<t>" for each of
+    COMPONENTS, "pace:<t>" and "ranking". A save only resets the nodes
+    downstream of the records it touched.
+    """
+
+    def __init__(self, teams=(), engines=None, suppliers=None, drivers=(), staff=()):
+        self.graph = DependencyGraph()
+        self.teams = {}
+        self.rosters = {"drivers": {}, "staff": {}}  # kind -> team -> {name: record}
+        for name, engine in (engines or {}).items():
+            self.graph.set_input(f"engine/{name}", engine)
+        for name, supplier in (suppliers or {}).items():
+            self.graph.set_input(f"supplier/{name}", supplier)
+        for kind, records in (("drivers", drivers), ("staff", staff)):
+            for record in records:
+                team = _signed_team(record)
+                if team:
+                    self.rosters[kind].setdefault(team, {})[record.get("name")] = record
+        for team in teams:
+            self._set_team(team)
+        for kind, by_team in self.rosters.items():
+            for team, roster in by_team.items():
+                self.graph.set_input(f"{kind}/{team}", dict(roster))
+        self._define_ranking()
+
+    @classmethod
+    def from_files(cls):
+        return cls(*cls._load())
+
+    @staticmethod
+    def _load():
+        engines = (read_json(DATA_DIR / TAB_FILES["engines"]) or {}).get("engines", {})
+        suppliers = (read_json(DATA_DIR / TAB_FILES["tyre_suppliers"]) or {}).get("suppliers", {})
+        return (read_json(DATA_DIR / TAB_FILES["teams"]) or [], engines, suppliers,
+                read_json(DATA_DIR / TAB_FILES["drivers"]) or [],
+                read_json(DATA_DIR / TAB_FILES["staff"]) or [])
+
+    def reload(self):
+        self.__init__(*self._load())
+
+    # --- structure ---
+    def _set_team(self, team):
+        name = team.get("name")
+        previous = self.teams.get(name)
+        self.teams[name] = team
+        g = self.graph
+        g.set_input(f"team/{name}", team)
+        tyre = team.get("tyre_contract") or {}
+        # engine and supplier links can change, so those edges are redrawn on edit
+        if previous is None or previous.get("engine") != team.get("engine"):
+            g.define(f"engine:{name}", engine_delta, [f"engine/{team.get('engine')}"])
+        if previous is None or (previous.get("tyre_contract") or {}).get("supplier") != tyre.get("supplier"):
+            g.define(f"tyres:{name}", tyre_delta, [f"supplier/{tyre.get('supplier')}"])
+        if previous is None:
+            g.define(f"chassis:{name}", chassis_delta, [f"team/{name}"])
+            g.define(f"drivers:{name}", drivers_delta, [f"drivers/{name}"])
+            g.define(f"staff:{name}", staff_delta, [f"staff/{name}"])
+            g.define(f"pace:{name}", self._breakdown, [f"{c}:{name}" for c in COMPONENTS])
+            g.set_input(f"drivers/{name}", {})
+            g.set_input(f"staff/{name}", {})
+
+    @staticmethod
+    def _breakdown(*parts):
+        parts = [p or 0.0 for p in parts]
+        breakdown = dict(zip(COMPONENTS, parts))
+        breakdown["total"] = sum(parts)
+        return breakdown
+
+    def _define_ranking(self):
+        active = [n for n, t in self.teams.items() if t.get("active")]
+        self.graph.define("ranking", lambda *paces: sorted(
+            zip(active, paces), key=lambda item: item[1]["total"]
+        ), [f"pace:{n}" for n in active])
+
+    # --- queries ---
+    def ranking(self):
+        """[(team, {component: delta, "total": delta})], fastest first."""
+        return self.graph.get("ranking")
+
+    def pace(self, team):
+        return self.graph.get(f"pace:{team}")
+
+    # --- updates ---
+    def apply(self, name, old, new):
+        """Save listener: update the inputs behind the edited record."""
+        if name == "teams":
+            if old is not None and (new is None or old.get("name") != new.get("name")):
+                self.teams.pop(old.get("name"), None)
+            if new is not None:
+                self._set_team(new)
+            if old is None or new is None or old.get("active") != new.get("active") \
+                    or old.get("name") != new.get("name"):
+                self._define_ranking()
+        elif name == "engines":
+            if old is not None:
+                self.graph.set_input(f"engine/{old.get('name')}", None)
+            if new is not None:
+                self.graph.set_input(f"engine/{new.get('name')}", {k: v for k, v in new.items() if k != "name"})
+        elif name == "tyre_suppliers":
+            if old is not None:
+                self.graph.set_input(f"supplier/{old.get('name')}", None)
+            if new is not None:
+                self.graph.set_input(f"supplier/{new.get('name')}", {k: v for k, v in new.items() if k != "name"})
+        elif name in ("drivers", "staff"):
+            touched = set()
+            if old is not None and _signed_team(old):
+                team = _signed_team(old)
+                self.rosters[name].get(team, {}).pop(old.get("name"), None)
+                touched.add(team)
+            if new is not None and _signed_team(new):
+                team = _signed_team(new)
+                self.rosters[name].setdefault(team, {})[new.get("name")] = new
+                touched.add(team)
+            for team in touched:
+                # a new dict, so the input compares unequal and its nodes reset
+                self.graph.set_input(f"{name}/{team}", dict(self.rosters[name].get(team, {})))
+
+
+_model = None
+
+def get_team_strength():
+    global _model
+    if _model is None:
+        _model = TeamStrength.from_files()
+        add_save_listener(_model.apply)
+        add_reload_listener(_model.reload)
+    return _model
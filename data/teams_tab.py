@@ -1,10 +1,18 @@
 # teams_tab.py
+from copy import deepcopy
+
 from PyQt6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QScrollArea, QFormLayout,
     QLabel, QLineEdit, QListWidget, QPushButton, QComboBox, QMessageBox
 )
-from PyQt6.QtCore import Qt
-from utils import DATA_DIR, TAB_FILES, read_json, write_json, ACCENT, TEXT
+from form_builder import add_section_header
+from records import parse_number
+from utils import DATA_DIR, TAB_FILES, read_json, add_save_listener, notify_saved
+from dialogs import save_json
+from ledger import get_ledger
+
+# headquarters facilities edited in the form; others in the data are kept as they are
+HQ_FIELDS = ["hospitality_pr_center", "wind_tunnel", "engine_plant", "test_track"]
 
 
 class TeamsTab(QWidget):
@@ -36,7 +44,9 @@ class TeamsTab(QWidget):
         self.detail_area.setWidget(detail_widget)
 
         self.fields = {}
+        self.finance_labels = {}
         self.teams_data = []
+        self.ledger = get_ledger()
 
         self.create_fields()
         self.load_data()
@@ -45,50 +55,42 @@ class TeamsTab(QWidget):
         self.list.currentRowChanged.connect(self.display_team)
         self.add_btn.clicked.connect(self.add_team)
         self.save_btn.clicked.connect(self.save_team)
-
-    def add_section_header(self, title):
-        lbl = QLabel(title)
-        lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        lbl.setStyleSheet(f"""
-            font-weight: bold;
-            border: 1px solid {ACCENT};
-            padding: 4px;
-            margin-top: 8px;
-            margin-bottom: 4px;
-            border-radius: 4px;
-            background-color: #2f3436;
-            color: {TEXT};
-        """)
-        self.form_layout.addRow(lbl)
+        add_save_listener(self.on_record_saved)
 
     def create_fields(self):
         # --- Details ---
-        self.add_section_header("Team Details")
+        add_section_header(self.form_layout, "Team Details")
         for field in ["name", "short_name", "country", "budget_m"]:
             self.fields[field] = QLineEdit()
             self.form_layout.addRow(QLabel(field.replace("_", " ").capitalize()), self.fields[field])
 
         # --- Headquarters ---
-        self.add_section_header("Headquarters")
-        for field in ["wind_tunnel", "factory", "simulator", "test_track"]:
+        add_section_header(self.form_layout, "Headquarters")
+        for field in HQ_FIELDS:
             self.fields[field] = QLineEdit()
             self.form_layout.addRow(QLabel(field.replace("_", " ").capitalize()), self.fields[field])
 
         # --- Tyre Contract ---
-        self.add_section_header("Tyre Contract")
+        add_section_header(self.form_layout, "Tyre Contract")
         self.fields["tyre_supplier"] = QComboBox()
         self.fields["tyre_type"] = QComboBox()
         self.fields["tyre_type"].addItems(["partner", "works", "customer"])
         self.form_layout.addRow(QLabel("Supplier"), self.fields["tyre_supplier"])
         self.form_layout.addRow(QLabel("Type"), self.fields["tyre_type"])
 
+        # --- Finances (read only, from the ledger) ---
+        add_section_header(self.form_layout, "Finances")
+        for key in ["opening", "income", "expense", "balance"]:
+            self.finance_labels[key] = QLabel("-")
+            self.form_layout.addRow(QLabel(key.capitalize()), self.finance_labels[key])
+
         # Save button
         self.save_btn = QPushButton("Save Changes")
         self.form_layout.addRow(self.save_btn)
 
     def load_data(self):
         # Load teams
-        self.teams_data = read_json(self.file) or []
+        self.teams_data = read_json(self.file, owner=self) or []
         self.list.clear()
         for t in self.teams_data:
             self.list.addItem(t.get("name", "Unnamed"))
@@ -112,10 +114,8 @@ class TeamsTab(QWidget):
         self.fields["budget_m"].setText(str(team.get("budget_m", 0)))
 
         hq = team.get("headquarters", {})
-        self.fields["wind_tunnel"].setText(str(hq.get("wind_tunnel", 0)))
-        self.fields["factory"].setText(str(hq.get("factory", 0)))
-        self.fields["simulator"].setText(str(hq.get("simulator", 0)))
-        self.fields["test_track"].setText(str(hq.get("test_track", 0)))
+        for field in HQ_FIELDS:
+            self.fields[field].setText(str(hq.get(field, 0)))
 
         tyre = team.get("tyre_contract", {})
         supplier = tyre.get("supplier", "")
@@ -125,30 +125,48 @@ class TeamsTab(QWidget):
         idx = self.fields["tyre_type"].findText(tyre_type)
         self.fields["tyre_type"].setCurrentIndex(idx if idx >= 0 else 0)
 
+        self.update_finances(team.get("name"))
+
+    def update_finances(self, team_name):
+        summary = self.ledger.summary(team_name)
+        for key, lbl in self.finance_labels.items():
+            lbl.setText(f"{summary[key]:.2f} M")
+
+    def on_record_saved(self, name, old, new):
+        # any save can move money, so refresh the team on screen
+        idx = self.list.currentRow()
+        if 0 <= idx < len(self.teams_data):
+            self.update_finances(self.teams_data[idx].get("name"))
+
     def save_team(self):
         idx = self.list.currentRow()
         if idx < 0:
             return
         team = self.teams_data[idx]
+        bad = [key for key in ["budget_m"] + HQ_FIELDS
+               if not isinstance(parse_number(self.fields[key].text() or 0), (int, float))]
+        if bad:
+            QMessageBox.warning(self, "Invalid Input", f"Not a number: {', '.join(bad)}")
+            return
+        old_team = deepcopy(team)
 
         team["name"] = self.fields["name"].text()
         team["short_name"] = self.fields["short_name"].text()
         team["country"] = self.fields["country"].text()
-        team["budget_m"] = float(self.fields["budget_m"].text() or 0)
+        team["budget_m"] = parse_number(self.fields["budget_m"].text() or 0)
 
-        team["headquarters"] = {
-            "wind_tunnel": int(self.fields["wind_tunnel"].text() or 0),
-            "factory": int(self.fields["factory"].text() or 0),
-            "simulator": int(self.fields["simulator"].text() or 0),
-            "test_track": int(self.fields["test_track"].text() or 0),
-        }
+        hq = team.setdefault("headquarters", {})
+        for field in HQ_FIELDS:
+            hq[field] = parse_number(self.fields[field].text() or 0)
 
-        team["tyre_contract"] = {
+        team.setdefault("tyre_contract", {}).update({
             "supplier": self.fields["tyre_supplier"].currentText(),
             "type": self.fields["tyre_type"].currentText()
-        }
+        })
 
-        write_json(self.file, self.teams_data)
+        if not save_json(self, self.file, self.teams_data):
+            return
+        notify_saved("teams", old_team, team)
         QMessageBox.information(self, "Saved", f"Team {team['name']} updated!")
         self.load_data()
         self.list.setCurrentRow(idx)
@@ -159,18 +177,15 @@ class TeamsTab(QWidget):
             "short_name": "",
             "country": "",
             "budget_m": 0,
-            "headquarters": {
-                "wind_tunnel": 0,
-                "factory": 0,
-                "simulator": 0,
-                "test_track": 0
-            },
+            "headquarters": {field: 0 for field in HQ_FIELDS},
             "tyre_contract": {
                 "supplier": "",
                 "type": "partner"
             }
         }
         self.teams_data.append(new_team)
-        write_json(self.file, self.teams_data)
+        if not save_json(self, self.file, self.teams_data):
+            return
+        notify_saved("teams", None, new_team)
         self.load_data()
         self.list.setCurrentRow(len(self.teams_data) - 1)
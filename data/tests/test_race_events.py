@@ -0,0 +1,18 @@
+from race_events import INCIDENT_KINDS, check_against_per_lap
+from sim_models import IncidentModel
+
+INCIDENTS = {
+    "spin_prob_per_lap": 0.01,
+    "collision_prob_per_lap": 0.004,
+    "mech_dnf_prob_per_lap": 0.002,
+    "spin_loss_s": [2.0, 6.0],
+}
+PITSTOPS = {"fail_prob": 0.05, "fail_extra_s": [3.0, 10.0]}
+
+
+def test_event_driven_matches_per_lap_sampling():
+    model = IncidentModel(INCIDENTS, PITSTOPS)
+    ok, means = check_against_per_lap(model, cars=20, laps=40, races=200, seed=7)
+    assert ok, means
+    for kind in INCIDENT_KINDS:
+        assert means["event"].get(kind, 0) > 0
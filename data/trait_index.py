@@ -0,0 +1,121 @@
+# trait_index.py
+from utils import DATA_DIR, TAB_FILES, TRAITS_LIST, read_json, add_save_listener, add_reload_listener
+
+
+class TraitIndex:
+    """One bitmap per trait over the drivers file, bit i set if driver i has it.
+
+    Bitmaps are plain Python ints, so AND/OR/NOT over 100k+ drivers are a
+    handful of big-int operations and counts are int.bit_count().
+    """
+
+    def __init__(self, drivers=()):
+        self.names = []
+        self.bitmaps = {t: 0 for t in TRAITS_LIST}
+        for driver in drivers:
+            self._append(driver)
+
+    @classmethod
+    def from_files(cls):
+        return cls(read_json(DATA_DIR / TAB_FILES["drivers"]) or [])
+
+    def reload(self, drivers=None):
+        """Rebuild from the drivers file, or from `drivers` already read from it."""
+        self.__init__(read_json(DATA_DIR / TAB_FILES["drivers"]) or [] if drivers is None else drivers)
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def everyone(self):
+        return (1 << len(self.names)) - 1
+
+    # --------------------
+    # Updates
+    # --------------------
+    def _append(self, driver):
+        bit = 1 << len(self.names)
+        self.names.append(driver.get("name"))
+        for trait in driver.get("traits") or []:
+            if trait in self.bitmaps:
+                self.bitmaps[trait] |= bit
+
+    def _set_traits(self, pos, traits):
+        bit = 1 << pos
+        for trait in self.bitmaps:
+            if trait in traits:
+                self.bitmaps[trait] |= bit
+            else:
+                self.bitmaps[trait] &= ~bit
+
+    def _remove(self, pos):
+        # drop bit `pos` and shift everything above it down one place
+        low = (1 << pos) - 1
+        for trait, bm in self.bitmaps.items():
+            self.bitmaps[trait] = (bm & low) | ((bm >> (pos + 1)) << pos)
+        del self.names[pos]
+
+    def apply(self, name, old, new):
+        """Save listener: keep bit positions in step with the drivers file."""
+        if name != "drivers":
+            return
+        if old is None:
+            if new is not None:
+                self._append(new)
+            return
+        # rows are positions in the drivers file and names need not be
+        # unique (every added driver starts as "New Driver"); when the name
+        # does not pin down one row, rebuild rather than touch the wrong one
+        if self.names.count(old.get("name")) != 1:
+            self.reload()
+            return
+        pos = self.names.index(old.get("name"))
+        if new is None:
+            self._remove(pos)
+        else:
+            self.names[pos] = new.get("name")
+            self._set_traits(pos, set(new.get("traits") or []))
+
+    # --------------------
+    # Queries
+    # --------------------
+    def select(self, all_of=(), any_of=(), none_of=()):
+        """Bitmap of drivers with every trait in all_of, one of any_of and none of none_of."""
+        result = self.everyone
+        for trait in all_of:
+            result &= self.bitmaps.get(trait, 0)
+        if any_of:
+            either = 0
+            for trait in any_of:
+                either |= self.bitmaps.get(trait, 0)
+            result &= either
+        for trait in none_of:
+            result &= ~self.bitmaps.get(trait, 0)
+        return result
+
+    def counts(self, within=None):
+        """{trait: drivers having it}, optionally only among the bitmap `within`."""
+        if within is None:
+            return {t: bm.bit_count() for t, bm in self.bitmaps.items()}
+        return {t: (bm & within).bit_count() for t, bm in self.bitmaps.items()}
+
+    @staticmethod
+    def positions(bitmap):
+        """Set bit positions in ascending order."""
+        bits = bin(bitmap)[:1:-1]
+        found, pos = [], bits.find("1")
+        while pos >= 0:
+            found.append(pos)
+            pos = bits.find("1", pos + 1)
+        return found
+
+
+_index = None
+
+def get_trait_index():
+    global _index
+    if _index is None:
+        _index = TraitIndex.from_files()
+        add_save_listener(_index.apply)
+        add_reload_listener(_index.reload)
+    return _index
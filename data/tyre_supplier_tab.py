@@ -4,7 +4,8 @@ from PyQt6.QtWidgets import (
     QPushButton, QLineEdit, QTabWidget, QFormLayout, QLabel, QMessageBox
 )
 from PyQt6.QtCore import Qt
-from utils import DATA_DIR, TAB_FILES, read_json, write_json
+from utils import DATA_DIR, TAB_FILES, read_json, notify_saved
+from dialogs import save_json
 
 
 class TyreSuppliersTab(QWidget):
@@ -94,7 +95,7 @@ class TyreSuppliersTab(QWidget):
         self.tabs.addTab(price_page, "Prices")
 
     def load_data(self):
-        data = read_json(self.file) or {"suppliers": {}}
+        data = read_json(self.file, owner=self) or {"suppliers": {}}
         self.suppliers = []
         self.list.clear()
         for name, info in data.get("suppliers", {}).items():
@@ -140,6 +141,7 @@ class TyreSuppliersTab(QWidget):
 
         # Update supplier
         name = self.list.item(idx).text()
+        old_supplier = self.suppliers[idx]
         self.suppliers[idx] = {"name": name, **supplier}
 
         # Save JSON
@@ -147,7 +149,9 @@ class TyreSuppliersTab(QWidget):
             "pace": s["pace"], "durability": s["durability"],
             "prices": s["prices"], "trend": s["trend"], "variance": s["variance"]
         } for s in self.suppliers}}
-        write_json(self.file, data)
+        if not save_json(self, self.file, data):
+            return
+        notify_saved("tyre_suppliers", old_supplier, self.suppliers[idx])
         QMessageBox.information(self, "Saved", f"Supplier {name} updated!")
 
     def add_supplier(self):
@@ -167,6 +171,8 @@ class TyreSuppliersTab(QWidget):
             "pace": s["pace"], "durability": s["durability"],
             "prices": s["prices"], "trend": s["trend"], "variance": s["variance"]
         } for s in self.suppliers}}
-        write_json(self.file, data)
+        if not save_json(self, self.file, data):
+            return
+        notify_saved("tyre_suppliers", None, new_supplier)
         self.load_data()
         self.list.setCurrentRow(len(self.suppliers) - 1)
@@ -1,14 +1,20 @@
 # utils.py
+import atexit
 import json
+import os
 from pathlib import Path
 import sys
 
+import serialization
+
 if getattr(sys, 'frozen', False):
     BASE_DIR = Path(sys.executable).parent
 else:
     BASE_DIR = Path(__file__).parent
 
-DATA_DIR = BASE_DIR / "data"
+# TP_DATA_DIR points the editor at another data folder, e.g. generated test data
+DATA_DIR_ENV = "TP_DATA_DIR"
+DATA_DIR = Path(os.environ[DATA_DIR_ENV]) if os.environ.get(DATA_DIR_ENV) else BASE_DIR / "data"
 
 DATA_DIR.mkdir(exist_ok=True)
 
@@ -26,25 +32,339 @@ TAB_FILES = {
 }
 
 
+# --- Game constants ---
+TRAITS_LIST = [
+    "hotlapper", "tyre_whisperer", "pay_driver", "overtake_artist",
+    "mechanic", "clean_air_merchant", "bottlejob", "crash_happy",
+    "nervous", "tyre_abuser"
+]
+
+# career stats, kept nested under "history" in drivers and teams
+HISTORY_FIELDS = ["seasons", "championships", "wins", "podiums", "poles"]
+
+# staff roles with nicer names for the UI
+ROLE_DISPLAY = {
+    "technical_director": "Technical Director",
+    "chief_designer": "Chief Designer",
+    "head_of_dynamics": "Head of Dynamics",
+    "chief_mechanic": "Chief Mechanic"
+}
+
+
 # --- Colour Scheme ---
 BG = "#393E41"
 TEXT = "#D3D0CB"
 ACCENT = "#B80C09"
 
 # --- JSON Helpers ---
-def read_json(path: Path):
+# When a mod profile is active, files in DATA_DIR are read and written
+# through it (see profiles.py) instead of straight from disk.
+_active_profile = None
+
+def set_active_profile(profile):
+    global _active_profile
+    _active_profile = profile
+
+def get_active_profile():
+    return _active_profile
+
+# With shared editing on (see concurrency.py), base data files are read
+# and written through a guard that merges with other instances' saves.
+_shared_guard = None
+
+def set_shared_guard(guard):
+    global _shared_guard
+    _shared_guard = guard
+
+def get_shared_guard():
+    return _shared_guard
+
+# owner: whoever reads a file to later save it (usually a tab), so the
+# shared guard can merge its save against that read
+def read_json(path: Path, owner=None):
+    if _active_profile is not None and path.parent == DATA_DIR:
+        return _active_profile.read(path.name)
+    if _shared_guard is not None and path.parent == DATA_DIR:
+        return _shared_guard.read(path, owner)
+    return read_json_file(path)
+
+def write_json(path: Path, data, owner=None):
+    if _active_profile is not None and path.parent == DATA_DIR:
+        _active_profile.write(path.name, data)
+        return
+    if _shared_guard is not None and path.parent == DATA_DIR:
+        _shared_guard.write(path, data, owner=owner)
+        return
+    write_json_file(path, data)
+
+_read_errors = {}  # path -> why its last read failed
+
+def read_json_file(path: Path):
+    _read_errors.pop(path, None)
+    pending = _pending.get(path)
+    if pending is not None:
+        return serialization.loads(pending[1])
     if not path.exists():
         return []
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return serialization.load(path)
     except Exception as e:
         print(f"Failed to read {path}: {e}")
+        _read_errors[path] = str(e)
         return []
 
-def write_json(path: Path, data):
+def read_error(path: Path):
+    """Why the last read of path failed, or None if it was read (or missing)."""
+    return _read_errors.get(path)
+
+def write_json_file(path: Path, data):
+    """Encode now, write later: see Writes below. Raises DataWriteError."""
+    global _generation
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-    except Exception as e:
-        print(f"Failed to write {path}: {e}")
+        raw = serialization.dumps(data)
+    except (TypeError, ValueError) as e:
+        raise DataWriteError(path, e) from e
+    _generation += 1
+    _pending[path] = (_generation, raw)
+    if _scheduler is None or path in _failed:
+        # headless, or the last deferred write failed: write now so the caller hears about it
+        flush_writes([path])
+    else:
+        _schedule_flush()
+
+# --- Writes ---
+# Writes are atomic (temp file, fsync, rename) and coalesced: the encoded
+# data waits in _pending for WRITE_COALESCE_SECONDS, so a burst of saves to
+# one file becomes one physical write. Reads see pending data. Deferring
+# needs a scheduler (the GUI installs a Qt timer); without one every write
+# happens straight away.
+WRITE_COALESCE_SECONDS = 0.3
+
+class DataWriteError(Exception):
+    def __init__(self, path, error):
+        super().__init__(f"Could not write {Path(path).name}: {error}")
+        self.path = path
+        self.error = error
+
+_pending = {}  # path -> (generation, encoded bytes) not yet on disk
+_failed = {}  # path -> DataWriteError from the last deferred flush
+_generation = 0
+_scheduler = None
+_flush_scheduled = False
+_write_error_listeners = []
+
+def atomic_write_bytes(path: Path, raw: bytes):
+    atomic_write_stream(path, lambda f: f.write(raw))
+
+def atomic_write_stream(path: Path, write):
+    """Like atomic_write_bytes, but write(f) fills the binary temp file piece by piece."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    if os.name == "posix":
+        # make the rename itself durable
+        fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+def flush_writes(paths=None):
+    """Write pending data (all, or just `paths`) to disk; raises the first failure."""
+    errors = []
+    for path in list(_pending if paths is None else paths):
+        entry = _pending.pop(path, None)
+        if entry is None:
+            continue
+        try:
+            atomic_write_bytes(path, entry[1])
+        except OSError as e:
+            err = DataWriteError(path, e)
+            _failed[path] = err
+            # keep the data for the next attempt unless newer data arrived
+            _pending.setdefault(path, entry)
+            errors.append(err)
+        else:
+            _failed.pop(path, None)
+    if errors:
+        raise errors[0]
+
+def has_pending_writes(path=None):
+    return bool(_pending) if path is None else path in _pending
+
+def file_stamp(path: Path):
+    """Changes whenever the file's content does, pending writes included; None if absent."""
+    pending = _pending.get(path)
+    if pending is not None:
+        return ("pending", pending[0])
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def set_write_scheduler(scheduler):
+    """scheduler(delay_seconds, callback) runs callback later, e.g. QTimer.singleShot."""
+    global _scheduler
+    _scheduler = scheduler
+
+def add_write_error_listener(callback):
+    """callback(DataWriteError) for failures of deferred writes."""
+    _write_error_listeners.append(callback)
+
+def _schedule_flush():
+    global _flush_scheduled
+    if not _flush_scheduled:
+        _flush_scheduled = True
+        _scheduler(WRITE_COALESCE_SECONDS, _scheduled_flush)
+
+def _scheduled_flush():
+    global _flush_scheduled
+    _flush_scheduled = False
+    try:
+        flush_writes()
+    except DataWriteError as e:
+        if not _write_error_listeners:
+            print(e)
+        for callback in list(_write_error_listeners):
+            callback(e)
+
+@atexit.register
+def _flush_at_exit():
+    try:
+        flush_writes()
+    except DataWriteError as e:
+        print(e)
+
+def iter_json_array(path: Path, chunk_size=1 << 16):
+    """Yield the items of a top-level JSON array one at a time.
+
+    Only one chunk plus the item being decoded is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf, pos, eof = "", 0, False
+
+        def fill():
+            nonlocal buf, pos, eof
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf = buf[pos:] + chunk
+            pos = 0
+
+        def skip(chars):
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in chars:
+                    pos += 1
+                if pos < len(buf) or eof:
+                    return
+                fill()
+
+        fill()
+        skip(" \t\r\n")
+        if buf[pos:pos + 1] != "[":
+            raise ValueError(f"{path} does not hold a JSON array")
+        pos += 1
+        while True:
+            skip(" \t\r\n,")
+            if pos >= len(buf) or buf[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            # a number cut off by the chunk boundary decodes as a shorter one,
+            # so only accept items followed by a delimiter
+            if (end == len(buf) or buf[end] not in " \t\r\n,]") and not eof:
+                fill()
+                continue
+            pos = end
+            yield item
+
+def iter_records(name):
+    """Stream the records of a list file, through the active profile if any."""
+    path = DATA_DIR / TAB_FILES[name]
+    if (_active_profile is not None or path in _pending or not path.exists()
+            or not serialization.is_text(path)):
+        yield from read_json(path) or []
+    else:
+        yield from iter_json_array(path)
+
+# --- Record keys ---
+# Files split into records by a stable key: "name" for entity lists,
+# "type:team" for events, the week number for the schedule, and the
+# dict key for config sections, engines and tyre suppliers.
+WRAPPED_FILES = {"engines": "engines", "tyre_suppliers": "suppliers"}
+FILE_NAMES = {filename: name for name, filename in TAB_FILES.items()}
+
+def record_key(name, record, index):
+    if name == "schedule" or not isinstance(record, dict):
+        return str(index + 1)
+    if name == "events":
+        return f"{record.get('type')}:{record.get('team')}"
+    return str(record.get("name", index))
+
+def split_records(name, data):
+    """Return {key: record} in file order for a TAB_FILES entry's data."""
+    if name in WRAPPED_FILES:
+        return dict((data or {}).get(WRAPPED_FILES[name], {}))
+    if isinstance(data, dict):
+        return dict(data)
+    records = {}
+    for i, record in enumerate(data or []):
+        key = record_key(name, record, i)
+        n = 2
+        unique = key
+        while unique in records:
+            unique = f"{key}#{n}"
+            n += 1
+        records[unique] = record
+    return records
+
+def join_records(name, records):
+    """Inverse of split_records."""
+    if name in WRAPPED_FILES:
+        return {WRAPPED_FILES[name]: dict(records)}
+    if name == "config":
+        return dict(records)
+    return list(records.values())
+
+# --- Save listeners ---
+# Callbacks receive (name, old, new) where name is a TAB_FILES key and
+# old/new are the record before and after the save (None on add/delete).
+# Records from keyed files (engines, tyre suppliers) carry their key as "name".
+_save_listeners = []
+
+def add_save_listener(callback):
+    _save_listeners.append(callback)
+
+def remove_save_listener(callback):
+    if callback in _save_listeners:
+        _save_listeners.remove(callback)
+
+def notify_saved(name, old, new):
+    for callback in list(_save_listeners):
+        callback(name, old, new)
+
+# --- Reload listeners ---
+# Zero-argument callbacks run when the whole data set changes underneath
+# the editor, e.g. after switching mod profile.
+_reload_listeners = []
+
+def add_reload_listener(callback):
+    _reload_listeners.append(callback)
+
+def notify_reloaded():
+    for callback in list(_reload_listeners):
+        callback()